@@ -65,6 +65,7 @@ hiddenimports = [
     'ui.theme_manager',
     'ui.button_styles',
     'ui.store',
+    'ui.trend_chart',
 ]
 
 # 排除不需要的模块（减小体积）
@@ -339,48 +339,47 @@ class MemoryExtractor:
 
     def compare_semantic_similarity(
         self,
-        items_to_compare: List[dict],
+        new_texts: List[str],
+        existing_texts: List[str],
         memory_type: str,
     ) -> List[dict]:
         """
         使用 LLM 批量比对新记忆与现有记忆的语义相似性。
         
+        现有条目只在提示中列出一次，所有新条目与同一份列表比对，
+        提示长度为 O(新条目数 + 现有条目数)。
+        
         Args:
-            items_to_compare: 待比对列表，每项包含 new_item 和 existing_items
+            new_texts: 待检查的新条目文本
+            existing_texts: 现有条目文本
             memory_type: 记忆类型 ("profile", "experience", "strategy")
         
         Returns:
             比对结果列表，包含相似项信息
         """
-        if not items_to_compare:
+        if not new_texts or not existing_texts:
             return []
         
         # 构建比对提示
         if memory_type == "profile":
             type_desc = "对象特征"
-            field_name = "content"
         elif memory_type == "experience":
             type_desc = "关系事件"
-            field_name = "event"
         else:
             type_desc = "沟通策略模式"
-            field_name = "pattern"
         
+        existing_block = "\n".join(f"  - 编号 {idx}: {text}" for idx, text in enumerate(existing_texts, 1))
+        new_block = "\n".join(f"【新条目 {idx}】: {text}" for idx, text in enumerate(new_texts, 1))
         prompt = f"""请分析以下「{type_desc}」的语义相似性。
 
 对于每个待检查的新条目，判断它与现有条目中是否存在语义基本相同的（意思相近、表达相似的内容）。
 
-待检查列表：
-"""
-        for idx, item in enumerate(items_to_compare):
-            new_text = item["new_text"]
-            existing_texts = item["existing_texts"]
-            prompt += f"""
-【新条目 {idx + 1}】: {new_text}
 现有条目：
+{existing_block}
+
+待检查列表：
+{new_block}
 """
-            for eidx, ext in enumerate(existing_texts):
-                prompt += f"  - 编号 {eidx + 1}: {ext}\n"
         
         prompt += """
 请以 JSON 格式输出，结构如下：
@@ -1,5 +1,6 @@
 """统一的按钮样式定义。"""
 
+from PySide6.QtCore import Qt
 from PySide6.QtWidgets import QPushButton, QToolButton, QComboBox, QApplication
 from PySide6.QtGui import QPalette
 
@@ -16,129 +17,76 @@ def _is_dark_theme() -> bool:
 
 # ============ QPushButton 样式 ============
 
-def apply_primary_style(btn: QPushButton, width: int = 90) -> None:
-    """主要按钮样式（绿色，用于保存/确认/发送等主要操作）"""
-    btn.setFixedWidth(width)
-    btn.setStyleSheet("""
-        QPushButton {
-            background-color: #28a745;
+# 按钮角色配色：(常态, 悬停, 按下, 禁用)
+_BUTTON_ROLE_COLORS = {
+    "primary": ("#28a745", "#218838", "#1e7e34", "#94d3a2"),
+    "secondary": ("#6c757d", "#5a6268", "#545b62", "#a8adb3"),
+    "warning": ("#fd7e14", "#e96b02", "#d45d00", "#feb573"),
+    "info": ("#17a2b8", "#138496", "#117a8b", "#6dcad9"),
+    "danger": ("#dc3545", "#c82333", "#bd2130", "#e97983"),
+}
+
+# 由主题管理器拼接到应用级样式表中；按钮只设置 role 属性，不再各自解析一份样式表
+BUTTON_ROLE_STYLESHEET = "".join(
+    f"""
+        QPushButton[role="{role}"] {{
+            background-color: {normal};
             color: white;
             border: none;
             padding: 8px 16px;
             border-radius: 4px;
             font-size: 13px;
             font-weight: 500;
-        }
-        QPushButton:hover {
-            background-color: #218838;
-        }
-        QPushButton:pressed {
-            background-color: #1e7e34;
-        }
-        QPushButton:disabled {
-            background-color: #94d3a2;
-        }
-    """)
+        }}
+        QPushButton[role="{role}"]:hover {{
+            background-color: {hover};
+        }}
+        QPushButton[role="{role}"]:pressed {{
+            background-color: {pressed};
+        }}
+        QPushButton[role="{role}"]:disabled {{
+            background-color: {disabled};
+        }}
+    """
+    for role, (normal, hover, pressed, disabled) in _BUTTON_ROLE_COLORS.items()
+)
+
+
+def _apply_role(btn: QPushButton, role: str, width: int) -> None:
+    btn.setFixedWidth(width)
+    if btn.property("role") == role:
+        return
+    btn.setProperty("role", role)
+    # 已经显示过的按钮需要重新 polish 才会应用新的属性选择器
+    if btn.testAttribute(Qt.WA_WState_Polished):
+        style = btn.style()
+        style.unpolish(btn)
+        style.polish(btn)
+
+
+def apply_primary_style(btn: QPushButton, width: int = 90) -> None:
+    """主要按钮样式（绿色，用于保存/确认/发送等主要操作）"""
+    _apply_role(btn, "primary", width)
 
 
 def apply_secondary_style(btn: QPushButton, width: int = 90) -> None:
     """次要按钮样式（灰色，用于取消/关闭）"""
-    btn.setFixedWidth(width)
-    btn.setStyleSheet("""
-        QPushButton {
-            background-color: #6c757d;
-            color: white;
-            border: none;
-            padding: 8px 16px;
-            border-radius: 4px;
-            font-size: 13px;
-            font-weight: 500;
-        }
-        QPushButton:hover {
-            background-color: #5a6268;
-        }
-        QPushButton:pressed {
-            background-color: #545b62;
-        }
-        QPushButton:disabled {
-            background-color: #a8adb3;
-        }
-    """)
+    _apply_role(btn, "secondary", width)
 
 
 def apply_warning_style(btn: QPushButton, width: int = 90) -> None:
     """警告按钮样式（橙色，用于重置/恢复默认）"""
-    btn.setFixedWidth(width)
-    btn.setStyleSheet("""
-        QPushButton {
-            background-color: #fd7e14;
-            color: white;
-            border: none;
-            padding: 8px 16px;
-            border-radius: 4px;
-            font-size: 13px;
-            font-weight: 500;
-        }
-        QPushButton:hover {
-            background-color: #e96b02;
-        }
-        QPushButton:pressed {
-            background-color: #d45d00;
-        }
-        QPushButton:disabled {
-            background-color: #feb573;
-        }
-    """)
+    _apply_role(btn, "warning", width)
 
 
 def apply_info_style(btn: QPushButton, width: int = 90) -> None:
     """信息按钮样式（蓝色，用于测试连接/AI操作等）"""
-    btn.setFixedWidth(width)
-    btn.setStyleSheet("""
-        QPushButton {
-            background-color: #17a2b8;
-            color: white;
-            border: none;
-            padding: 8px 16px;
-            border-radius: 4px;
-            font-size: 13px;
-            font-weight: 500;
-        }
-        QPushButton:hover {
-            background-color: #138496;
-        }
-        QPushButton:pressed {
-            background-color: #117a8b;
-        }
-        QPushButton:disabled {
-            background-color: #6dcad9;
-        }
-    """)
+    _apply_role(btn, "info", width)
 
 
 def apply_danger_style(btn: QPushButton, width: int = 90) -> None:
     """危险按钮样式（红色，用于删除/关闭等）"""
-    btn.setFixedWidth(width)
-    btn.setStyleSheet("""
-        QPushButton {
-            background-color: #dc3545;
-            color: white;
-            border: none;
-            padding: 8px 16px;
-            border-radius: 4px;
-            font-size: 13px;
-            font-weight: 500;
-        }
-        QPushButton:hover {
-            background-color: #c82333;
-        }
-        QPushButton:pressed {
-            background-color: #bd2130;
-        }
-        QPushButton:disabled {
-            background-color: #e97983;
-        }
-    """)
+    _apply_role(btn, "danger", width)
 
 
 # ============ QToolButton 样式 ============
@@ -2,9 +2,12 @@
 
 from __future__ import annotations
 
-from typing import List, Optional
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
 
 from PySide6.QtWidgets import (
+    QApplication,
+    QButtonGroup,
     QCheckBox,
     QComboBox,
     QDialog,
@@ -19,17 +22,18 @@ from PySide6.QtWidgets import (
     QMessageBox,
     QProgressBar,
     QPushButton,
+    QRadioButton,
+    QScrollArea,
     QSlider,
     QTabWidget,
     QTextEdit,
     QVBoxLayout,
     QWidget,
 )
-from PySide6.QtCore import Qt, Signal, QThread
+from PySide6.QtCore import Qt, Signal, QObject, QRunnable, QThreadPool
+from PySide6.QtGui import QPalette, QTextCursor
 
-from .store import (
-    Person, ProfileMemory, ExperienceMemory, StrategyMemory
-)
+from .store import Person, ExperienceMemory
 from .button_styles import (
     apply_primary_style,
     apply_secondary_style,
@@ -202,63 +206,151 @@ class PersonDialog(QDialog):
 
 
 # =====================================================================
-# 新版长期记忆对话框 - 三种类型分别对应不同的字段
+# 新版长期记忆对话框 - 三种类型共用同一个参数化实现
 # =====================================================================
 
-class ProfileMemoryDialog(QDialog):
-    """添加或编辑「对象特征」记忆。
-    
-    字段:
-    - content: 特征内容（必填）
-    - confidence: 置信度 0~1（滑块 0%~100%）
-    - source: 来源 manual/model
+def _format_percent(value: int) -> str:
+    return f"{value}%"
+
+
+def _format_signed_percent(value: int) -> str:
+    if value > 0:
+        return f"+{value}%"
+    return f"{value}%"
+
+
+@dataclass(frozen=True)
+class MemoryDialogSpec:
+    """记忆对话框的差异化配置。
+
+    文本字段 + 百分比滑块 + 来源下拉框 是三种记忆共有的结构，
+    各类型只在文案、取值范围和字段名上有所不同。
     """
+    title_add: str
+    title_edit: str
+    min_width: int
+    text_field: str
+    text_label: str
+    placeholder: str
+    empty_message: str
+    value_field: str
+    value_label: str
+    slider_range: Tuple[int, int]
+    slider_default: float
+    tick_interval: int
+    source_map: Dict[str, str]
+    formatter: Callable[[int], str] = _format_percent
+    hint: Optional[str] = None
+
+
+PROFILE_SPEC = MemoryDialogSpec(
+    title_add="添加对象特征",
+    title_edit="编辑对象特征",
+    min_width=400,
+    text_field="content",
+    text_label="特征内容:",
+    placeholder="例如：喜欢篮球、性格外向、不喜欢被打扰...",
+    empty_message="特征内容不能为空",
+    value_field="confidence",
+    value_label="置信度:",
+    slider_range=(0, 100),
+    slider_default=0.7,
+    tick_interval=10,
+    source_map={"手动录入": "manual", "模型提取": "model"},
+)
+
+EXPERIENCE_SPEC = MemoryDialogSpec(
+    title_add="添加关系事件",
+    title_edit="编辑关系事件",
+    min_width=450,
+    text_field="event",
+    text_label="事件描述:",
+    placeholder="例如：一起看了电影、发生了争吵、帮助解决了问题...",
+    empty_message="事件描述不能为空",
+    value_field="impact",
+    value_label="关系影响:",
+    slider_range=(-100, 100),
+    slider_default=0.0,
+    tick_interval=20,
+    source_map={"手动录入": "manual", "模型提取": "model"},
+    formatter=_format_signed_percent,
+    hint="← 负面影响 | 正面影响 →",
+)
+
+STRATEGY_SPEC = MemoryDialogSpec(
+    title_add="添加沟通策略",
+    title_edit="编辑沟通策略",
+    min_width=450,
+    text_field="pattern",
+    text_label="策略模式:",
+    placeholder="例如：使用幽默语气能获得更好回应、避免在早上发消息...",
+    empty_message="策略模式不能为空",
+    value_field="effectiveness",
+    value_label="有效性:",
+    slider_range=(0, 100),
+    slider_default=0.5,
+    tick_interval=10,
+    # 策略通常由模型提取
+    source_map={"模型提取": "model", "手动录入": "manual"},
+    hint="0%=无效 | 50%=一般 | 100%=非常有效",
+)
+
 
-    SOURCE_MAP = {"手动录入": "manual", "模型提取": "model"}
-    SOURCE_MAP_REV = {v: k for k, v in SOURCE_MAP.items()}
+class _MemoryEditDialog(QDialog):
+    """添加或编辑一条长期记忆，具体字段由 MemoryDialogSpec 决定。"""
 
-    def __init__(self, parent=None, memory: Optional[ProfileMemory] = None):
+    SPEC: MemoryDialogSpec
+
+    def __init__(self, parent=None, memory=None):
         super().__init__(parent)
-        self.setWindowTitle("编辑对象特征" if memory else "添加对象特征")
+        spec = self.SPEC
+        self.setWindowTitle(spec.title_edit if memory else spec.title_add)
         self._memory = memory
-        self.setMinimumWidth(400)
+        self.setMinimumWidth(spec.min_width)
 
         layout = QVBoxLayout(self)
         form = QFormLayout()
 
-        # 特征内容
-        self.content_edit = QTextEdit()
-        self.content_edit.setAcceptRichText(False)
-        self.content_edit.setPlaceholderText("例如：喜欢篮球、性格外向、不喜欢被打扰...")
-        self.content_edit.setMaximumHeight(80)
+        # 主文本
+        self.text_edit = QTextEdit()
+        self.text_edit.setAcceptRichText(False)
+        self.text_edit.setPlaceholderText(spec.placeholder)
+        self.text_edit.setMaximumHeight(80)
         if memory:
-            self.content_edit.setPlainText(memory.content)
+            self.text_edit.setPlainText(getattr(memory, spec.text_field))
             # 将光标移到开头以避免 Qt 警告
-            cursor = self.content_edit.textCursor()
-            cursor.movePosition(cursor.MoveOperation.Start)
-            self.content_edit.setTextCursor(cursor)
-        form.addRow("特征内容:", self.content_edit)
-
-        # 置信度滑块
-        confidence_widget = QHBoxLayout()
-        self.confidence_slider = QSlider(Qt.Horizontal)
-        self.confidence_slider.setRange(0, 100)
-        self.confidence_slider.setValue(int((memory.confidence if memory else 0.7) * 100))
-        self.confidence_slider.setTickPosition(QSlider.TicksBelow)
-        self.confidence_slider.setTickInterval(10)
-        self.confidence_label = QLabel(f"{self.confidence_slider.value()}%")
-        self.confidence_slider.valueChanged.connect(
-            lambda v: self.confidence_label.setText(f"{v}%")
+            self.text_edit.moveCursor(QTextCursor.MoveOperation.Start)
+        form.addRow(spec.text_label, self.text_edit)
+
+        # 数值滑块
+        value_row = QHBoxLayout()
+        self.value_slider = QSlider(Qt.Horizontal)
+        self.value_slider.setRange(*spec.slider_range)
+        initial = getattr(memory, spec.value_field) if memory else spec.slider_default
+        self.value_slider.setValue(int(initial * 100))
+        self.value_slider.setTickPosition(QSlider.TicksBelow)
+        self.value_slider.setTickInterval(spec.tick_interval)
+        self.value_label = QLabel(spec.formatter(self.value_slider.value()))
+        self.value_slider.valueChanged.connect(
+            lambda v: self.value_label.setText(spec.formatter(v))
         )
-        confidence_widget.addWidget(self.confidence_slider)
-        confidence_widget.addWidget(self.confidence_label)
-        form.addRow("置信度:", confidence_widget)
+        value_row.addWidget(self.value_slider)
+        value_row.addWidget(self.value_label)
+        form.addRow(spec.value_label, value_row)
+
+        if spec.hint:
+            hint = QLabel(spec.hint)
+            hint.setStyleSheet("color: #888; font-size: 11px;")
+            hint.setAlignment(Qt.AlignCenter)
+            form.addRow("", hint)
+
+        self._add_extra_rows(form, memory)
 
         # 来源
         self.source_box = QComboBox()
-        self.source_box.addItems(list(self.SOURCE_MAP.keys()))
+        self.source_box.addItems(list(spec.source_map.keys()))
         if memory:
-            idx = list(self.SOURCE_MAP.values()).index(memory.source)
+            idx = list(spec.source_map.values()).index(memory.source)
             self.source_box.setCurrentIndex(idx)
         form.addRow("来源:", self.source_box)
 
@@ -277,26 +369,47 @@ class ProfileMemoryDialog(QDialog):
         btn_layout.addWidget(btn_cancel)
         layout.addLayout(btn_layout)
 
+    def _add_extra_rows(self, form: QFormLayout, memory) -> None:
+        """子类可在来源下拉框之前追加额外字段。"""
+
+    def _extra_data(self) -> dict:
+        return {}
+
     def _validate_and_accept(self):
-        if not self.content_edit.toPlainText().strip():
-            QMessageBox.warning(self, "提示", "特征内容不能为空")
+        if not self.text_edit.toPlainText().strip():
+            QMessageBox.warning(self, "提示", self.SPEC.empty_message)
             return
         self.accept()
 
     def get_data(self) -> Optional[dict]:
-        content = self.content_edit.toPlainText().strip()
-        if not content:
+        text = self.text_edit.toPlainText().strip()
+        if not text:
             return None
-        return {
-            "content": content,
-            "confidence": self.confidence_slider.value() / 100.0,
-            "source": self.SOURCE_MAP[self.source_box.currentText()],
+        spec = self.SPEC
+        data = {
+            spec.text_field: text,
+            spec.value_field: self.value_slider.value() / 100.0,
         }
+        data.update(self._extra_data())
+        data["source"] = spec.source_map[self.source_box.currentText()]
+        return data
+
 
+class ProfileMemoryDialog(_MemoryEditDialog):
+    """添加或编辑「对象特征」记忆。
 
-class ExperienceMemoryDialog(QDialog):
+    字段:
+    - content: 特征内容（必填）
+    - confidence: 置信度 0~1（滑块 0%~100%）
+    - source: 来源 manual/model
+    """
+
+    SPEC = PROFILE_SPEC
+
+
+class ExperienceMemoryDialog(_MemoryEditDialog):
     """添加或编辑「关系事件」记忆。
-    
+
     字段:
     - event: 事件描述（必填）
     - impact: 影响 -1~+1（滑块 -100%~+100%）
@@ -305,53 +418,9 @@ class ExperienceMemoryDialog(QDialog):
     - source: 来源 manual/model
     """
 
-    SOURCE_MAP = {"手动录入": "manual", "模型提取": "model"}
-    SOURCE_MAP_REV = {v: k for k, v in SOURCE_MAP.items()}
-
-    def __init__(self, parent=None, memory: Optional[ExperienceMemory] = None):
-        super().__init__(parent)
-        self.setWindowTitle("编辑关系事件" if memory else "添加关系事件")
-        self._memory = memory
-        self.setMinimumWidth(450)
-
-        layout = QVBoxLayout(self)
-        form = QFormLayout()
-
-        # 事件描述
-        self.event_edit = QTextEdit()
-        self.event_edit.setAcceptRichText(False)
-        self.event_edit.setPlaceholderText("例如：一起看了电影、发生了争吵、帮助解决了问题...")
-        self.event_edit.setMaximumHeight(80)
-        if memory:
-            self.event_edit.setPlainText(memory.event)
-            # 将光标移到开头以避免 Qt 警告
-            cursor = self.event_edit.textCursor()
-            cursor.movePosition(cursor.MoveOperation.Start)
-            self.event_edit.setTextCursor(cursor)
-        form.addRow("事件描述:", self.event_edit)
-
-        # 影响滑块 (-100% ~ +100%)
-        impact_widget = QHBoxLayout()
-        self.impact_slider = QSlider(Qt.Horizontal)
-        self.impact_slider.setRange(-100, 100)
-        initial_impact = int((memory.impact if memory else 0.0) * 100)
-        self.impact_slider.setValue(initial_impact)
-        self.impact_slider.setTickPosition(QSlider.TicksBelow)
-        self.impact_slider.setTickInterval(20)
-        self.impact_label = QLabel(self._format_impact(initial_impact))
-        self.impact_slider.valueChanged.connect(
-            lambda v: self.impact_label.setText(self._format_impact(v))
-        )
-        impact_widget.addWidget(self.impact_slider)
-        impact_widget.addWidget(self.impact_label)
-        form.addRow("关系影响:", impact_widget)
-
-        # 提示标签
-        impact_hint = QLabel("← 负面影响 | 正面影响 →")
-        impact_hint.setStyleSheet("color: #888; font-size: 11px;")
-        impact_hint.setAlignment(Qt.AlignCenter)
-        form.addRow("", impact_hint)
+    SPEC = EXPERIENCE_SPEC
 
+    def _add_extra_rows(self, form: QFormLayout, memory: Optional[ExperienceMemory]) -> None:
         # 发生时间
         self.time_edit = QLineEdit()
         self.time_edit.setPlaceholderText("例如：2024-01-15 或 上个月")
@@ -366,150 +435,23 @@ class ExperienceMemoryDialog(QDialog):
             self.note_edit.setText(memory.note)
         form.addRow("备注:", self.note_edit)
 
-        # 来源
-        self.source_box = QComboBox()
-        self.source_box.addItems(list(self.SOURCE_MAP.keys()))
-        if memory:
-            idx = list(self.SOURCE_MAP.values()).index(memory.source)
-            self.source_box.setCurrentIndex(idx)
-        form.addRow("来源:", self.source_box)
-
-        layout.addLayout(form)
-
-        # 按钮区域
-        btn_layout = QHBoxLayout()
-        btn_layout.addStretch()
-        btn_ok = QPushButton("确定")
-        apply_primary_style(btn_ok)
-        btn_ok.clicked.connect(self._validate_and_accept)
-        btn_cancel = QPushButton("取消")
-        apply_secondary_style(btn_cancel)
-        btn_cancel.clicked.connect(self.reject)
-        btn_layout.addWidget(btn_ok)
-        btn_layout.addWidget(btn_cancel)
-        layout.addLayout(btn_layout)
-
-    def _format_impact(self, value: int) -> str:
-        if value > 0:
-            return f"+{value}%"
-        return f"{value}%"
-
-    def _validate_and_accept(self):
-        if not self.event_edit.toPlainText().strip():
-            QMessageBox.warning(self, "提示", "事件描述不能为空")
-            return
-        self.accept()
-
-    def get_data(self) -> Optional[dict]:
-        event = self.event_edit.toPlainText().strip()
-        if not event:
-            return None
+    def _extra_data(self) -> dict:
         return {
-            "event": event,
-            "impact": self.impact_slider.value() / 100.0,
             "event_time": self.time_edit.text().strip() or None,
             "note": self.note_edit.text().strip() or None,
-            "source": self.SOURCE_MAP[self.source_box.currentText()],
         }
 
 
-class StrategyMemoryDialog(QDialog):
+class StrategyMemoryDialog(_MemoryEditDialog):
     """添加或编辑「沟通策略」记忆。
-    
+
     字段:
     - pattern: 策略模式描述（必填）
     - effectiveness: 有效性 0~1（滑块 0%~100%）
     - source: 来源 manual/model（主要是 model）
     """
 
-    SOURCE_MAP = {"模型提取": "model", "手动录入": "manual"}
-    SOURCE_MAP_REV = {v: k for k, v in SOURCE_MAP.items()}
-
-    def __init__(self, parent=None, memory: Optional[StrategyMemory] = None):
-        super().__init__(parent)
-        self.setWindowTitle("编辑沟通策略" if memory else "添加沟通策略")
-        self._memory = memory
-        self.setMinimumWidth(450)
-
-        layout = QVBoxLayout(self)
-        form = QFormLayout()
-
-        # 策略模式
-        self.pattern_edit = QTextEdit()
-        self.pattern_edit.setAcceptRichText(False)
-        self.pattern_edit.setPlaceholderText(
-            "例如：使用幽默语气能获得更好回应、避免在早上发消息..."
-        )
-        self.pattern_edit.setMaximumHeight(80)
-        if memory:
-            self.pattern_edit.setPlainText(memory.pattern)
-            # 将光标移到开头以避免 Qt 警告
-            cursor = self.pattern_edit.textCursor()
-            cursor.movePosition(cursor.MoveOperation.Start)
-            self.pattern_edit.setTextCursor(cursor)
-        form.addRow("策略模式:", self.pattern_edit)
-
-        # 有效性滑块
-        eff_widget = QHBoxLayout()
-        self.effectiveness_slider = QSlider(Qt.Horizontal)
-        self.effectiveness_slider.setRange(0, 100)
-        self.effectiveness_slider.setValue(
-            int((memory.effectiveness if memory else 0.5) * 100)
-        )
-        self.effectiveness_slider.setTickPosition(QSlider.TicksBelow)
-        self.effectiveness_slider.setTickInterval(10)
-        self.effectiveness_label = QLabel(f"{self.effectiveness_slider.value()}%")
-        self.effectiveness_slider.valueChanged.connect(
-            lambda v: self.effectiveness_label.setText(f"{v}%")
-        )
-        eff_widget.addWidget(self.effectiveness_slider)
-        eff_widget.addWidget(self.effectiveness_label)
-        form.addRow("有效性:", eff_widget)
-
-        # 提示
-        eff_hint = QLabel("0%=无效 | 50%=一般 | 100%=非常有效")
-        eff_hint.setStyleSheet("color: #888; font-size: 11px;")
-        eff_hint.setAlignment(Qt.AlignCenter)
-        form.addRow("", eff_hint)
-
-        # 来源（策略通常由模型提取）
-        self.source_box = QComboBox()
-        self.source_box.addItems(list(self.SOURCE_MAP.keys()))
-        if memory:
-            idx = list(self.SOURCE_MAP.values()).index(memory.source)
-            self.source_box.setCurrentIndex(idx)
-        form.addRow("来源:", self.source_box)
-
-        layout.addLayout(form)
-
-        # 按钮区域
-        btn_layout = QHBoxLayout()
-        btn_layout.addStretch()
-        btn_ok = QPushButton("确定")
-        apply_primary_style(btn_ok)
-        btn_ok.clicked.connect(self._validate_and_accept)
-        btn_cancel = QPushButton("取消")
-        apply_secondary_style(btn_cancel)
-        btn_cancel.clicked.connect(self.reject)
-        btn_layout.addWidget(btn_ok)
-        btn_layout.addWidget(btn_cancel)
-        layout.addLayout(btn_layout)
-
-    def _validate_and_accept(self):
-        if not self.pattern_edit.toPlainText().strip():
-            QMessageBox.warning(self, "提示", "策略模式不能为空")
-            return
-        self.accept()
-
-    def get_data(self) -> Optional[dict]:
-        pattern = self.pattern_edit.toPlainText().strip()
-        if not pattern:
-            return None
-        return {
-            "pattern": pattern,
-            "effectiveness": self.effectiveness_slider.value() / 100.0,
-            "source": self.SOURCE_MAP[self.source_box.currentText()],
-        }
+    SPEC = STRATEGY_SPEC
 
 
 # =====================================================================
@@ -549,7 +491,6 @@ class DuplicateMemoryDialog(QDialog):
         layout.addWidget(hint)
         
         # 滚动区域包含所有重复项
-        from PySide6.QtWidgets import QScrollArea
         scroll = QScrollArea()
         scroll.setWidgetResizable(True)
         scroll_content = QWidget()
@@ -617,7 +558,6 @@ class DuplicateMemoryDialog(QDialog):
         group_layout.addWidget(reason_label)
         
         # 选项
-        from PySide6.QtWidgets import QButtonGroup, QRadioButton
         btn_group = QButtonGroup(self)
         
         radio_replace = QRadioButton("替换现有记忆（用新记忆覆盖）")
@@ -743,8 +683,6 @@ class StrategyMergeDialog(QDialog):
     
     def _is_dark_theme(self) -> bool:
         """检测当前是否为暗色主题。"""
-        from PySide6.QtWidgets import QApplication
-        from PySide6.QtGui import QPalette
         app = QApplication.instance()
         palette = app.palette() if app else self.palette()
         window_color = palette.color(QPalette.Window)
@@ -772,19 +710,28 @@ class StrategyMergeDialog(QDialog):
 # AI 提取记忆预览对话框
 # =====================================================================
 
-class MemoryExtractionWorker(QThread):
-    """后台线程执行记忆提取。"""
-    
+class _ExtractionSignals(QObject):
+    """QRunnable 不是 QObject，结果通过该对象的信号排队回到 UI 线程。"""
+
     finished = Signal(object)  # ExtractionResult
     error = Signal(str)
-    
+
+
+class MemoryExtractionWorker(QRunnable):
+    """在共享线程池中执行记忆提取。
+
+    提取主要耗时在 LLM 网络请求上，复用全局 QThreadPool 可以避免每次打开
+    对话框都新建/销毁一个 QThread，多个联系人的提取也能并行等待 I/O。
+    """
+
     def __init__(self, extractor, contact_name: str, conversation: list, existing_memories: dict):
         super().__init__()
+        self.signals = _ExtractionSignals()
         self._extractor = extractor
         self._contact_name = contact_name
         self._conversation = conversation
         self._existing_memories = existing_memories
-    
+
     def run(self):
         try:
             result = self._extractor.extract_from_conversation(
@@ -792,9 +739,9 @@ class MemoryExtractionWorker(QThread):
                 self._conversation,
                 self._existing_memories,
             )
-            self.finished.emit(result)
+            self.signals.finished.emit(result)
         except Exception as err:
-            self.error.emit(str(err))
+            self.signals.error.emit(str(err))
 
 
 class MemoryExtractionDialog(QDialog):
@@ -885,9 +832,9 @@ class MemoryExtractionDialog(QDialog):
     def start_extraction(self, extractor, contact_name: str, conversation: list, existing_memories: dict):
         """开始后台提取。"""
         self._worker = MemoryExtractionWorker(extractor, contact_name, conversation, existing_memories)
-        self._worker.finished.connect(self._on_extraction_finished)
-        self._worker.error.connect(self._on_extraction_error)
-        self._worker.start()
+        self._worker.signals.finished.connect(self._on_extraction_finished)
+        self._worker.signals.error.connect(self._on_extraction_error)
+        QThreadPool.globalInstance().start(self._worker)
     
     def _on_extraction_finished(self, result):
         """提取完成。"""
@@ -1005,16 +952,4 @@ class MemoryExtractionDialog(QDialog):
             "experiences": experiences,
             "strategies": strategies,
         }
-        
-        strategies = []
-        for i in range(self.strategy_list.count()):
-            item = self.strategy_list.item(i)
-            if item.isSelected():
-                strategies.append(item.data(Qt.UserRole))
-        
-        return {
-            "profiles": profiles,
-            "experiences": experiences,
-            "strategies": strategies,
-        }
 
@@ -3,13 +3,26 @@
 from __future__ import annotations
 
 import json
+import logging
+import math
 import os
+import queue
 import re
-from datetime import datetime
-from typing import Optional, List
-
-from PySide6.QtCore import Qt, QSize, Signal, QTimer, QThread
-from PySide6.QtGui import QAction, QPixmap, QPalette, QPainter, QPainterPath
+import time
+import weakref
+from bisect import bisect_right
+from collections import defaultdict
+from dataclasses import asdict, dataclass
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from uuid import uuid4
+from typing import Dict, List, Optional, Tuple
+
+from PySide6.QtCore import (
+    Qt, QAbstractListModel, QEvent, QModelIndex, QObject, QRect, QRunnable, QSize, Signal,
+    QThread, QThreadPool, QTimer,
+)
+from PySide6.QtGui import QAction, QColor, QFont, QFontMetrics, QImage, QPixmap, QPixmapCache, QPalette, QPainter
 from PySide6.QtWidgets import (
     QApplication,
     QCheckBox,
@@ -19,6 +32,7 @@ from PySide6.QtWidgets import (
     QHBoxLayout,
     QLabel,
     QLineEdit,
+    QListView,
     QListWidget,
     QListWidgetItem,
     QMainWindow,
@@ -33,27 +47,46 @@ from PySide6.QtWidgets import (
     QTextEdit,
     QToolButton,
     QSizePolicy,
+    QSpacerItem,
+    QStyle,
+    QStyledItemDelegate,
     QVBoxLayout,
     QWidget,
 )
 
-# matplotlib 嵌入 PySide6
-import matplotlib
-matplotlib.use("QtAgg")
-from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.figure import Figure
-import matplotlib.pyplot as plt
-import numpy as np
-
+from core.config import (
+    THEME_LIGHT,
+    THEME_DARK,
+    THEME_SYSTEM,
+    save_api_settings,
+    save_intimacy_weight_settings,
+)
 from core.system import DialogueDecisionSystem
 from core.user_profile import ContactType
 from core.memory_extractor import MemoryExtractor
 from core.intimacy_manager import IntimacyManager
+try:
+    import ahocorasick  # 可选：pyahocorasick，一次扫描匹配全部关键词
+except ImportError:
+    ahocorasick = None
+try:
+    import orjson  # 可选：orjson，直接按字节解析/序列化，导入导出更快
+except ImportError:
+    orjson = None
+try:
+    import ijson  # 可选：ijson，流式解析导入文件，不必先构建整棵 JSON 树
+except ImportError:
+    ijson = None
+
 from .dialogs import (
     PersonDialog, ProfileMemoryDialog, ExperienceMemoryDialog, StrategyMemoryDialog,
     MemoryExtractionDialog, DuplicateMemoryDialog, StrategyMergeDialog,
 )
+from .settings_dialogs import (
+    APISettingsDialog, IntimacyWeightSettingsDialog, HelpDialog, AlgorithmDialog,
+)
 from .store import AppStore, Person, MemoryItem
+from .theme_manager import ThemeManager, get_theme_display_name
 from .button_styles import (
     apply_primary_style,
     apply_secondary_style,
@@ -65,6 +98,48 @@ from .button_styles import (
 )
 
 
+def _load_json_file(file_path: str):
+    """读取 JSON 文件；装有 orjson 时直接解析字节，省去一次解码。"""
+    with open(file_path, "rb") as f:
+        raw = f.read()
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw.decode("utf-8"))
+
+
+def _read_import_records(file_path: str) -> tuple[list, dict]:
+    """解析导入文件，返回 (Person 列表, {person_id: [MemoryItem]})。
+
+    装有 ijson 时按条流式解析并直接构建对象，否则整体解析后再转换。
+    """
+    if ijson is not None:
+        with open(file_path, "rb") as f:
+            people = [Person(**item) for item in ijson.items(f, "people.item", use_float=True)]
+            f.seek(0)
+            memories = {
+                pid: [MemoryItem(**m) for m in items]
+                for pid, items in ijson.kvitems(f, "memories", use_float=True)
+            }
+        return people, memories
+    data = _load_json_file(file_path)
+    people = [Person(**item) for item in data.get("people", [])]
+    memories = {
+        pid: [MemoryItem(**m) for m in items]
+        for pid, items in data.get("memories", {}).items()
+    }
+    return people, memories
+
+
+def _dump_json_file(file_path: str, data) -> None:
+    """以缩进两格的 UTF-8 JSON 写入文件。"""
+    if orjson is not None:
+        payload = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    else:
+        payload = json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+    with open(file_path, "wb") as f:
+        f.write(payload)
+
+
 RELATIONSHIP_TO_CONTACT = {
     "家人": ContactType.FAMILY,
     "朋友": ContactType.FRIEND,
@@ -76,580 +151,695 @@ RELATIONSHIP_TO_CONTACT = {
 }
 
 
-class PersonItemWidget(QWidget):
-    """关系对象列表项。"""
+class _ThemeCache:
+    """缓存当前是否为暗色主题。
 
-    def __init__(self, person: Person, parent: Optional[QWidget] = None):
-        super().__init__(parent)
-        self.person = person
-        self._hovered = False
-        self._selected = False
-
-        self.setCursor(Qt.PointingHandCursor)
-        self.setAttribute(Qt.WA_StyledBackground, True)
-
-        self.avatar = QLabel()
-        self.avatar.setFixedSize(36, 36)
-        self.avatar.setAlignment(Qt.AlignCenter)
-        self.avatar.setStyleSheet("background:#f0f0f0;border-radius:6px;")
-        if person.avatar_path and os.path.exists(person.avatar_path):
-            pixmap = QPixmap(person.avatar_path)
-            if not pixmap.isNull():
-                scaled = pixmap.scaled(
-                    36, 36, Qt.KeepAspectRatioByExpanding, Qt.SmoothTransformation
-                )
-                cropped = self._center_crop(scaled, 36, 36)
-                self.avatar.setPixmap(self._rounded_pixmap(cropped, 6))
-        else:
-            self.avatar.setText("👤")
+    列表项在悬停/选中时频繁查询主题，这里只在调色板变化时重新计算一次，
+    其余时候直接返回缓存的布尔值。
+    """
 
-        self.name_label = QLabel(person.display_name)
-        self.name_label.setStyleSheet("font-weight:600;")
-        self.meta_label = QLabel(
-            f"{person.relationship_type} · 亲密度 {person.intimacy}%"
-        )
-        self.meta_label.setStyleSheet("color:#666;")
+    _is_dark: Optional[bool] = None
+    _connected = False
 
-        tags = ", ".join(person.style_tags) if person.style_tags else "-"
-        self.tag_label = QLabel(tags)
-        self.tag_label.setStyleSheet("color:#999;")
+    @classmethod
+    def is_dark(cls) -> bool:
+        if cls._is_dark is None:
+            cls.refresh()
+        return bool(cls._is_dark)
 
-        text_layout = QVBoxLayout()
-        text_layout.addWidget(self.name_label)
-        text_layout.addWidget(self.meta_label)
-        text_layout.addWidget(self.tag_label)
+    @classmethod
+    def refresh(cls, *_args) -> None:
+        app = QApplication.instance()
+        if app is None:
+            cls._is_dark = None
+            return
+        if not cls._connected:
+            app.paletteChanged.connect(cls.refresh)
+            cls._connected = True
+        try:
+            # 主题管理器在应用主题时已经算好，无需再读取调色板
+            cls._is_dark = ThemeManager.instance().is_dark
+        except RuntimeError:
+            cls._is_dark = app.palette().color(QPalette.Window).lightness() < 128
 
-        layout = QHBoxLayout(self)
-        layout.setContentsMargins(6, 6, 6, 6)
-        layout.addWidget(self.avatar)
-        layout.addLayout(text_layout)
 
-        self._update_style()
+_clipboard_ref = None
 
-    def set_selected(self, selected: bool) -> None:
-        self._selected = selected
-        self._update_style()
 
-    def enterEvent(self, event) -> None:
-        self._hovered = True
-        self._update_style()
-        super().enterEvent(event)
+def _get_clipboard():
+    """返回应用剪贴板（首次调用时获取并缓存）。"""
+    global _clipboard_ref
+    if _clipboard_ref is None:
+        _clipboard_ref = QApplication.instance().clipboard()
+    return _clipboard_ref
 
-    def leaveEvent(self, event) -> None:
-        self._hovered = False
-        self._update_style()
-        super().leaveEvent(event)
 
-    def _update_style(self) -> None:
-        is_dark = self._is_dark_theme()
-        if is_dark:
-            if self._selected:
-                bg = "#37373d"
-                name_color = "#ffffff"
-                meta_color = "#d0d0d0"
-                tag_color = "#b0b0b0"
-            elif self._hovered:
-                bg = "#2a2d2e"
-                name_color = "#f2f2f2"
-                meta_color = "#c8c8c8"
-                tag_color = "#a8a8a8"
-            else:
-                bg = "transparent"
-                name_color = "#f2f2f2"
-                meta_color = "#c8c8c8"
-                tag_color = "#a8a8a8"
-        else:
-            if self._selected:
-                bg = "#eaeaea"
-                name_color = "#1f1f1f"
-                meta_color = "#555"
-                tag_color = "#777"
-            elif self._hovered:
-                bg = "#efefef"
-                name_color = "#2a2a2a"
-                meta_color = "#5f5f5f"
-                tag_color = "#7f7f7f"
-            else:
-                bg = "transparent"
-                name_color = "#2f2f2f"
-                meta_color = "#6b6b6b"
-                tag_color = "#8a8a8a"
+def _center_crop(pixmap: QPixmap, target_w: int, target_h: int) -> QPixmap:
+    width = pixmap.width()
+    height = pixmap.height()
+    if width <= target_w and height <= target_h:
+        return pixmap
+    x = max(0, (width - target_w) // 2)
+    y = max(0, (height - target_h) // 2)
+    return pixmap.copy(x, y, target_w, target_h)
 
-        self.setStyleSheet(f"PersonItemWidget {{ background-color:{bg}; border-radius:6px; }}")
-        self.name_label.setStyleSheet(f"font-weight:600;color:{name_color};background:transparent;")
-        self.meta_label.setStyleSheet(f"color:{meta_color};background:transparent;")
-        self.tag_label.setStyleSheet(f"color:{tag_color};background:transparent;")
 
-    def update_intimacy(self, intimacy: int) -> None:
-        """更新亲密度显示。"""
-        self.person.intimacy = intimacy
-        self.meta_label.setText(f"{self.person.relationship_type} · 亲密度 {intimacy}%")
+# (宽, 高, 圆角半径) -> 圆角 Alpha 遮罩，同尺寸头像共用一份
+_alpha_mask_cache: Dict[Tuple[int, int, int], QImage] = {}
 
-    @staticmethod
-    def _center_crop(pixmap: QPixmap, target_w: int, target_h: int) -> QPixmap:
-        width = pixmap.width()
-        height = pixmap.height()
-        if width <= target_w and height <= target_h:
-            return pixmap
-        x = max(0, (width - target_w) // 2)
-        y = max(0, (height - target_h) // 2)
-        return pixmap.copy(x, y, target_w, target_h)
 
-    @staticmethod
-    def _rounded_pixmap(pixmap: QPixmap, radius: int) -> QPixmap:
-        target = QPixmap(pixmap.size())
-        target.fill(Qt.transparent)
-        painter = QPainter(target)
+def _get_alpha_mask(width: int, height: int, radius: int) -> QImage:
+    key = (width, height, radius)
+    mask = _alpha_mask_cache.get(key)
+    if mask is None:
+        mask = QImage(width, height, QImage.Format_Alpha8)
+        mask.fill(Qt.transparent)
+        painter = QPainter(mask)
         painter.setRenderHint(QPainter.Antialiasing)
-        path = QPainterPath()
-        path.addRoundedRect(0, 0, pixmap.width(), pixmap.height(), radius, radius)
-        painter.setClipPath(path)
-        painter.drawPixmap(0, 0, pixmap)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(Qt.black)
+        painter.drawRoundedRect(0, 0, width, height, radius, radius)
         painter.end()
-        return target
+        _alpha_mask_cache[key] = mask
+    return mask
+
+
+def _rounded_pixmap(pixmap: QPixmap, radius: int) -> QPixmap:
+    image = pixmap.toImage().convertToFormat(QImage.Format_ARGB32_Premultiplied)
+    image.setAlphaChannel(_get_alpha_mask(image.width(), image.height(), radius))
+    return QPixmap.fromImage(image)
+
+
+# 头像等小图使用 Qt 全局像素图缓存（单位 KB）
+QPixmapCache.setCacheLimit(20 * 1024)
+
+
+def _build_avatar_pixmap(path: str, size: int, radius: int) -> QPixmap:
+    """解码、缩放、居中裁剪并圆角化头像。
+
+    结果放入 QPixmapCache，键包含文件修改时间，文件被替换后自然失效；
+    同一头像在任何地方再次绘制都不会重复解码。
+    """
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        # 文件不存在或不可读：一次 stat 同时完成存在性检查
+        return QPixmap()
+    key = f"av:{path}:{mtime}:{size}:{radius}"
+    cached = QPixmap()
+    if QPixmapCache.find(key, cached):
+        return cached
+    pixmap = QPixmap(path)
+    if pixmap.isNull():
+        return pixmap
+    scaled = pixmap.scaled(size, size, Qt.KeepAspectRatioByExpanding, Qt.SmoothTransformation)
+    rounded = _rounded_pixmap(_center_crop(scaled, size, size), radius)
+    QPixmapCache.insert(key, rounded)
+    return rounded
+
+
+# 联系人列表项配色：(暗色主题, 选中, 悬停) -> (背景, 姓名, 关系/亲密度, 标签)
+# 模块加载时即构造好 QColor，绘制时只做一次字典查找
+_PERSON_ITEM_COLORS = {
+    key: tuple(QColor(name) if name else None for name in names)
+    for key, names in {
+        (True, True, False): ("#37373d", "#ffffff", "#d0d0d0", "#b0b0b0"),
+        (True, True, True): ("#37373d", "#ffffff", "#d0d0d0", "#b0b0b0"),
+        (True, False, True): ("#2a2d2e", "#f2f2f2", "#c8c8c8", "#a8a8a8"),
+        (True, False, False): (None, "#f2f2f2", "#c8c8c8", "#a8a8a8"),
+        (False, True, False): ("#eaeaea", "#1f1f1f", "#555", "#777"),
+        (False, True, True): ("#eaeaea", "#1f1f1f", "#555", "#777"),
+        (False, False, True): ("#efefef", "#2a2a2a", "#5f5f5f", "#7f7f7f"),
+        (False, False, False): (None, "#2f2f2f", "#6b6b6b", "#8a8a8a"),
+    }.items()
+}
+_AVATAR_PLACEHOLDER_COLOR = QColor("#f0f0f0")
 
-    def _is_dark_theme(self) -> bool:
-        app = QApplication.instance()
-        palette = app.palette() if app else self.palette()
-        window_color = palette.color(QPalette.Window)
-        return window_color.lightness() < 128
+# 存放 Person 对象的数据角色（Qt.UserRole 存放 person_id）
+PERSON_ROLE = Qt.UserRole + 1
 
 
-class MemoryCardWidget(QWidget):
-    """记忆卡片组件 - 显示单条记忆，支持编辑和删除。"""
-    
-    edit_clicked = Signal(str, str)  # memory_id, memory_type
-    delete_clicked = Signal(str, str)  # memory_id, memory_type
-    
-    def __init__(
-        self, 
-        memory_id: str, 
-        memory_type: str,  # "profile", "experience", "strategy"
-        title: str,
-        subtitle: str,
-        badge_text: str,
-        badge_color: str = "#4a90d9",
-        parent: Optional[QWidget] = None
-    ):
-        super().__init__(parent)
-        self.memory_id = memory_id
-        self.memory_type = memory_type
-        
-        self.setMinimumHeight(70)
-        self.setCursor(Qt.PointingHandCursor)
-        
-        # 主布局
-        layout = QHBoxLayout(self)
-        layout.setContentsMargins(12, 10, 12, 10)
-        layout.setSpacing(12)
-        
-        # 左侧徽章
-        badge_label = QLabel(badge_text)
-        badge_label.setFixedWidth(60)
-        badge_label.setAlignment(Qt.AlignCenter)
-        badge_label.setStyleSheet(f"""
-            background-color: {badge_color};
-            color: white;
-            border-radius: 4px;
-            padding: 4px 8px;
-            font-size: 12px;
-            font-weight: bold;
-        """)
-        
-        # 中间内容区
-        content_layout = QVBoxLayout()
-        content_layout.setSpacing(4)
-        
-        title_label = QLabel(title)
-        title_label.setWordWrap(True)
-        title_label.setStyleSheet("font-size: 14px; font-weight: 500;")
-        
-        subtitle_label = QLabel(subtitle)
-        subtitle_label.setStyleSheet("font-size: 12px; color: #888;")
-        
-        content_layout.addWidget(title_label)
-        content_layout.addWidget(subtitle_label)
-        
-        # 右侧按钮区
-        btn_layout = QVBoxLayout()
-        btn_layout.setSpacing(4)
-        
-        edit_btn = QPushButton("✏️")
-        edit_btn.setFixedSize(28, 28)
-        edit_btn.setToolTip("编辑")
-        edit_btn.setCursor(Qt.PointingHandCursor)
-        edit_btn.setStyleSheet("""
-            QPushButton {
-                border: 1px solid #ccc;
-                border-radius: 4px;
-                background: #f5f5f5;
-            }
-            QPushButton:hover {
-                background: #e0e0e0;
-            }
-        """)
-        edit_btn.clicked.connect(lambda: self.edit_clicked.emit(self.memory_id, self.memory_type))
-        
-        delete_btn = QPushButton("🗑️")
-        delete_btn.setFixedSize(28, 28)
-        delete_btn.setToolTip("删除")
-        delete_btn.setCursor(Qt.PointingHandCursor)
-        delete_btn.setStyleSheet("""
-            QPushButton {
-                border: 1px solid #ccc;
-                border-radius: 4px;
-                background: #f5f5f5;
-            }
-            QPushButton:hover {
-                background: #ffdddd;
-            }
-        """)
-        delete_btn.clicked.connect(lambda: self.delete_clicked.emit(self.memory_id, self.memory_type))
-        
-        btn_layout.addWidget(edit_btn)
-        btn_layout.addWidget(delete_btn)
-        
-        layout.addWidget(badge_label)
-        layout.addLayout(content_layout, 1)
-        layout.addLayout(btn_layout)
-        
-        # 卡片样式
-        self._update_style()
-    
-    def _update_style(self):
-        is_dark = self._is_dark_theme()
-        if is_dark:
-            self.setStyleSheet("""
-                MemoryCardWidget {
-                    background-color: #3a3a3a;
-                    border: 1px solid #555;
-                    border-radius: 8px;
-                }
-                MemoryCardWidget:hover {
-                    background-color: #444;
-                    border-color: #666;
-                }
-            """)
-        else:
-            self.setStyleSheet("""
-                MemoryCardWidget {
-                    background-color: #ffffff;
-                    border: 1px solid #e0e0e0;
-                    border-radius: 8px;
-                }
-                MemoryCardWidget:hover {
-                    background-color: #f8f8f8;
-                    border-color: #ccc;
-                }
-            """)
-    
-    def _is_dark_theme(self) -> bool:
-        app = QApplication.instance()
-        palette = app.palette() if app else self.palette()
-        window_color = palette.color(QPalette.Window)
-        return window_color.lightness() < 128
+class PersonDelegate(QStyledItemDelegate):
+    """关系对象列表项绘制代理。
 
+    直接用 QPainter 绘制头像、姓名、关系/亲密度和标签，
+    不再为每一行创建独立的 QWidget 子树。
 
-class IntimacyTrendChart(FigureCanvas):
-    """亲密度变化趋势折线图组件（使用相对时间）。"""
-    
-    # 中文字体配置
-    CHINESE_FONTS = [
-        'PingFang SC',           # macOS
-        'Heiti SC',              # macOS
-        'STHeiti',               # macOS
-        'Hiragino Sans GB',      # macOS
-        'Microsoft YaHei',       # Windows
-        'SimHei',                # Windows
-        'WenQuanYi Micro Hei',   # Linux
-        'Noto Sans CJK SC',      # Linux
-        'sans-serif'             # 后备
-    ]
-    
-    # 时间单位配置：(秒数阈值, 除数, 单位名称)
-    TIME_UNITS = [
-        (60, 1, '秒'),                    # < 1分钟
-        (3600, 60, '分钟'),               # < 1小时
-        (86400, 3600, '小时'),            # < 1天
-        (604800, 86400, '天'),            # < 1周
-        (2592000, 604800, '周'),          # < 30天
-        (31536000, 2592000, '月'),        # < 1年
-        (float('inf'), 31536000, '年'),   # >= 1年
-    ]
+    选中/悬停样式在绘制时从 option.state 读取，不需要遍历所有行设置状态：
+    当前行变化时视图只重绘新旧两行。
+    """
 
-    def __init__(self, parent: Optional[QWidget] = None):
-        # 创建 Figure 和 Axes
-        self.fig = Figure(figsize=(5, 2.2), dpi=100, facecolor='none')
-        self.ax = self.fig.add_subplot(111)
-        super().__init__(self.fig)
-        self.setParent(parent)
-        self.setMinimumHeight(160)
-        self.setMaximumHeight(200)
-        
-        # 设置透明背景
-        self.fig.patch.set_alpha(0)
-        self.ax.patch.set_alpha(0.05)
-        
-        # 配置中文字体
-        self._setup_chinese_font()
-        
-        # 禁用 FigureCanvas 的滚轮事件，让父容器处理滚动
-        self.setFocusPolicy(Qt.NoFocus)
-        
-        # 初始化空图表
-        self._setup_style()
-        self._draw_empty()
+    ROW_HEIGHT = 70
+    AVATAR_SIZE = 36
+    AVATAR_RADIUS = 6
+    MARGIN = 6
+    SPACING = 6
 
-    def wheelEvent(self, event):
-        """将滚轮事件传递给父容器，解决滚动失灵问题。"""
-        event.ignore()
+    def paint(self, painter: QPainter, option, index) -> None:
+        person = index.data(PERSON_ROLE)
+        if person is None:
+            return super().paint(painter, option, index)
 
-    def _setup_chinese_font(self) -> None:
-        """配置中文字体支持。"""
-        import matplotlib.font_manager as fm
-        
-        # 尝试找到可用的中文字体
-        available_fonts = set(f.name for f in fm.fontManager.ttflist)
-        selected_font = None
-        
-        for font_name in self.CHINESE_FONTS:
-            if font_name in available_fonts:
-                selected_font = font_name
-                break
-        
-        if selected_font:
-            plt.rcParams['font.family'] = selected_font
-            plt.rcParams['font.sans-serif'] = [selected_font] + self.CHINESE_FONTS
-        else:
-            # 使用 sans-serif 并添加中文字体列表
-            plt.rcParams['font.sans-serif'] = self.CHINESE_FONTS
-        
-        # 解决负号显示问题
-        plt.rcParams['axes.unicode_minus'] = False
-
-    def _setup_style(self, x_unit: str = '') -> None:
-        """设置图表样式。"""
-        # 使用现代配色
-        self.ax.spines['top'].set_visible(False)
-        self.ax.spines['right'].set_visible(False)
-        self.ax.spines['left'].set_color('#cccccc')
-        self.ax.spines['bottom'].set_color('#cccccc')
-        self.ax.tick_params(colors='#666666', labelsize=8)
-        self.ax.set_ylabel('亲密度 (%)', fontsize=9, color='#666666')
-        if x_unit:
-            self.ax.set_xlabel(f'相对时间 ({x_unit})', fontsize=9, color='#666666')
-        self.ax.set_ylim(0, 105)
-        self.ax.grid(True, linestyle='--', alpha=0.3, color='#999999')
-
-    def _draw_empty(self) -> None:
-        """绘制空状态提示。"""
-        self.ax.clear()
-        self._setup_style()
-        self.ax.text(0.5, 0.5, '暂无趋势数据', 
-                     transform=self.ax.transAxes,
-                     ha='center', va='center', 
-                     fontsize=11, color='#999999')
-        self.fig.tight_layout(pad=1.5)
-        self.draw()
-
-    def _select_time_unit(self, max_seconds: float) -> tuple:
-        """
-        根据最大时间跨度选择合适的时间单位。
-        
-        返回：(除数, 单位名称)
-        """
-        for threshold, divisor, unit_name in self.TIME_UNITS:
-            if max_seconds < threshold:
-                return divisor, unit_name
-        return self.TIME_UNITS[-1][1], self.TIME_UNITS[-1][2]
+        selected = bool(option.state & QStyle.State_Selected)
+        hovered = bool(option.state & QStyle.State_MouseOver)
+        bg, name_color, meta_color, tag_color = _PERSON_ITEM_COLORS[
+            (_ThemeCache.is_dark(), selected, hovered)
+        ]
 
-    def _calculate_nice_ticks(self, max_value: float, num_ticks: int = 5) -> List[float]:
-        """
-        计算规范化的刻度值（整数或简单小数）。
-        
-        策略：选择 1, 2, 5, 10, 20, 50... 等规整数值作为刻度间隔
-        """
-        if max_value <= 0:
-            return [0]
-        
-        # 计算合适的刻度间隔
-        raw_interval = max_value / num_ticks
-        
-        # 规范化间隔值
-        magnitude = 10 ** int(np.floor(np.log10(raw_interval))) if raw_interval > 0 else 1
-        normalized = raw_interval / magnitude
-        
-        # 选择规整的间隔
-        if normalized <= 1:
-            nice_interval = 1 * magnitude
-        elif normalized <= 2:
-            nice_interval = 2 * magnitude
-        elif normalized <= 5:
-            nice_interval = 5 * magnitude
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        rect = option.rect
+
+        if bg:
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(bg)
+            painter.drawRoundedRect(rect, 6, 6)
+
+        # 头像
+        size = self.AVATAR_SIZE
+        avatar_rect = QRect(
+            rect.x() + self.MARGIN, rect.y() + (rect.height() - size) // 2, size, size
+        )
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(_AVATAR_PLACEHOLDER_COLOR)
+        painter.drawRoundedRect(avatar_rect, self.AVATAR_RADIUS, self.AVATAR_RADIUS)
+        pixmap = self._avatar_pixmap(person)
+        if pixmap is not None:
+            painter.drawPixmap(avatar_rect, pixmap)
         else:
-            nice_interval = 10 * magnitude
-        
-        # 生成刻度值
-        ticks = []
-        current = 0
-        while current <= max_value * 1.1:  # 稍微超出一点
-            ticks.append(current)
-            current += nice_interval
-        
-        return ticks
+            painter.setPen(name_color)
+            painter.drawText(avatar_rect, Qt.AlignCenter, "👤")
+
+        # 文字区域：姓名 / 关系·亲密度 / 标签
+        text_x = avatar_rect.right() + 1 + self.SPACING
+        text_w = max(0, rect.right() - self.MARGIN - text_x)
+        font = QFont(option.font)
+        line_h = option.fontMetrics.lineSpacing() + 2
+        top = rect.y() + (rect.height() - line_h * 3) // 2
+
+        rows = (
+            (person.display_name, name_color, True),
+            (f"{person.relationship_type} · 亲密度 {person.intimacy}%", meta_color, False),
+            (", ".join(person.style_tags) if person.style_tags else "-", tag_color, False),
+        )
+        for i, (text, color, bold) in enumerate(rows):
+            font.setWeight(QFont.DemiBold if bold else QFont.Normal)
+            painter.setFont(font)
+            painter.setPen(color)
+            elided = painter.fontMetrics().elidedText(text, Qt.ElideRight, text_w)
+            painter.drawText(
+                QRect(text_x, top + i * line_h, text_w, line_h),
+                Qt.AlignLeft | Qt.AlignVCenter,
+                elided,
+            )
 
-    def update_data(self, history: List[dict]) -> None:
-        """
-        更新折线图数据。
-        
-        横坐标使用相对时间：
-        - 第一个数据点位于 x=0
-        - 后续数据点显示相对于第一个数据点的时间差
-        - 时间单位根据数据跨度动态选择（分钟/小时/天/周/月/年）
-        """
-        self.ax.clear()
-        
-        if not history or len(history) < 1:
-            self._setup_style()
-            self._draw_empty()
+        painter.restore()
+
+    def sizeHint(self, option, index) -> QSize:
+        return QSize(220, self.ROW_HEIGHT)
+
+    def _avatar_pixmap(self, person: Person) -> Optional[QPixmap]:
+        path = person.avatar_path
+        if not path:
+            return None
+        pixmap = _build_avatar_pixmap(path, self.AVATAR_SIZE, self.AVATAR_RADIUS)
+        return None if pixmap.isNull() else pixmap
+
+
+class ContactListModel(QAbstractListModel):
+    """联系人列表模型：持有过滤后的对象顺序，并按 person_id 维护行号索引。
+
+    视图只绘制可见行，成员与顺序不变时只发出 dataChanged，不重置模型。
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._people: List[Person] = []
+        self._row_by_id: Dict[str, int] = {}
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._people)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        person = self._people[index.row()]
+        if role == PERSON_ROLE:
+            return person
+        if role == Qt.UserRole:
+            return person.person_id
+        if role == Qt.DisplayRole:
+            return person.display_name
+        return None
+
+    def set_people(self, people: List[Person]) -> None:
+        ids = [person.person_id for person in people]
+        if ids == [person.person_id for person in self._people]:
+            self._people = list(people)
+            if people:
+                self.dataChanged.emit(self.index(0), self.index(len(people) - 1))
             return
-        
-        # 解析时间戳和亲密度值
-        timestamps = []
-        values = []
-        for item in history[-15:]:  # 最多显示最近15条记录
-            try:
-                ts = item.get('timestamp', '')
-                if ts:
-                    # 支持多种时间格式
-                    for fmt in ['%Y-%m-%d %H:%M:%S', '%Y-%m-%d %H:%M', '%Y-%m-%dT%H:%M:%S', '%Y-%m-%d']:
-                        try:
-                            dt = datetime.strptime(ts, fmt)
-                            timestamps.append(dt)
-                            values.append(item.get('intimacy_score', 50))
-                            break
-                        except ValueError:
-                            continue
-            except Exception:
-                continue
-        
-        if len(timestamps) < 1:
-            self._setup_style()
-            self._draw_empty()
+        self.beginResetModel()
+        self._people = list(people)
+        self._row_by_id = {person_id: row for row, person_id in enumerate(ids)}
+        self.endResetModel()
+
+    def index_of(self, person_id: Optional[str]) -> QModelIndex:
+        row = self._row_by_id.get(person_id) if person_id else None
+        return self.index(row) if row is not None else QModelIndex()
+
+    def update_intimacy(self, person_id: str, intimacy: int) -> None:
+        index = self.index_of(person_id)
+        if not index.isValid():
             return
-        
-        # 计算相对时间（以第一个时间点为基准，单位：秒）
-        base_time = timestamps[0]
-        relative_seconds = [(t - base_time).total_seconds() for t in timestamps]
-        
-        # 根据最大时间跨度选择合适的单位
-        max_seconds = max(relative_seconds) if len(relative_seconds) > 1 else 0
-        divisor, unit_name = self._select_time_unit(max_seconds)
-        
-        # 转换为选定单位
-        relative_times = [s / divisor for s in relative_seconds]
-        max_relative = max(relative_times) if relative_times else 0
-        
-        # 设置样式（包含X轴单位标签）
-        self._setup_style(x_unit=unit_name)
-        
-        # 绘制折线图
-        line_color = '#4A90D9'
-        fill_color = '#4A90D9'
-        
-        # 绘制填充区域
-        self.ax.fill_between(relative_times, values, alpha=0.15, color=fill_color)
-        
-        # 绘制折线
-        self.ax.plot(relative_times, values, color=line_color, linewidth=2, 
-                     marker='o', markersize=5, markerfacecolor='white',
-                     markeredgecolor=line_color, markeredgewidth=2)
-        
-        # 确定需要标注的关键点：起始值、终止值、最高值、最低值
-        # 使用字典记录要标注的点，避免重复（相同位置只标注一次）
-        key_points = {}  # {index: [labels]}
-        
-        n = len(values)
-        start_idx = 0
-        end_idx = n - 1
-        max_val = max(values)
-        min_val = min(values)
-        max_idx = values.index(max_val)
-        min_idx = values.index(min_val)
-        
-        # 收集各关键点的标签
-        def add_label(idx: int, label: str):
-            if idx not in key_points:
-                key_points[idx] = []
-            key_points[idx].append(label)
-        
-        add_label(start_idx, "起始")
-        add_label(end_idx, "终止")
-        add_label(max_idx, "最高")
-        add_label(min_idx, "最低")
-        
-        # 绘制标注，合并相同位置的标签
-        for idx, labels in key_points.items():
-            t = relative_times[idx]
-            v = values[idx]
-            # 合并标签，去重（如果起始和最高是同一点）
-            unique_labels = list(dict.fromkeys(labels))  # 保持顺序去重
-            label_text = "/".join(unique_labels)
-            annotation = f'{label_text}: {v}%'
-            
-            # 调整标注位置，避免重叠
-            y_offset = 10
-            if v == max_val:
-                y_offset = 12  # 最高点往上
-            elif v == min_val:
-                y_offset = -15  # 最低点往下
-            
-            self.ax.annotate(annotation, (t, v), textcoords='offset points',
-                            xytext=(0, y_offset), ha='center', fontsize=8, color='#333333',
-                            fontweight='bold')
-        
-        # 设置 X 轴范围和刻度
-        if max_relative > 0:
-            # 添加5%边距
-            margin = max(max_relative * 0.05, 0.1)
-            self.ax.set_xlim(-margin, max_relative + margin)
-            
-            # 计算规范化刻度
-            nice_ticks = self._calculate_nice_ticks(max_relative)
-            self.ax.set_xticks(nice_ticks)
-            
-            # 格式化刻度标签（整数或一位小数）
-            tick_labels = []
-            for tick in nice_ticks:
-                if tick == int(tick):
-                    tick_labels.append(str(int(tick)))
-                else:
-                    tick_labels.append(f'{tick:.1f}')
-            self.ax.set_xticklabels(tick_labels)
-        else:
-            # 单个数据点
-            self.ax.set_xlim(-0.5, 0.5)
-            self.ax.set_xticks([0])
-            self.ax.set_xticklabels(['0'])
-        
-        # 动态调整 Y 轴范围
-        min_val = max(0, min(values) - 10)
-        max_val = min(100, max(values) + 10)
-        self.ax.set_ylim(min_val, max_val + 5)
-        
-        self.fig.tight_layout(pad=1.5)
-        self.draw()
+        self._people[index.row()].intimacy = intimacy
+        self.dataChanged.emit(index, index)
+
 
+class _ThemedWidget(QWidget):
+    """持有当前主题缓存的控件基类。
 
-class MessageGenerationWorker(QThread):
-    """后台线程：处理消息生成，避免阻塞主线程。"""
+    `_is_dark` 只在应用调色板变化时更新一次，悬停、动画等高频路径直接读取该属性；
+    主题切换后调用子类的 `_apply_theme()` 重新着色。
+    """
+
+    def __init__(self, parent: Optional[QWidget] = None):
+        super().__init__(parent)
+        self._is_dark = _ThemeCache.is_dark()
+
+    def changeEvent(self, event) -> None:
+        if event.type() == QEvent.ApplicationPaletteChange:
+            _ThemeCache.refresh()
+            is_dark = _ThemeCache.is_dark()
+            if is_dark != self._is_dark:
+                self._is_dark = is_dark
+                self._apply_theme()
+        super().changeEvent(event)
+
+    def _apply_theme(self) -> None:
+        """主题变化时的重新着色，由子类实现。"""
+
+
+# 记忆卡片配色：(暗色主题, 悬停) -> (背景, 边框)
+_MEMORY_CARD_COLORS = {
+    (True, False): (QColor("#3a3a3a"), QColor("#555")),
+    (True, True): (QColor("#444"), QColor("#666")),
+    (False, False): (QColor("#ffffff"), QColor("#e0e0e0")),
+    (False, True): (QColor("#f8f8f8"), QColor("#ccc")),
+}
+_MEMORY_SUBTITLE_COLOR = QColor("#888")
+_MEMORY_BUTTON_BG = QColor("#f5f5f5")
+_MEMORY_BUTTON_BORDER = QColor("#ccc")
+
+def _card_button_pixmap(glyph: str, size: int, dpr: float) -> QPixmap:
+    """记忆卡片上的编辑/删除按钮图：按 (图标, 尺寸, 缩放) 只渲染一次，所有卡片共享。"""
+    key = f"mcbtn:{glyph}:{size}:{dpr}"
+    cached = QPixmap()
+    if QPixmapCache.find(key, cached):
+        return cached
+    pixmap = QPixmap(round(size * dpr), round(size * dpr))
+    pixmap.setDevicePixelRatio(dpr)
+    pixmap.fill(Qt.transparent)
+    painter = QPainter(pixmap)
+    painter.setRenderHint(QPainter.Antialiasing)
+    rect = QRect(0, 0, size, size)
+    painter.setPen(_MEMORY_BUTTON_BORDER)
+    painter.setBrush(_MEMORY_BUTTON_BG)
+    painter.drawRoundedRect(rect.adjusted(0, 0, -1, -1), 4, 4)
+    painter.drawText(rect, Qt.AlignCenter, glyph)
+    painter.end()
+    QPixmapCache.insert(key, pixmap)
+    return pixmap
+
+
+# 存放记忆行元组 (memory_id, memory_type, title, subtitle, badge_text, badge_color) 的数据角色
+MEMORY_ROLE = Qt.UserRole + 2
+
+# 记忆页 Tab 下标到记忆类型的映射
+_MEMORY_TYPES = ("profile", "experience", "strategy")
+
+
+class MemoryListModel(QAbstractListModel):
+    """记忆列表模型：每行是一个 (memory_id, memory_type, title, subtitle, badge_text, badge_color) 元组。"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows: List[tuple] = []
+        self._row_by_id: Dict[str, int] = {}
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = self._rows[index.row()]
+        if role == MEMORY_ROLE:
+            return row
+        if role == Qt.UserRole:
+            return row[0]
+        if role in (Qt.DisplayRole, Qt.ToolTipRole):
+            return row[2]
+        return None
+
+    def set_rows(self, rows: List[tuple]) -> None:
+        self.beginResetModel()
+        self._rows = list(rows)
+        self._row_by_id = {row[0]: position for position, row in enumerate(self._rows)}
+        self.endResetModel()
+
+    def add_row(self, row: tuple) -> None:
+        position = len(self._rows)
+        self.beginInsertRows(QModelIndex(), position, position)
+        self._rows.append(row)
+        self._row_by_id[row[0]] = position
+        self.endInsertRows()
+
+    def remove_row_by_id(self, memory_id: str) -> None:
+        position = self._row_by_id.get(memory_id)
+        if position is None:
+            return
+        self.beginRemoveRows(QModelIndex(), position, position)
+        del self._rows[position]
+        del self._row_by_id[memory_id]
+        # 被删除行之后的行号整体前移一位
+        for later in range(position, len(self._rows)):
+            self._row_by_id[self._rows[later][0]] = later
+        self.endRemoveRows()
+
+    def update_row_by_id(self, memory_id: str, row: tuple) -> None:
+        position = self._row_by_id.get(memory_id)
+        if position is None:
+            return
+        self._rows[position] = row
+        index = self.index(position)
+        self.dataChanged.emit(index, index)
+
+
+class MemoryCardDelegate(QStyledItemDelegate):
+    """记忆卡片绘制代理 - 显示单条记忆，支持编辑和删除。
+
+    徽章、标题、副标题和右侧的编辑/删除按钮都直接用 QPainter 绘制，
+    视图只为可见行调用 paint()；按钮点击在 editorEvent 中按区域判断。
+    """
+
+    action_triggered = Signal(str, str, str)  # memory_id, memory_type, "edit" | "delete"
+
+    ROW_HEIGHT = 78
+    CARD_MARGIN = 4
+    PADDING_X = 12
+    PADDING_Y = 10
+    SPACING = 12
+    BADGE_WIDTH = 60
+    BADGE_HEIGHT = 26
+    BUTTON_SIZE = 28
+    BUTTON_SPACING = 4
+
+    def _card_rect(self, option) -> QRect:
+        m = self.CARD_MARGIN
+        return option.rect.adjusted(m, m // 2, -m, -m // 2)
+
+    def _button_rects(self, card: QRect) -> Tuple[QRect, QRect]:
+        size = self.BUTTON_SIZE
+        x = card.right() - self.PADDING_X - size + 1
+        top = card.y() + (card.height() - size * 2 - self.BUTTON_SPACING) // 2
+        return QRect(x, top, size, size), QRect(x, top + size + self.BUTTON_SPACING, size, size)
+
+    def paint(self, painter: QPainter, option, index) -> None:
+        row = index.data(MEMORY_ROLE)
+        if row is None:
+            return super().paint(painter, option, index)
+        _, _, title, subtitle, badge_text, badge_color = row
+
+        hovered = bool(option.state & QStyle.State_MouseOver)
+        bg, border = _MEMORY_CARD_COLORS[(_ThemeCache.is_dark(), hovered)]
+        card = self._card_rect(option)
+
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(border)
+        painter.setBrush(bg)
+        painter.drawRoundedRect(card, 8, 8)
+
+        # 左侧徽章
+        badge = QRect(
+            card.x() + self.PADDING_X,
+            card.y() + (card.height() - self.BADGE_HEIGHT) // 2,
+            self.BADGE_WIDTH,
+            self.BADGE_HEIGHT,
+        )
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(badge_color)
+        painter.drawRoundedRect(badge, 4, 4)
+        font = QFont(option.font)
+        font.setPixelSize(12)
+        font.setWeight(QFont.Bold)
+        painter.setFont(font)
+        painter.setPen(Qt.white)
+        painter.drawText(badge, Qt.AlignCenter, badge_text)
+
+        # 右侧按钮：共享的预渲染按钮图
+        edit_rect, delete_rect = self._button_rects(card)
+        dpr = painter.device().devicePixelRatioF()
+        for rect, glyph in ((edit_rect, "✏️"), (delete_rect, "🗑️")):
+            painter.drawPixmap(rect.topLeft(), _card_button_pixmap(glyph, self.BUTTON_SIZE, dpr))
+
+        # 中间内容区：标题 / 副标题
+        text_x = badge.right() + 1 + self.SPACING
+        text_w = max(0, edit_rect.x() - self.SPACING - text_x)
+        font.setPixelSize(14)
+        font.setWeight(QFont.Medium)
+        title_h = QFontMetrics(font).lineSpacing()
+        sub_font = QFont(option.font)
+        sub_font.setPixelSize(12)
+        sub_h = QFontMetrics(sub_font).lineSpacing()
+        top = card.y() + (card.height() - title_h - 4 - sub_h) // 2
+
+        painter.setFont(font)
+        painter.setPen(option.palette.color(QPalette.Text))
+        painter.drawText(
+            QRect(text_x, top, text_w, title_h),
+            Qt.AlignLeft | Qt.AlignVCenter,
+            painter.fontMetrics().elidedText(title, Qt.ElideRight, text_w),
+        )
+        painter.setFont(sub_font)
+        painter.setPen(_MEMORY_SUBTITLE_COLOR)
+        painter.drawText(
+            QRect(text_x, top + title_h + 4, text_w, sub_h),
+            Qt.AlignLeft | Qt.AlignVCenter,
+            painter.fontMetrics().elidedText(subtitle, Qt.ElideRight, text_w),
+        )
+
+        painter.restore()
+
+    def sizeHint(self, option, index) -> QSize:
+        return QSize(320, self.ROW_HEIGHT)
+
+    def editorEvent(self, event, model, option, index) -> bool:
+        if event.type() == QEvent.MouseButtonRelease and event.button() == Qt.LeftButton:
+            row = index.data(MEMORY_ROLE)
+            if row is not None:
+                pos = event.position().toPoint()
+                edit_rect, delete_rect = self._button_rects(self._card_rect(option))
+                if edit_rect.contains(pos):
+                    self.action_triggered.emit(row[0], row[1], "edit")
+                    return True
+                if delete_rect.contains(pos):
+                    self.action_triggered.emit(row[0], row[1], "delete")
+                    return True
+        return super().editorEvent(event, model, option, index)
+
+
+# 徽章颜色分档：bisect_right(阈值, 百分比) 即颜色下标（百分比均为整数）；
+# 颜色在模块加载时构造为 QColor，绘制时不再解析十六进制字符串
+_PROFILE_BADGE_THRESHOLDS = (40, 70)  # 置信度 <40 / 40~69 / >=70
+_PROFILE_BADGE_COLORS = tuple(map(QColor, ("#9e9e9e", "#ff9800", "#4caf50")))  # 灰 / 橙 / 绿
+_IMPACT_BADGE_THRESHOLDS = (-29, 30)  # 影响 <=-30 / -29~29 / >=30
+_IMPACT_BADGE_COLORS = tuple(map(QColor, ("#f44336", "#2196f3", "#4caf50")))  # 负面红 / 中性蓝 / 正面绿
+_STRATEGY_BADGE_THRESHOLDS = (31, 60)  # 有效性 <=30 / 31~59 / >=60
+_STRATEGY_BADGE_COLORS = tuple(map(QColor, ("#f44336", "#ff9800", "#4caf50")))  # 无效红 / 一般橙 / 有效绿
+# 记忆来源显示文本，未知来源按模型提取显示
+_SOURCE_TEXT = {"manual": "手动录入", "model": "模型提取"}
+
+
+def _memory_row(memory_type: str, memory) -> tuple:
+    """把一条记忆转换为列表行 (memory_id, memory_type, title, subtitle, badge_text, badge_color: QColor)。"""
+    if memory_type == "profile":
+        # 对象特征 (ProfileMemory)
+        confidence_pct = int(memory.confidence * 100)
+        badge_color = _PROFILE_BADGE_COLORS[bisect_right(_PROFILE_BADGE_THRESHOLDS, confidence_pct)]
+        return (
+            memory.memory_id,
+            memory_type,
+            memory.content,
+            f"来源: {_SOURCE_TEXT.get(memory.source, '模型提取')} · 创建于: {memory.created_at[:10] or '未知'}",
+            f"{confidence_pct}%",
+            badge_color,
+        )
+    if memory_type == "experience":
+        # 关系事件 (ExperienceMemory)
+        impact_val = int(memory.impact * 100)
+        subtitle = f"时间: {memory.event_time or '未知时间'} · 来源: {_SOURCE_TEXT.get(memory.source, '模型提取')}"
+        if memory.note:
+            subtitle = f"{subtitle} · {memory.note}"
+        badge_color = _IMPACT_BADGE_COLORS[bisect_right(_IMPACT_BADGE_THRESHOLDS, impact_val)]
+        return (
+            memory.memory_id,
+            memory_type,
+            memory.event,
+            subtitle,
+            f"{impact_val:+d}%",
+            badge_color,
+        )
+    # 沟通策略 (StrategyMemory)
+    eff_pct = int(memory.effectiveness * 100)
+    badge_color = _STRATEGY_BADGE_COLORS[bisect_right(_STRATEGY_BADGE_THRESHOLDS, eff_pct)]
+    return (
+        memory.memory_id,
+        memory_type,
+        memory.pattern,
+        f"有效性: {eff_pct}% · 验证 {memory.evidence_count} 次",
+        f"{eff_pct}%",
+        badge_color,
+    )
+
+
+class IntimacyTrendChart(QWidget):
+    """亲密度趋势图的轻量外壳。
+
+    matplotlib 和 numpy 导入较重，首次显示时才导入 .trend_chart 并创建真正的画布；
+    在此之前收到的数据会被记住，画布创建后立即绘制。
+    """
+
+    def __init__(self, parent: Optional[QWidget] = None):
+        super().__init__(parent)
+        self.setMinimumHeight(160)
+        self.setMaximumHeight(200)
+        self._layout = QVBoxLayout(self)
+        self._layout.setContentsMargins(0, 0, 0, 0)
+        self._canvas = None
+        self._history: List[dict] = []
+        # 短时间内的连续更新合并为一次绘制，只用最后一份历史
+        self._debounce_timer = QTimer(self)
+        self._debounce_timer.setSingleShot(True)
+        self._debounce_timer.setInterval(80)
+        self._debounce_timer.timeout.connect(self._render)
+
+    def update_data(self, history: List[dict]) -> None:
+        self._history = history
+        if self._canvas is not None:
+            self._debounce_timer.start()
+
+    def _render(self) -> None:
+        if self._canvas is not None:
+            self._canvas.update_data(self._history)
+
+    def showEvent(self, event) -> None:
+        if self._canvas is None:
+            from .trend_chart import IntimacyTrendCanvas
+            self._canvas = IntimacyTrendCanvas(self)
+            self._layout.addWidget(self._canvas)
+            if self._history:
+                self._canvas.update_data(self._history)
+        super().showEvent(event)
+
+
+class SaverWorker(QThread):
+    """串行保存线程：data 目录的唯一写入者，合并短时间内的多次保存请求。
+
+    system.save() 只写核心字段，会覆盖 profiles.json 中界面维护的字段，
+    因此线程保留最近一次的仓库快照，每次系统写盘后紧接着重新写入该快照。
+    两类写盘都在本线程内顺序执行，不会与 UI 线程同时读写同一文件。
+    """
+    
+    DEBOUNCE_SECONDS = 0.2
+    _instance: Optional["SaverWorker"] = None
+    _shut_down = False
+    
+    def __init__(self):
+        super().__init__()
+        self._queue: "queue.Queue" = queue.Queue()
+        self._store_snapshot: Optional[dict] = None
+    
+    @classmethod
+    def instance(cls) -> Optional["SaverWorker"]:
+        """返回共享的保存线程；程序退出（shutdown 之后）返回 None，不再新建线程。"""
+        if cls._instance is None and not cls._shut_down:
+            cls._instance = SaverWorker()
+            cls._instance.start()
+        return cls._instance
     
-    finished = Signal(dict)  # 成功时发送结果
-    error = Signal(str)      # 失败时发送错误信息
+    @classmethod
+    def shutdown(cls) -> None:
+        """写完尚未落盘的请求后结束线程（退出程序前调用）。"""
+        cls._shut_down = True
+        if cls._instance is None:
+            return
+        cls._instance._queue.put(None)
+        cls._instance.wait()
+        cls._instance = None
+    
+    def request_save(self, system) -> None:
+        self._queue.put(("system", system))
+    
+    def request_store_sync(self, snapshot: dict, write: bool = True) -> None:
+        """提交 AppStore.snapshot_for_sync 的快照；write=False 时只记下快照供系统写盘后恢复使用。"""
+        self._queue.put(("store" if write else "store_seed", snapshot))
+    
+    def run(self):
+        stopping = False
+        while not stopping:
+            job = self._queue.get()
+            if job is None:
+                return
+            system = None
+            store_snapshot = None
+            # 防抖：窗口期内的后续请求每类只保留最新的一个
+            while True:
+                kind, payload = job
+                if kind == "system":
+                    system = payload
+                elif kind == "store":
+                    store_snapshot = payload
+                else:
+                    self._store_snapshot = dict(payload, memories=None)
+                try:
+                    job = self._queue.get(timeout=self.DEBOUNCE_SECONDS)
+                except queue.Empty:
+                    break
+                if job is None:
+                    stopping = True
+                    break
+            if system is not None:
+                try:
+                    system.save()
+                except Exception as err:
+                    logging.getLogger(__name__).error("Failed to save system data: %s", err)
+            if store_snapshot is None and system is not None:
+                store_snapshot = self._store_snapshot
+            if store_snapshot is not None:
+                try:
+                    AppStore.write_sync_snapshot(store_snapshot)
+                except Exception as err:
+                    logging.getLogger(__name__).error("Failed to sync store data: %s", err)
+                # 记忆只需写一次，保留下来的快照只用于恢复界面维护的字段
+                self._store_snapshot = dict(store_snapshot, memories=None)
+
+
+class _MessageGenerationSignals(QObject):
+    """QRunnable 不是 QObject，结果连同对象ID通过该对象的信号排队回到 UI 线程。"""
+
+    finished = Signal(str, dict)  # (person_id, 结果)
+    error = Signal(str, str)      # (person_id, 错误信息)
+
+
+class MessageGenerationWorker(QRunnable):
+    """在共享线程池中处理消息生成，避免阻塞主线程，也避免每次发送都新建线程。"""
     
     def __init__(self, system, person_id: str, person_name: str, 
                  composed_message: str, contact_type):
         super().__init__()
+        self.signals = _MessageGenerationSignals()
         self._system = system
         self._person_id = person_id
         self._person_name = person_name
@@ -664,14 +854,158 @@ class MessageGenerationWorker(QThread):
                 message_content=self._composed_message,
                 contact_type=self._contact_type,
             )
-            self._system.save()
-            self.finished.emit(result)
         except Exception as err:
-            self.error.emit(str(err))
+            self.signals.error.emit(self._person_id, str(err))
+            return
+        # 先把结果交给界面，再异步落盘
+        self.signals.finished.emit(self._person_id, result)
+        saver = SaverWorker.instance()
+        if saver is not None:
+            saver.request_save(self._system)
+
+
+class _ComparisonSignals(QObject):
+    """ComparisonWorker 的结果信号。"""
+
+    finished = Signal(object)  # dict: 比对上下文与结果
+    error = Signal(str)
+
 
+class ComparisonWorker(QRunnable):
+    """在共享线程池中执行 AI 提取后的语义比对，避免网络请求阻塞界面。
 
-class TypingIndicatorWidget(QWidget):
-    """等待输入指示器：三个渐变的点动画，颜色从左到右丝滑循环变化。"""
+    对象特征/关系事件/沟通策略的比对只依赖提取前的现有记忆快照，
+    因此可以一次性全部算完，再回到 UI 线程逐项确认。
+    """
+
+    def __init__(self, extractor, person_id: str, selected: dict,
+                 existing_profiles: list, existing_experiences: list, existing_strategies: list):
+        super().__init__()
+        self.signals = _ComparisonSignals()
+        self._extractor = extractor
+        self._person_id = person_id
+        self._selected = selected
+        self._existing_profiles = existing_profiles
+        self._existing_experiences = existing_experiences
+        self._existing_strategies = existing_strategies
+
+    def run(self):
+        try:
+            extractor = self._extractor
+            profiles = self._selected.get("profiles", [])
+            experiences = self._selected.get("experiences", [])
+            strategies = self._selected.get("strategies", [])
+            existing_patterns = [s.pattern for s in self._existing_strategies]
+            payload = {
+                "person_id": self._person_id,
+                "selected": self._selected,
+                "existing_profiles": self._existing_profiles,
+                "existing_experiences": self._existing_experiences,
+                "existing_strategies": self._existing_strategies,
+                "profile_comparisons": extractor.compare_semantic_similarity(
+                    [item.content for item in profiles],
+                    [p.content for p in self._existing_profiles],
+                    "profile",
+                ),
+                "experience_comparisons": extractor.compare_semantic_similarity(
+                    [item.event for item in experiences],
+                    [e.event for e in self._existing_experiences],
+                    "experience",
+                ),
+                "strategy_matches": [
+                    extractor.compare_strategy_patterns(item.pattern, existing_patterns)
+                    if existing_patterns else None
+                    for item in strategies
+                ],
+            }
+        except Exception as err:
+            self.signals.error.emit(str(err))
+            return
+        self.signals.finished.emit(payload)
+
+
+class _DataFileSignals(QObject):
+    """导入/导出任务的结果信号。"""
+
+    finished = Signal(object)  # 导入: (people, memories)；导出: None
+    error = Signal(str)
+
+
+class ImportDataWorker(QRunnable):
+    """在共享线程池中读取并解析导入文件，解析结果回到 UI 线程再写入仓库。"""
+
+    def __init__(self, file_path: str):
+        super().__init__()
+        self.signals = _DataFileSignals()
+        self._file_path = file_path
+
+    def run(self):
+        try:
+            records = _read_import_records(self._file_path)
+        except Exception as err:
+            self.signals.error.emit(str(err))
+            return
+        self.signals.finished.emit(records)
+
+
+class ExportDataWorker(QRunnable):
+    """在共享线程池中序列化并写出导出文件。"""
+
+    def __init__(self, file_path: str, data: dict):
+        super().__init__()
+        self.signals = _DataFileSignals()
+        self._file_path = file_path
+        self._data = data
+
+    def run(self):
+        try:
+            _dump_json_file(self._file_path, self._data)
+        except Exception as err:
+            self.signals.error.emit(str(err))
+            return
+        self.signals.finished.emit(None)
+
+
+_TYPING_ANIMATION_STEPS = 30
+# 切换对象时只渲染最近的若干条消息，滚动到顶部时再分批补齐更早的记录
+_CHAT_RENDER_PAGE = 50
+
+
+def _build_typing_dot_styles(is_dark: bool) -> List[tuple]:
+    """预先计算等待动画每一帧三个点的样式表。"""
+    frames = []
+    for step in range(_TYPING_ANIMATION_STEPS):
+        styles = []
+        for i in range(3):
+            # 使用正弦波实现丝滑的亮度变化，每个点的相位偏移 120 度（2π/3）
+            phase = (step / _TYPING_ANIMATION_STEPS) * 2 * math.pi - i * (2 * math.pi / 3)
+            # 正弦值映射到 0.3 ~ 1.0 的透明度范围
+            opacity = 0.3 + 0.7 * (math.sin(phase) + 1) / 2
+            if is_dark:
+                # 深色主题：灰色到白色
+                gray_value = int(100 + 155 * opacity)  # 100-255
+            else:
+                # 浅色主题：浅灰到深灰
+                gray_value = int(180 - 130 * opacity)  # 180-50
+            styles.append(f"color: rgb({gray_value}, {gray_value}, {gray_value}); font-size: 14px;")
+        frames.append(tuple(styles))
+    return frames
+
+
+_TYPING_DOT_STYLES = {
+    True: _build_typing_dot_styles(True),
+    False: _build_typing_dot_styles(False),
+}
+
+
+class TypingIndicatorWidget(_ThemedWidget):
+    """等待输入指示器：三个渐变的点动画，颜色从左到右丝滑循环变化。
+    
+    所有实例共用一个类级定时器，无论同时存在多少指示器，每 50ms 只唤醒一次。
+    """
+    
+    _shared_timer: Optional[QTimer] = None
+    _active: "weakref.WeakSet[TypingIndicatorWidget]" = weakref.WeakSet()
 
     def __init__(self, parent: Optional[QWidget] = None):
         super().__init__(parent)
@@ -707,13 +1041,14 @@ class TypingIndicatorWidget(QWidget):
         main_layout.addLayout(content_layout)
         main_layout.addStretch()
         
-        # 动画定时器 - 更快的更新频率实现丝滑效果
-        self._animation_timer = QTimer(self)
-        self._animation_timer.timeout.connect(self._animate_dots)
-        self._animation_timer.start(50)  # 每50ms更新一次，实现丝滑效果
+        # 注册到共享动画定时器
+        self._start_animation()
+    
+    def _apply_theme(self) -> None:
+        self._update_bubble_style()
     
     def _update_bubble_style(self) -> None:
-        is_dark = self._is_dark_theme()
+        is_dark = self._is_dark
         if is_dark:
             bg_color = "#303030"
         else:
@@ -724,50 +1059,66 @@ class TypingIndicatorWidget(QWidget):
     
     def _animate_dots(self) -> None:
         """动画：三个点的颜色从左到右丝滑循环变化。"""
-        is_dark = self._is_dark_theme()
-        
-        # 使用正弦波实现丝滑的亮度变化
-        # 每个点的相位偏移 120 度（2π/3）
-        import math
-        
-        for i, dot in enumerate(self._dots):
-            # 计算该点的相位（每个点相差 2π/3）
-            phase = (self._animation_step / 30.0) * 2 * math.pi - i * (2 * math.pi / 3)
-            # 正弦值映射到 0.3 ~ 1.0 的透明度范围
-            opacity = 0.3 + 0.7 * (math.sin(phase) + 1) / 2
-            
-            if is_dark:
-                # 深色主题：灰色到白色
-                gray_value = int(100 + 155 * opacity)  # 100-255
-                color = f"rgb({gray_value}, {gray_value}, {gray_value})"
-            else:
-                # 浅色主题：浅灰到深灰
-                gray_value = int(180 - 130 * opacity)  # 180-50
-                color = f"rgb({gray_value}, {gray_value}, {gray_value})"
-            
-            dot.setStyleSheet(f"color: {color}; font-size: 14px;")
+        styles = _TYPING_DOT_STYLES[self._is_dark][self._animation_step]
+        for dot, style in zip(self._dots, styles):
+            dot.setStyleSheet(style)
         
         # 更新动画步骤
-        self._animation_step = (self._animation_step + 1) % 30
+        self._animation_step = (self._animation_step + 1) % _TYPING_ANIMATION_STEPS
     
-    def _is_dark_theme(self) -> bool:
-        app = QApplication.instance()
-        palette = app.palette() if app else self.palette()
-        window_color = palette.color(QPalette.Window)
-        return window_color.lightness() < 128
+    def _start_animation(self) -> None:
+        cls = TypingIndicatorWidget
+        cls._active.add(self)
+        if cls._shared_timer is None:
+            cls._shared_timer = QTimer()
+            cls._shared_timer.setInterval(50)  # 每50ms更新一次，实现丝滑效果
+            cls._shared_timer.timeout.connect(cls._tick_all)
+        if not cls._shared_timer.isActive():
+            cls._shared_timer.start()
+    
+    @classmethod
+    def _tick_all(cls) -> None:
+        """共享定时器回调：推进所有可见指示器的动画。"""
+        for widget in list(cls._active):
+            try:
+                widget._animate_dots()
+            except RuntimeError:
+                # 底层 C++ 对象已被删除（例如会话列表被清空）
+                cls._active.discard(widget)
+        if not cls._active:
+            cls._shared_timer.stop()
     
     def stop_animation(self) -> None:
         """停止动画。"""
-        self._animation_timer.stop()
+        cls = TypingIndicatorWidget
+        cls._active.discard(self)
+        if not cls._active and cls._shared_timer is not None:
+            cls._shared_timer.stop()
+
 
+def _bubble_style(bubble_bg: str, text_color: str) -> str:
+    return f"padding:8px 12px;border-radius:8px;background:{bubble_bg};color:{text_color};"
 
-class ChatMessageWidget(QWidget):
+
+# 消息气泡样式表：(暗色主题, 角色) -> 样式表
+_BUBBLE_STYLES = {
+    (True, "user"): _bubble_style("#303030", "#f2f2f2"),
+    (True, "assistant"): _bubble_style("#303030", "#f2f2f2"),
+    (False, "user"): _bubble_style("#e9f5ff", "#222"),
+    (False, "assistant"): _bubble_style("#f6f6f6", "#222"),
+}
+
+
+class ChatMessageWidget(_ThemedWidget):
     """会话消息气泡。"""
     
     # 定义反馈信号：参数为 (message_id, feedback_type)
     # feedback_type: "like" | "dislike" | None
     feedback_changed = Signal(str, str)
 
+    # 所有气泡共用的字体度量，按 QFont.key() 缓存
+    _fm_cache: Dict[str, QFontMetrics] = {}
+
     def __init__(self, role: str, text: str, message_id: str = "", parent: Optional[QWidget] = None):
         super().__init__(parent)
         self.role = role
@@ -775,6 +1126,9 @@ class ChatMessageWidget(QWidget):
         self.message_id = message_id
         self._bubble_padding = 28  # 左右 padding 12px * 2 + 额外边距
         self._feedback_state: Optional[str] = None  # "like" | "dislike" | None
+        self._last_visibility_key: Optional[str] = None  # 按钮当前对应的反馈状态
+        self._raw_width_cache: Optional[int] = None  # 文本单行宽度，字体变化时失效
+        self._last_set_width: Optional[tuple] = None  # 上次应用的 (最大宽度, 宽度, 换行)
 
         self.bubble = QLabel(text)
         self.bubble.setWordWrap(True)
@@ -784,47 +1138,21 @@ class ChatMessageWidget(QWidget):
         self.btn_copy = None
         self.btn_like = None
         self.btn_dislike = None
-        
-        if role == "assistant":
-            # 复制按钮
-            self.btn_copy = QToolButton()
-            self.btn_copy.setText("📋")
-            self.btn_copy.setToolTip("复制")
-            self.btn_copy.setCursor(Qt.PointingHandCursor)
-            apply_icon_button_style(self.btn_copy, 28)
-            self.btn_copy.clicked.connect(self._copy_text)
-            
-            # 喜欢按钮
-            self.btn_like = QToolButton()
-            self.btn_like.setText("👍")
-            self.btn_like.setToolTip("喜欢这个回复")
-            self.btn_like.setCursor(Qt.PointingHandCursor)
-            self.btn_like.setCheckable(True)
-            apply_icon_button_style(self.btn_like, 28)
-            self.btn_like.clicked.connect(self._on_like_clicked)
-            
-            # 不喜欢按钮
-            self.btn_dislike = QToolButton()
-            self.btn_dislike.setText("👎")
-            self.btn_dislike.setToolTip("不喜欢这个回复")
-            self.btn_dislike.setCursor(Qt.PointingHandCursor)
-            self.btn_dislike.setCheckable(True)
-            apply_icon_button_style(self.btn_dislike, 28)
-            self.btn_dislike.clicked.connect(self._on_dislike_clicked)
+        self._btn_row: Optional[QHBoxLayout] = None
+        self._btn_row_built = False
 
         content_layout = QVBoxLayout()
         content_layout.setContentsMargins(0, 0, 0, 0)
         content_layout.setSpacing(0)
         content_layout.addWidget(self.bubble)
-        if self.btn_copy:
-            btn_row = QHBoxLayout()
-            btn_row.setContentsMargins(0, 2, 0, 0)
-            btn_row.setSpacing(0)  # 无外边距
-            btn_row.addWidget(self.btn_copy, 0, Qt.AlignLeft)
-            btn_row.addWidget(self.btn_like, 0, Qt.AlignLeft)
-            btn_row.addWidget(self.btn_dislike, 0, Qt.AlignLeft)
-            btn_row.addStretch()
-            content_layout.addLayout(btn_row)
+        if role == "assistant":
+            # 按钮行延迟到首次悬停时创建，这里只放一个占位弹簧（同时预留按钮高度）
+            self._btn_row = QHBoxLayout()
+            self._btn_row.setContentsMargins(0, 2, 0, 0)
+            self._btn_row.setSpacing(0)  # 无外边距
+            self._btn_row.addSpacerItem(QSpacerItem(0, 28, QSizePolicy.Expanding, QSizePolicy.Fixed))
+            content_layout.addLayout(self._btn_row)
+            self.bubble.installEventFilter(self)
 
         content_widget = QWidget()
         content_widget.setLayout(content_layout)
@@ -841,9 +1169,62 @@ class ChatMessageWidget(QWidget):
 
         self._update_style()
     
+    def eventFilter(self, obj, event) -> bool:
+        if obj is self.bubble and event.type() == QEvent.Enter and not self._btn_row_built:
+            self._build_button_row()
+        return super().eventFilter(obj, event)
+
+    def _build_button_row(self) -> None:
+        """创建复制/喜欢/不喜欢按钮并插入到占位按钮行中。"""
+        if self._btn_row_built or self._btn_row is None:
+            return
+        self._btn_row_built = True
+        self.bubble.removeEventFilter(self)
+
+        # 复制按钮
+        self.btn_copy = QToolButton()
+        self.btn_copy.setText("📋")
+        self.btn_copy.setToolTip("复制")
+        self.btn_copy.setCursor(Qt.PointingHandCursor)
+        apply_icon_button_style(self.btn_copy, 28)
+        self.btn_copy.clicked.connect(self._copy_text)
+        
+        # 喜欢按钮
+        self.btn_like = QToolButton()
+        self.btn_like.setText("👍")
+        self.btn_like.setToolTip("喜欢这个回复")
+        self.btn_like.setCursor(Qt.PointingHandCursor)
+        self.btn_like.setCheckable(True)
+        apply_icon_button_style(self.btn_like, 28)
+        self.btn_like.clicked.connect(self._on_like_clicked)
+        
+        # 不喜欢按钮
+        self.btn_dislike = QToolButton()
+        self.btn_dislike.setText("👎")
+        self.btn_dislike.setToolTip("不喜欢这个回复")
+        self.btn_dislike.setCursor(Qt.PointingHandCursor)
+        self.btn_dislike.setCheckable(True)
+        apply_icon_button_style(self.btn_dislike, 28)
+        self.btn_dislike.clicked.connect(self._on_dislike_clicked)
+
+        self._btn_row.insertWidget(0, self.btn_copy, 0, Qt.AlignLeft)
+        self._btn_row.insertWidget(1, self.btn_like, 0, Qt.AlignLeft)
+        self._btn_row.insertWidget(2, self.btn_dislike, 0, Qt.AlignLeft)
+
+        # 应用已有的反馈状态
+        self.btn_like.setChecked(self._feedback_state == "like")
+        self.btn_dislike.setChecked(self._feedback_state == "dislike")
+        self._update_feedback_buttons_visibility()
+    
     def set_feedback_state(self, state: Optional[str]) -> None:
         """设置反馈状态（用于恢复历史状态）。"""
+        if state == self._feedback_state:
+            return
         self._feedback_state = state
+        if state and not self._btn_row_built:
+            # 已有反馈的消息需要立即显示按钮
+            self._build_button_row()
+            return
         if self.btn_like and self.btn_dislike:
             self.btn_like.setChecked(state == "like")
             self.btn_dislike.setChecked(state == "dislike")
@@ -854,6 +1235,11 @@ class ChatMessageWidget(QWidget):
         if not self.btn_like or not self.btn_dislike:
             return
         
+        # 状态未变化时不重复设置样式表
+        if self._feedback_state == self._last_visibility_key:
+            return
+        self._last_visibility_key = self._feedback_state
+        
         if self._feedback_state == "like":
             # 选择了喜欢：隐藏不喜欢按钮
             self.btn_like.setVisible(True)
@@ -902,46 +1288,247 @@ class ChatMessageWidget(QWidget):
     def set_max_width(self, max_width: int) -> None:
         if max_width <= 0:
             return
+        # 文本与字体不变时，相同的最大宽度必然得到相同的结果
+        if self._last_set_width is not None and self._last_set_width[0] == max_width:
+            return
         raw_width = self._measure_text_width_raw()
         if raw_width <= max_width:
-            self.bubble.setWordWrap(False)
+            word_wrap = False
             desired_width = max(1, raw_width)
         else:
-            self.bubble.setWordWrap(True)
+            word_wrap = True
             desired_width = max_width
+        self._last_set_width = (max_width, desired_width, word_wrap)
+        self.bubble.setWordWrap(word_wrap)
         self.bubble.setMaximumWidth(max_width)
         self.bubble.setFixedWidth(desired_width)
         self.bubble.updateGeometry()
 
+    def changeEvent(self, event) -> None:
+        if event.type() in (QEvent.FontChange, QEvent.ApplicationFontChange):
+            if event.type() == QEvent.ApplicationFontChange:
+                ChatMessageWidget._fm_cache.clear()
+            self._raw_width_cache = None
+            self._last_set_width = None
+        super().changeEvent(event)
+
     def _copy_text(self) -> None:
-        QApplication.clipboard().setText(self.text)
+        _get_clipboard().setText(self.text)
+
+    def _apply_theme(self) -> None:
+        self._update_style()
 
     def _update_style(self) -> None:
-        is_dark = self._is_dark_theme()
-        if is_dark:
-            bubble_bg = "#303030"
-            text_color = "#f2f2f2"
-        else:
-            bubble_bg = "#e9f5ff" if self.role == "user" else "#f6f6f6"
-            text_color = "#222"
-        self.bubble.setStyleSheet(
-            "padding:8px 12px;border-radius:8px;"
-            + f"background:{bubble_bg};color:{text_color};"
-        )
+        role = "user" if self.role == "user" else "assistant"
+        self.bubble.setStyleSheet(_BUBBLE_STYLES[self._is_dark, role])
 
     def _measure_text_width_raw(self) -> int:
-        lines = self.text.splitlines() or [self.text]
-        fm = self.bubble.fontMetrics()
-        longest = 0
-        for line in lines:
-            longest = max(longest, fm.horizontalAdvance(line))
-        return longest + self._bubble_padding
-
-    def _is_dark_theme(self) -> bool:
-        app = QApplication.instance()
-        palette = app.palette() if app else self.palette()
-        window_color = palette.color(QPalette.Window)
-        return window_color.lightness() < 128
+        if self._raw_width_cache is not None:
+            return self._raw_width_cache
+        font = self.bubble.font()
+        key = font.key()
+        fm = self._fm_cache.get(key)
+        if fm is None:
+            fm = self._fm_cache.setdefault(key, QFontMetrics(font))
+        if "\n" not in self.text:
+            # 常见的单行消息：直接测量，不拆分文本
+            longest = fm.horizontalAdvance(self.text)
+        else:
+            # 多行文本：一次排版得到最宽行的宽度，避免逐行调用
+            longest = fm.boundingRect(
+                QRect(0, 0, 10 ** 7, 10 ** 7), Qt.TextExpandTabs, self.text
+            ).width()
+        self._raw_width_cache = longest + self._bubble_padding
+        return self._raw_width_cache
+
+
+# ==================== 对话风格分析关键词 ====================
+
+# 高正式度词汇
+_FORMAL_WORDS = (
+    "您", "请", "敬请", "烦请", "尊敬的", "贵", "希望", "建议", "感谢",
+    "打扰", "冒昧", "恳请", "望", "如有", "若", "此", "鉴于", "关于",
+    "抱歉", "对不起", "麻烦", "辛苦", "多谢", "致谢", "特此", "敬上"
+)
+
+# 低正式度词汇（口语化/网络用语，按小写匹配）
+_INFORMAL_WORDS = (
+    "哈哈", "嗯嗯", "啊", "呀", "嘛", "呢", "吧", "哦", "噢", "emmm",
+    "hhh", "666", "awsl", "牛", "绝了", "真的吗", "咋", "啥", "整",
+    "搞", "弄", "咱", "俺", "老", "小", "哥", "姐", "兄弟", "姐妹"
+)
+
+# 温暖/关心类词汇
+_WARM_WORDS = (
+    "关心", "在乎", "想念", "挂念", "担心", "心疼", "辛苦了", "加油",
+    "棒", "厉害", "开心", "高兴", "喜欢", "爱", "亲", "宝", "甜",
+    "照顾好", "注意身体", "早点休息", "别太累", "有空", "一起",
+    "想你", "念你", "好久不见", "期待", "祝", "希望你", "保重",
+    "抱抱", "摸摸头", "乖", "宝贝", "亲爱的", "❤️", "💕", "🥰", "😘"
+)
+
+# 冷淡/公事类词汇
+_COLD_WORDS = (
+    "通知", "告知", "须", "必须", "应当", "不得", "禁止", "按照",
+    "根据", "依据", "规定", "要求", "标准", "流程", "提交", "汇报"
+)
+
+# 直接表达词汇
+_DIRECT_WORDS = (
+    "我觉得", "我认为", "我想", "我要", "必须", "一定", "肯定",
+    "就是", "明确", "直接", "简单说", "总之", "反正", "不行", "可以"
+)
+
+# 委婉/铺垫词汇
+_INDIRECT_WORDS = (
+    "可能", "也许", "或许", "大概", "似乎", "好像", "应该", "觉得",
+    "不知道", "不太确定", "如果可以的话", "方便的话", "有空的话",
+    "能不能", "可不可以", "是否", "是不是", "会不会", "要不要",
+    "其实", "说实话", "坦白说", "怎么说呢"
+)
+
+# 幽默/轻松词汇（按小写匹配）
+_HUMOR_WORDS = (
+    "哈哈", "嘿嘿", "呵呵", "hiahia", "233", "笑死", "绝了", "太好笑",
+    "搞笑", "有趣", "玩笑", "调侃", "皮", "逗", "段子", "梗",
+    "hhh", "xswl", "hhhh", "🤣", "😂", "😆", "🙃", "😏", "😜", "🤪"
+)
+
+# 严肃话题词汇
+_SERIOUS_WORDS = (
+    "严肃", "认真", "重要", "紧急", "问题", "麻烦", "困难", "危机",
+    "严重", "担忧", "焦虑", "压力", "生病", "去世", "抱歉", "道歉"
+)
+
+# 表情符号、句末标点与分句标点
+_EMOJI_RE = re.compile(r'[😀-🙏🌀-🗿🚀-🛿☀-⛿✀-➿🤀-🧿😂🤣😊😍🥰😘😭😱😤😡🙄😅🤔🤗👍👎👌✌️🎉🔥💯❤️💕]')
+_SENT_END_RE = re.compile(r'[。！？.!?]')
+_SENT_SPLIT_RE = re.compile(r'[。！？.!?，,、；;]')
+_PUNCT_END_CHARS = frozenset('。！？.!?')
+
+
+def _keyword_re(words: List[str]) -> "re.Pattern[str]":
+    """把关键词列表编译成一个交替正则，只用于判断是否包含任一关键词。"""
+    return re.compile("|".join(map(re.escape, words)))
+
+
+# 只需判断“是否包含”的关键词
+_QUESTION_RE = re.compile(r"[？?吗]")
+_THANKS_RE = _keyword_re(["谢谢", "感谢", "多谢", "thanks", "thank"])
+_EMPATHY_RE = _keyword_re(["理解", "明白", "懂你", "同感", "也是"])
+_GREETING_RE = _keyword_re(["早", "晚安", "你好", "嗨", "hi", "hello"])
+_DEEP_RE = _keyword_re(["压力", "焦虑", "难受", "求助", "秘密", "感受", "情绪", "家人", "关系", "问题", "计划"])
+
+# 类别 -> (关键词表, 是否按小写文本匹配)
+_KEYWORD_GROUPS = {
+    "formal": (_FORMAL_WORDS, False),
+    "informal": (_INFORMAL_WORDS, True),
+    "warm": (_WARM_WORDS, False),
+    "cold": (_COLD_WORDS, False),
+    "direct": (_DIRECT_WORDS, False),
+    "indirect": (_INDIRECT_WORDS, False),
+    "humor": (_HUMOR_WORDS, True),
+    "serious": (_SERIOUS_WORDS, False),
+}
+
+
+def _build_keyword_tables() -> Tuple[Tuple[Tuple[str, Tuple[str, ...]], ...], ...]:
+    """把各类关键词展平为 (原文, 小写文本) 两张表：每个关键词只出现一次，附带其所属类别。"""
+    tables = []
+    for lowercase in (False, True):
+        categories_by_word: Dict[str, List[str]] = {}
+        for category, (words, use_lower) in _KEYWORD_GROUPS.items():
+            if use_lower == lowercase:
+                for word in words:
+                    categories_by_word.setdefault(word, []).append(category)
+        tables.append(tuple((word, tuple(categories)) for word, categories in categories_by_word.items()))
+    return tuple(tables)
+
+
+_KEYWORD_TABLES = _build_keyword_tables()
+
+
+def _build_keyword_automata():
+    """构建 (原文, 小写文本) 两个 Aho-Corasick 自动机；未安装 pyahocorasick 时返回 None。"""
+    if ahocorasick is None:
+        return None
+    automata = []
+    for table in _KEYWORD_TABLES:
+        automaton = ahocorasick.Automaton()
+        for word, categories in table:
+            automaton.add_word(word, (word, categories))
+        automaton.make_automaton()
+        automata.append(automaton)
+    return tuple(automata)
+
+
+_KEYWORD_AUTOMATA = _build_keyword_automata()
+
+
+def _count_keyword_hits(message: str) -> Dict[str, int]:
+    """统计消息中各类关键词的命中数（每个关键词最多计一次）。
+
+    安装了 pyahocorasick 时一次扫描找出所有关键词；否则遍历展平后的关键词表，
+    多个类别共有的词（如“哈哈”“麻烦”）只做一次子串判断。两种方式结果一致。
+    """
+    counts = dict.fromkeys(_KEYWORD_GROUPS, 0)
+    texts = (message, message.lower())
+    if _KEYWORD_AUTOMATA is not None:
+        for automaton, text in zip(_KEYWORD_AUTOMATA, texts):
+            seen = set()
+            for _, (word, categories) in automaton.iter(text):
+                if word in seen:
+                    continue
+                seen.add(word)
+                for category in categories:
+                    counts[category] += 1
+    else:
+        for table, text in zip(_KEYWORD_TABLES, texts):
+            for word, categories in table:
+                if word in text:
+                    for category in categories:
+                        counts[category] += 1
+    return counts
+
+
+@lru_cache(maxsize=4096)
+def _parse_date(value: str) -> date:
+    """解析 YYYY-MM-DD 日期字符串；同一日期只解析一次。格式错误时抛出 ValueError。"""
+    return datetime.strptime(value, "%Y-%m-%d").date()
+
+
+_TODAY: Tuple[Optional[date], str] = (None, "")
+
+
+def _today_iso() -> str:
+    """返回今天的 YYYY-MM-DD 字符串，跨天时才重新格式化。"""
+    global _TODAY
+    today = date.today()
+    if _TODAY[0] != today:
+        _TODAY = (today, today.isoformat())
+    return _TODAY[1]
+
+
+def _norm(text: str) -> str:
+    """记忆去重用的规范化键：去掉首尾空白并忽略大小写。"""
+    return text.strip().lower() if text else ""
+
+
+@lru_cache(maxsize=256)
+def _rule_advice_text(stage: str, formality_level: int, warm: bool) -> str:
+    """按 (关系阶段, 正式度档位, 是否偏温暖) 生成规则建议，相同档位直接复用。"""
+    lines = [f"当前关系处于“{stage}期”。"]
+    if formality_level > 0:
+        lines.append("建议保持正式、清晰的表达。")
+    elif formality_level < 0:
+        lines.append("建议保持轻松自然的语气。")
+    else:
+        lines.append("建议使用中性、礼貌的语气。")
+    if warm:
+        lines.append("可适度使用关怀或鼓励式回应。")
+    else:
+        lines.append("注意避免过度情感表达。")
+    return "\n".join(lines)
 
 
 class MessageInput(QTextEdit):
@@ -958,6 +1545,15 @@ class MessageInput(QTextEdit):
         super().keyPressEvent(event)
 
 
+@dataclass(slots=True)
+class RoundState:
+    """一轮回复建议的反馈状态。"""
+
+    like_applied: bool = False
+    dislike_applied: bool = False
+    base_intimacy: int = 0  # 轮次开始时的亲密度基准
+
+
 class MainWindow(QMainWindow):
     """主窗口。"""
 
@@ -966,16 +1562,28 @@ class MainWindow(QMainWindow):
         self._system = system
         self._store = AppStore()
         self._current_person_id: Optional[str] = None
+        # 数据写盘去抖：短时间内的多次修改合并为一次 sync_to_data_dir
+        self._save_timer = QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(500)
+        self._save_timer.timeout.connect(self._flush_store)
         self._conversation_cache: dict[str, list[dict]] = {}
+        # 对话缓存的索引：message_id -> 消息，round_id -> 同轮次消息
+        self._message_by_id: dict[str, dict] = {}
+        self._round_index: defaultdict[str, list[dict]] = defaultdict(list)
         # 跟踪正在进行的消息生成请求：{person_id: context}
         self._pending_requests: dict[str, dict] = {}
         # 当前显示的等待指示器
         self._current_typing_indicator: Optional[QListWidgetItem] = None
-        # 对话轮次反馈状态跟踪: {person_id: {round_id: {"like_applied": bool, "dislike_applied": bool}}}
-        self._feedback_round_state: dict[str, dict[str, dict]] = {}
+        # 对话轮次反馈状态跟踪: {(person_id, round_id): RoundState}
+        self._feedback_round_state: dict[tuple[str, str], RoundState] = {}
+        # 记忆摘要缓存: {person_id: (记忆版本号, 摘要文本)}，记忆未变化时直接复用
+        self._summary_cache: dict[str, tuple[int, str]] = {}
+        # 使用说明/算法说明对话框首次打开时创建，之后复用，Markdown 只渲染一次
+        self._help_dialog: Optional[HelpDialog] = None
+        self._algorithm_dialog: Optional[AlgorithmDialog] = None
 
         # 加载保存的亲密度权重设置
-        from core.intimacy_manager import IntimacyManager
         IntimacyManager.load_saved_settings()
 
         self.setWindowTitle("对话回复决策系统")
@@ -999,18 +1607,22 @@ class MainWindow(QMainWindow):
         main_layout.addWidget(self.right_panel)
 
         self._store.load_from_data_dir(self._system.settings.data_dir)
+        # 先把当前数据交给保存线程备用，首次系统写盘后即可恢复界面维护的字段
+        SaverWorker.instance().request_store_sync(
+            self._store.snapshot_for_sync(self._system.settings.data_dir), write=False
+        )
         self._refresh_contact_list()
 
     # ---------------- Menu/Status ----------------
 
     def _build_menu(self) -> None:
         file_menu = self.menuBar().addMenu("文件")
-        import_action = QAction("导入关系数据", self)
-        export_action = QAction("导出关系数据", self)
-        import_action.triggered.connect(self._import_data)
-        export_action.triggered.connect(self._export_data)
-        file_menu.addAction(import_action)
-        file_menu.addAction(export_action)
+        self._import_action = QAction("导入关系数据", self)
+        self._export_action = QAction("导出关系数据", self)
+        self._import_action.triggered.connect(self._import_data)
+        self._export_action.triggered.connect(self._export_data)
+        file_menu.addAction(self._import_action)
+        file_menu.addAction(self._export_action)
 
         settings_menu = self.menuBar().addMenu("设置")
         api_action = QAction("模型 API 配置", self)
@@ -1024,9 +1636,6 @@ class MainWindow(QMainWindow):
         settings_menu.addSeparator()
         theme_menu = settings_menu.addMenu("主题")
         
-        from .theme_manager import ThemeManager, get_theme_display_name
-        from core.config import THEME_LIGHT, THEME_DARK, THEME_SYSTEM
-        
         theme_manager = ThemeManager.instance()
         current_theme = theme_manager.get_current_setting()
         
@@ -1050,9 +1659,6 @@ class MainWindow(QMainWindow):
 
     def _show_api_settings(self) -> None:
         """显示 API 设置对话框。"""
-        from .settings_dialogs import APISettingsDialog
-        from core.config import save_api_settings
-        
         dialog = APISettingsDialog(self, self._system.settings)
         if dialog.exec() == QDialog.Accepted:
             settings_dict = dialog.get_settings()
@@ -1070,10 +1676,6 @@ class MainWindow(QMainWindow):
 
     def _show_weight_settings(self) -> None:
         """显示亲密度权重设置对话框。"""
-        from .settings_dialogs import IntimacyWeightSettingsDialog
-        from core.intimacy_manager import IntimacyManager
-        from core.config import save_intimacy_weight_settings
-        
         dialog = IntimacyWeightSettingsDialog(self)
         if dialog.exec() == QDialog.Accepted:
             settings_dict = dialog.get_settings()
@@ -1099,6 +1701,7 @@ class MainWindow(QMainWindow):
             # 应用初始亲密度设置
             base_intimacy = settings_dict.get("base_intimacy", {})
             IntimacyManager.update_base_intimacy(base_intimacy)
+            self._stage_from_intimacy.cache_clear()
             
             # 持久化保存到文件
             if save_intimacy_weight_settings(decay, growth, base_intimacy):
@@ -1108,11 +1711,10 @@ class MainWindow(QMainWindow):
 
     def _switch_theme(self, theme: str) -> None:
         """切换应用主题。"""
-        from .theme_manager import ThemeManager, get_theme_display_name
-        from core.config import THEME_LIGHT, THEME_DARK, THEME_SYSTEM
-        
         theme_manager = ThemeManager.instance()
         if theme_manager.set_theme(theme):
+            _ThemeCache.refresh()
+            
             # 更新菜单中的选中状态
             for t, action in self._theme_actions.items():
                 action.setChecked(t == theme)
@@ -1129,15 +1731,15 @@ class MainWindow(QMainWindow):
 
     def _show_help(self) -> None:
         """显示使用说明。"""
-        from .settings_dialogs import HelpDialog
-        dialog = HelpDialog(self)
-        dialog.exec()
+        if self._help_dialog is None:
+            self._help_dialog = HelpDialog(self)
+        self._help_dialog.exec()
 
     def _show_algorithm(self) -> None:
         """显示算法说明。"""
-        from .settings_dialogs import AlgorithmDialog
-        dialog = AlgorithmDialog(self)
-        dialog.exec()
+        if self._algorithm_dialog is None:
+            self._algorithm_dialog = AlgorithmDialog(self)
+        self._algorithm_dialog.exec()
 
     def _build_status_bar(self) -> None:
         self.status_contact = QLabel("当前对象：-")
@@ -1160,21 +1762,35 @@ class MainWindow(QMainWindow):
         self.btn_add_person.clicked.connect(self._on_add_person)
         self.search_input = QLineEdit()
         self.search_input.setPlaceholderText("搜索对象（姓名/标签）")
-        self.search_input.textChanged.connect(self._refresh_contact_list)
+        # 输入停顿 150ms 后再刷新，避免每个按键都重建联系人列表
+        self._search_debounce = QTimer(self)
+        self._search_debounce.setSingleShot(True)
+        self._search_debounce.setInterval(150)
+        self._search_debounce.timeout.connect(self._refresh_contact_list)
+        self.search_input.textChanged.connect(self._search_debounce.start)
 
         top_row.addWidget(self.btn_add_person)
         layout.addLayout(top_row)
         layout.addWidget(self.search_input)
 
-        self.contact_list = QListWidget()
+        self.contact_list = QListView()
+        self.contact_model = ContactListModel(self.contact_list)
+        self.contact_list.setModel(self.contact_model)
+        self._last_render_sig: Optional[tuple] = None
         self.contact_list.setSpacing(0)
         self.contact_list.setFocusPolicy(Qt.NoFocus)
+        self.contact_list.setUniformItemSizes(True)
+        self.contact_list.setSelectionMode(QListView.SingleSelection)
+        self.contact_list.setEditTriggers(QListView.NoEditTriggers)
         self.contact_list.setStyleSheet(
-            "QListWidget::item { border: none; margin: 0px; padding: 0px; }"
-            "QListWidget::item:selected { background: transparent; outline: none; }"
+            "QListView::item { border: none; margin: 0px; padding: 0px; }"
+            "QListView::item:selected { background: transparent; outline: none; }"
         )
         self.contact_list.setMouseTracking(True)
-        self.contact_list.itemSelectionChanged.connect(self._on_person_selected)
+        self.contact_list.setItemDelegate(PersonDelegate(self.contact_list))
+        self.contact_list.viewport().setAttribute(Qt.WA_Hover, True)
+        self.contact_list.viewport().setCursor(Qt.PointingHandCursor)
+        self.contact_list.selectionModel().selectionChanged.connect(self._on_person_selected)
         self.contact_list.setContextMenuPolicy(Qt.CustomContextMenu)
         self.contact_list.customContextMenuRequested.connect(self._show_person_context_menu)
 
@@ -1187,47 +1803,48 @@ class MainWindow(QMainWindow):
         # 保存当前选中的对象ID
         current_id = self._current_person_id
         
-        self.contact_list.clear()
-
+        people = []
         for person in self._store.list_people():
             if keyword:
                 haystack = f"{person.name} {' '.join(person.style_tags)}"
                 if keyword not in haystack:
                     continue
-            item = QListWidgetItem()
-            item.setData(Qt.UserRole, person.person_id)
-            item.setSizeHint(QSize(220, 70))
-            widget = PersonItemWidget(person)
-            self.contact_list.addItem(item)
-            self.contact_list.setItemWidget(item, widget)
-
-        # 恢复之前选中的对象
-        if current_id:
-            for idx in range(self.contact_list.count()):
-                item = self.contact_list.item(idx)
-                if item.data(Qt.UserRole) == current_id:
-                    self.contact_list.setCurrentRow(idx)
-                    break
-        elif self.contact_list.count() > 0:
-            self.contact_list.setCurrentRow(0)
-        
-        self._apply_person_item_styles()
+            people.append(person)
+
+        # 过滤结果、对象实例与亲密度都与上次相同时，只需重绘
+        render_sig = (keyword, tuple((p.person_id, id(p), p.intimacy) for p in people))
+        # 批量更新期间暂停重绘，结束时统一绘制一次（对象字段可能被原地修改）
+        self.contact_list.setUpdatesEnabled(False)
+        try:
+            if render_sig != self._last_render_sig:
+                self._last_render_sig = render_sig
+                self.contact_model.set_people(people)
+
+            # 恢复之前选中的对象
+            current_index = self.contact_model.index_of(current_id)
+            if current_index.isValid():
+                if self.contact_list.currentIndex() != current_index:
+                    # 选中的仍是同一对象，右侧内容无需重新渲染
+                    selection_model = self.contact_list.selectionModel()
+                    selection_model.blockSignals(True)
+                    try:
+                        self.contact_list.setCurrentIndex(current_index)
+                    finally:
+                        selection_model.blockSignals(False)
+            elif not current_id and self.contact_model.rowCount() > 0:
+                self.contact_list.setCurrentIndex(self.contact_model.index(0))
+        finally:
+            self.contact_list.setUpdatesEnabled(True)
 
     def _update_contact_item_intimacy(self, person_id: str, intimacy: int) -> None:
         """更新左侧联系人列表中指定对象的亲密度显示。"""
-        for idx in range(self.contact_list.count()):
-            item = self.contact_list.item(idx)
-            if item.data(Qt.UserRole) == person_id:
-                widget = self.contact_list.itemWidget(item)
-                if isinstance(widget, PersonItemWidget):
-                    widget.update_intimacy(intimacy)
-                break
+        self.contact_model.update_intimacy(person_id, intimacy)
 
     def _on_person_selected(self) -> None:
-        items = self.contact_list.selectedItems()
-        if not items:
+        indexes = self.contact_list.selectionModel().selectedIndexes()
+        if not indexes:
             return
-        person_id = items[0].data(Qt.UserRole)
+        person_id = indexes[0].data(Qt.UserRole)
         self._current_person_id = person_id
         person = self._store.people.get(person_id)
         if not person:
@@ -1239,15 +1856,14 @@ class MainWindow(QMainWindow):
         if person_id in self._pending_requests:
             self._current_typing_indicator = self._show_typing_indicator(person_id)
         
-        self._update_profile_panel(person)
+        self._update_profile_panel(person, full=True)
         self._update_memory_panel(person)
-        self._apply_person_item_styles()
 
     def _show_person_context_menu(self, pos) -> None:
-        item = self.contact_list.itemAt(pos)
-        if not item:
+        index = self.contact_list.indexAt(pos)
+        if not index.isValid():
             return
-        person_id = item.data(Qt.UserRole)
+        person_id = index.data(Qt.UserRole)
         menu = QMenu(self)
         edit_action = menu.addAction("编辑对象")
         delete_action = menu.addAction("删除对象")
@@ -1280,7 +1896,7 @@ class MainWindow(QMainWindow):
         )
         self._store.add_person(person)
         self._conversation_cache[person.person_id] = []
-        self._store.sync_to_data_dir(self._system.settings.data_dir)
+        self._schedule_save()
         self._refresh_contact_list()
         self._set_current_person(person.person_id)
 
@@ -1304,43 +1920,40 @@ class MainWindow(QMainWindow):
         person.notes = data["notes"]
         person.avatar_path = data["avatar_path"]
         self._store.update_person(person)
-        self._store.sync_to_data_dir(self._system.settings.data_dir)
+        self._schedule_save()
         self._refresh_contact_list()
-        self._set_current_person(person_id)
+        if person_id == self._current_person_id:
+            # 恢复选中时不会触发选择信号，编辑的是当前对象时需手动刷新右侧内容
+            self.status_contact.setText(f"当前对象：{person.display_name}")
+            self._update_profile_panel(person, full=True)
+        else:
+            self._set_current_person(person_id)
 
     def _on_delete_person(self, person_id: str) -> None:
         if QMessageBox.question(self, "确认", "确定要删除该对象吗？") != QMessageBox.Yes:
             return
         self._store.delete_person(person_id)
-        self._conversation_cache.pop(person_id, None)
-        self._store.sync_to_data_dir(self._system.settings.data_dir)
+        for msg in self._conversation_cache.pop(person_id, []):
+            self._message_by_id.pop(msg.get("message_id"), None)
+            self._round_index.pop(msg.get("round_id"), None)
+            self._feedback_round_state.pop((person_id, msg.get("round_id")), None)
+        self._summary_cache.pop(person_id, None)
+        self._schedule_save()
         self._current_person_id = None
         self._refresh_contact_list()
         self._clear_profile_panel()
         self.status_contact.setText("当前对象：-")
 
     def _on_pin_person(self, person_id: str) -> None:
-        person = self._store.people.get(person_id)
-        if not person:
+        if not self._store.pin_person(person_id):
             return
-        self._store.delete_person(person_id)
-        self._store.people = {person_id: person, **self._store.people}
         self._refresh_contact_list()
         self._set_current_person(person_id)
 
     def _set_current_person(self, person_id: str) -> None:
-        for idx in range(self.contact_list.count()):
-            item = self.contact_list.item(idx)
-            if item.data(Qt.UserRole) == person_id:
-                self.contact_list.setCurrentRow(idx)
-                return
-
-    def _apply_person_item_styles(self) -> None:
-        for idx in range(self.contact_list.count()):
-            item = self.contact_list.item(idx)
-            widget = self.contact_list.itemWidget(item)
-            if isinstance(widget, PersonItemWidget):
-                widget.set_selected(item.isSelected())
+        index = self.contact_model.index_of(person_id)
+        if index.isValid():
+            self.contact_list.setCurrentIndex(index)
 
     # ---------------- Right Panel ----------------
 
@@ -1384,11 +1997,13 @@ class MainWindow(QMainWindow):
         self.stack = QStackedWidget()
         self.profile_page = self._build_profile_page()
         self.reply_page = self._build_reply_page()
-        self.memory_page = self._build_memory_page()
+        # 长期记忆页首次切换过去时才构建，启动时先放一个空白占位页
+        self.memory_page: Optional[QWidget] = None
+        self._memory_placeholder = QWidget()
 
         self.stack.addWidget(self.profile_page)
         self.stack.addWidget(self.reply_page)
-        self.stack.addWidget(self.memory_page)
+        self.stack.addWidget(self._memory_placeholder)
 
         layout.addLayout(top_row)
         layout.addWidget(self.stack)
@@ -1397,6 +2012,8 @@ class MainWindow(QMainWindow):
 
     def _set_module(self, index: int) -> None:
         titles = {0: "关系画像", 1: "回复建议", 2: "长期记忆"}
+        if index == 2:
+            self._ensure_memory_page()
         self.stack.setCurrentIndex(index)
         self.module_title.setText(titles.get(index, "回复建议"))
         
@@ -1404,7 +2021,7 @@ class MainWindow(QMainWindow):
         if index == 0 and self._current_person_id:
             person = self._store.people.get(self._current_person_id)
             if person:
-                self._update_profile_panel(person)
+                self._update_profile_panel(person, full=True)
 
     # ---------------- 模块一：关系画像 ----------------
 
@@ -1496,10 +2113,16 @@ class MainWindow(QMainWindow):
         layout.addWidget(scroll)
         return page
 
-    def _update_profile_panel(self, person: Person) -> None:
+    def _update_profile_panel(self, person: Person, full: bool = False) -> None:
+        """刷新画像面板。
+
+        full=False 时只刷新亲密度相关内容（阶段、趋势、折线图、风险、建议），
+        用于反馈、回复等只改变亲密度的场景；切换对象或页面时传 full=True，
+        额外重新加载风格滑块和演化记录。
+        """
         if not person.intimacy_history:
             self._store.record_intimacy(person.person_id, person.intimacy, "初始化")
-            self._store.sync_to_data_dir(self._system.settings.data_dir)
+            self._schedule_save()
         stage = self._stage_from_intimacy(person.intimacy)
         risk_text = self._evaluate_risk(person)
         last_updated = self._latest_intimacy_time(person) or "-"
@@ -1537,28 +2160,34 @@ class MainWindow(QMainWindow):
         self.label_risk.setText(f"关系风险提示：{risk_text}")
         self.strategy_text.setPlainText(self._build_rule_advice(person))
 
-        self._load_style_profile(person)
-        self._refresh_notes(person)
+        if full:
+            self._load_style_profile(person)
+            self._refresh_notes(person)
     
     def _get_intimacy_trend(self, person: Person) -> int:
         """获取最近一周的亲密度变化趋势。"""
         if not person.intimacy_change_history:
             return 0
         
+        # 同一天内变化历史未修改时直接使用缓存
+        today = date.today()
+        cache = self._store.trend_7d_cache.get(person.person_id)
+        if cache is not None and cache[0] == today:
+            return cache[1]
+        
         # 计算最近7天的变化总和
-        from datetime import timedelta
-        today = datetime.now().date()
         week_ago = today - timedelta(days=7)
         
         total_change = 0
         for record in person.intimacy_change_history:
             try:
-                record_date = datetime.strptime(record.get("date", ""), "%Y-%m-%d").date()
+                record_date = date.fromisoformat(record.get("date", ""))
                 if record_date >= week_ago:
                     total_change += record.get("change", 0)
             except ValueError:
                 continue
         
+        self._store.trend_7d_cache[person.person_id] = (today, total_change)
         return total_change
     
     def _update_profile_panel_without_chart(self, person: Person) -> None:
@@ -1598,6 +2227,7 @@ class MainWindow(QMainWindow):
         self._set_slider(self.slider_humor, self.label_humor, 0)
 
     @staticmethod
+    @lru_cache(maxsize=128)
     def _stage_from_intimacy(intimacy: int) -> str:
         """获取亲密度对应的关系阶段名称。"""
         stage_cn, _ = IntimacyManager.get_stage(intimacy)
@@ -1656,7 +2286,7 @@ class MainWindow(QMainWindow):
         self.label_direct.setText(f"{self.slider_direct.value()}%")
         self.label_humor.setText(f"{self.slider_humor.value()}%")
         # 保存风格数据到文件
-        self._store.sync_to_data_dir(self._system.settings.data_dir)
+        self._schedule_save()
 
     def _format_trend(self, person: Person) -> str:
         if not person.intimacy_history:
@@ -1673,35 +2303,29 @@ class MainWindow(QMainWindow):
         stage = self._stage_from_intimacy(person.intimacy)
         warmth = person.style_profile.get("warmth", 0.5)
         formality = person.style_profile.get("formality", 0.5)
-        lines = [f"当前关系处于“{stage}期”。"]
         if formality >= 0.7:
-            lines.append("建议保持正式、清晰的表达。")
+            formality_level = 1
         elif formality <= 0.3:
-            lines.append("建议保持轻松自然的语气。")
-        else:
-            lines.append("建议使用中性、礼貌的语气。")
-        if warmth >= 0.6:
-            lines.append("可适度使用关怀或鼓励式回应。")
+            formality_level = -1
         else:
-            lines.append("注意避免过度情感表达。")
-        return "\n".join(lines)
+            formality_level = 0
+        return _rule_advice_text(stage, formality_level, warmth >= 0.6)
 
     def _evaluate_risk(self, person: Person) -> str:
         """评估关系风险，综合考虑亲密度趋势和交互频率。"""
         risks = []
         
         # 检查亲密度下降趋势
-        history = person.intimacy_history[-3:]
+        history = person.intimacy_history
         if len(history) >= 3:
-            values = [item.get("intimacy_score", 50) for item in history]
-            if values[2] < values[1] < values[0]:
+            first, second, third = (item.get("intimacy_score", 50) for item in history[-3:])
+            if third < second < first:
                 risks.append("亲密度持续下降")
         
         # 检查长期未交互
         if person.last_interaction_date:
             try:
-                last_date = datetime.strptime(person.last_interaction_date, "%Y-%m-%d")
-                days_since = (datetime.now() - last_date).days
+                days_since = (date.today() - _parse_date(person.last_interaction_date)).days
                 if days_since >= 30:
                     risks.append(f"已{days_since}天未交互，关系正在淡化")
                 elif days_since >= 14:
@@ -1726,9 +2350,12 @@ class MainWindow(QMainWindow):
             return "⚠️ " + "；".join(risks)
 
     def _refresh_notes(self, person: Person) -> None:
-        self.note_list.clear()
-        for note in person.evolution_notes[-10:]:
-            self.note_list.addItem(note)
+        self.note_list.setUpdatesEnabled(False)
+        try:
+            self.note_list.clear()
+            self.note_list.addItems(person.evolution_notes[-10:])
+        finally:
+            self.note_list.setUpdatesEnabled(True)
 
     def _on_add_evolution_note(self) -> None:
         person = self._get_current_person()
@@ -1742,7 +2369,7 @@ class MainWindow(QMainWindow):
         self.note_input.clear()
         self._refresh_notes(person)
         # 保存备注数据到文件
-        self._store.sync_to_data_dir(self._system.settings.data_dir)
+        self._schedule_save()
 
     # ---------------- 模块二：回复建议 ----------------
 
@@ -1751,6 +2378,13 @@ class MainWindow(QMainWindow):
         layout = QVBoxLayout(page)
 
         self.conversation_list = QListWidget()
+        self._cached_item_max_width: Optional[int] = None
+        # 当前已渲染的最早一条历史消息在缓存中的下标，大于 0 表示上方还有未渲染的消息
+        self._rendered_from = 0
+        self.conversation_list.verticalScrollBar().valueChanged.connect(self._on_conversation_scrolled)
+        # 视口尺寸变化（窗口缩放、滚动条出现等）时才重新计算所有气泡宽度
+        self._conversation_viewport = self.conversation_list.viewport()
+        self._conversation_viewport.installEventFilter(self)
         self.conversation_list.setSpacing(6)
         self.conversation_list.setSelectionMode(QListWidget.NoSelection)
         self.conversation_list.setFocusPolicy(Qt.NoFocus)
@@ -1778,6 +2412,10 @@ class MainWindow(QMainWindow):
         strategy_layout.addWidget(self.strategy_distance)
         strategy_layout.addWidget(self.strategy_humor)
         strategy_layout.addStretch()
+        # 勾选状态变化时更新策略提示，发送时直接读取
+        self._cached_strategy_notes = ""
+        for checkbox in (self.strategy_close, self.strategy_formal, self.strategy_distance, self.strategy_humor):
+            checkbox.stateChanged.connect(self._recompute_strategy_notes)
 
         input_row = QHBoxLayout()
         self.original_input = MessageInput()
@@ -1824,7 +2462,7 @@ class MainWindow(QMainWindow):
         # 2. 显示等待指示器
         self._current_typing_indicator = self._show_typing_indicator(target_person_id)
 
-        strategy_notes = self._collect_strategy_notes()
+        strategy_notes = self._cached_strategy_notes
         composed_message = message
         if strategy_notes:
             composed_message += f"\n\n[策略倾向]\n{strategy_notes}"
@@ -1840,25 +2478,19 @@ class MainWindow(QMainWindow):
         }
         
         # 3. 在后台线程中处理消息生成
-        self._message_worker = MessageGenerationWorker(
+        worker = MessageGenerationWorker(
             self._system,
             person.person_id,
             person.display_name,
             composed_message,
             contact_type,
         )
-        self._message_worker.finished.connect(self._on_message_generated)
-        self._message_worker.error.connect(self._on_message_error)
-        self._message_worker.start()
+        worker.signals.finished.connect(self._on_message_generated)
+        worker.signals.error.connect(self._on_message_error)
+        QThreadPool.globalInstance().start(worker)
     
-    def _on_message_generated(self, result: dict) -> None:
+    def _on_message_generated(self, target_person_id: str, result: dict) -> None:
         """消息生成完成的回调。"""
-        # 获取工作线程中的 person_id
-        worker = self.sender()
-        if not isinstance(worker, MessageGenerationWorker):
-            return
-        target_person_id = worker._person_id
-        
         # 从待处理请求中获取上下文
         ctx = self._pending_requests.pop(target_person_id, None)
         if ctx is None:
@@ -1872,7 +2504,7 @@ class MainWindow(QMainWindow):
         self.original_input.setEnabled(True)
         
         self.status_model.setText("模型状态：完成")
-        self.status_time.setText(f"最近生成：{datetime.now().strftime('%H:%M:%S')}")
+        self.status_time.setText(f"最近生成：{time.strftime('%H:%M:%S')}")
         
         # 只有当目标联系人是当前显示的联系人时才更新 UI
         if target_person_id == self._current_person_id:
@@ -1889,14 +2521,8 @@ class MainWindow(QMainWindow):
             # 回复建议也需要缓存
             self._cache_recommendations(result.get("recommendation", {}), target_person_id)
     
-    def _on_message_error(self, error_msg: str) -> None:
+    def _on_message_error(self, target_person_id: str, error_msg: str) -> None:
         """消息生成失败的回调。"""
-        # 获取工作线程中的 person_id
-        worker = self.sender()
-        if not isinstance(worker, MessageGenerationWorker):
-            return
-        target_person_id = worker._person_id
-        
         # 从待处理请求中移除
         self._pending_requests.pop(target_person_id, None)
         
@@ -1918,30 +2544,36 @@ class MainWindow(QMainWindow):
         if not replies:
             return
         
-        # 构建回复建议文本
+        # 构建回复建议文本（跳过空内容的建议，避免出现空白占位）
         lines = []
-        for i, r in enumerate(replies, 1):
-            lines.append(f"【建议{i}】{r.get('text', '')}")
+        for i, r in enumerate([r for r in replies if r.get("text")], 1):
+            lines.append(f"【建议{i}】{r['text']}")
             if r.get("reason"):
                 lines.append(f"   理由：{r['reason']}")
-        
+        if not lines:
+            return
         combined_text = "\n".join(lines)
         
         # 生成消息ID
-        from uuid import uuid4
-        message_id = str(uuid4())
+        message_id = uuid4().hex
         
         # 缓存到对话历史
-        if target_person_id not in self._conversation_cache:
-            self._conversation_cache[target_person_id] = []
-        self._conversation_cache[target_person_id].append({
+        self._cache_message(target_person_id, {
             "role": "assistant",
             "text": combined_text,
             "message_id": message_id,
             "feedback": None,
         })
 
-    def _collect_strategy_notes(self) -> str:
+    def _cache_message(self, person_id: str, msg: dict) -> None:
+        """追加消息到对话缓存，并同步更新按消息ID/轮次ID的索引。"""
+        self._conversation_cache.setdefault(person_id, []).append(msg)
+        self._message_by_id[msg["message_id"]] = msg
+        round_id = msg.get("round_id")
+        if round_id:
+            self._round_index[round_id].append(msg)
+
+    def _recompute_strategy_notes(self, *_args) -> None:
         notes = []
         if self.strategy_close.isChecked():
             notes.append("语气更亲近")
@@ -1951,7 +2583,7 @@ class MainWindow(QMainWindow):
             notes.append("保持礼貌距离")
         if self.strategy_humor.isChecked():
             notes.append("适当幽默")
-        return "\n".join(f"- {note}" for note in notes)
+        self._cached_strategy_notes = "\n".join(f"- {note}" for note in notes)
 
     def _update_intimacy_after_reply(self, person: Person, result: dict, message: str, user_accepted: bool = False) -> None:
         """
@@ -1975,9 +2607,7 @@ class MainWindow(QMainWindow):
         days_since_last = 0
         if person.last_interaction_date:
             try:
-                last_date = datetime.strptime(person.last_interaction_date, "%Y-%m-%d")
-                today = datetime.now()
-                days_since_last = (today - last_date).days
+                days_since_last = (date.today() - _parse_date(person.last_interaction_date)).days
             except ValueError:
                 days_since_last = 0
         
@@ -1994,9 +2624,9 @@ class MainWindow(QMainWindow):
             current_intimacy = decayed_intimacy
         
         # 分析消息质量
-        has_question = "？" in message or "?" in message or "吗" in message
-        has_thanks = any(word in message for word in ["谢谢", "感谢", "多谢", "thanks", "thank"])
-        has_empathy = any(word in message for word in ["理解", "明白", "懂你", "同感", "也是"])
+        has_question = _QUESTION_RE.search(message) is not None
+        has_thanks = _THANKS_RE.search(message) is not None
+        has_empathy = _EMPATHY_RE.search(message) is not None
         
         # 计算增长（只有在用户"接受"建议时才增长）
         # 目前默认为 True，实际应该在用户点击"采纳"时才设置为 True
@@ -2016,13 +2646,13 @@ class MainWindow(QMainWindow):
             self._store.record_intimacy(person.person_id, new_intimacy, growth_reason)
         else:
             # 即使没有增长，也更新最后交互日期
-            person.last_interaction_date = datetime.now().strftime("%Y-%m-%d")
+            person.last_interaction_date = _today_iso()
         
         # 动态更新对话风格画像
         self._update_style_profile_from_message(person, message, result)
         
         # 保存亲密度和风格数据并刷新联系人列表
-        self._store.sync_to_data_dir(self._system.settings.data_dir)
+        self._schedule_save()
         self._refresh_contact_list()
 
     def _update_style_profile_from_message(self, person: Person, message: str, result: dict) -> None:
@@ -2046,15 +2676,16 @@ class MainWindow(QMainWindow):
                 "humor": 0.5,
             }
         
+        # 空白消息不包含任何风格信息，不参与更新
+        if not message or message.isspace():
+            return
+        
         # 获取当前风格值
         current = person.style_profile
         alpha = 0.15  # 平滑系数
         
         # 分析消息内容
-        formality_score = self._analyze_formality(message)
-        warmth_score = self._analyze_warmth(message)
-        directness_score = self._analyze_directness(message)
-        humor_score = self._analyze_humor(message)
+        formality_score, warmth_score, directness_score, humor_score = self._analyze_all(message)
         
         # 增量平滑更新
         person.style_profile = {
@@ -2070,7 +2701,23 @@ class MainWindow(QMainWindow):
         result = old_val * (1 - alpha) + new_val * alpha
         return max(0.0, min(1.0, result))
 
-    def _analyze_formality(self, message: str) -> float:
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _analyze_all(message: str) -> Tuple[float, float, float, float]:
+        """一次计算 (正式度, 温度, 直接度, 幽默度)。
+
+        四个分析都只依赖消息文本，关键词命中统计一次后共用，结果按消息缓存。
+        """
+        hits = _count_keyword_hits(message)
+        return (
+            MainWindow._analyze_formality(message, hits),
+            MainWindow._analyze_warmth(message, hits),
+            MainWindow._analyze_directness(message, hits),
+            MainWindow._analyze_humor(message, hits),
+        )
+
+    @staticmethod
+    def _analyze_formality(message: str, hits: Dict[str, int]) -> float:
         """
         分析消息的正式程度。
         
@@ -2079,33 +2726,15 @@ class MainWindow(QMainWindow):
         """
         score = 0.5  # 基础分
         
-        # 高正式度词汇
-        formal_words = [
-            "您", "请", "敬请", "烦请", "尊敬的", "贵", "希望", "建议", "感谢", 
-            "打扰", "冒昧", "恳请", "望", "如有", "若", "此", "鉴于", "关于",
-            "抱歉", "对不起", "麻烦", "辛苦", "多谢", "致谢", "特此", "敬上"
-        ]
-        
-        # 低正式度词汇（口语化/网络用语）
-        informal_words = [
-            "哈哈", "嗯嗯", "啊", "呀", "嘛", "呢", "吧", "哦", "噢", "emmm",
-            "hhh", "666", "awsl", "牛", "绝了", "真的吗", "咋", "啥", "整",
-            "搞", "弄", "咱", "俺", "老", "小", "哥", "姐", "兄弟", "姐妹"
-        ]
-        
-        # 表情符号（降低正式度）
-        emoji_pattern = r'[😀-🙏🌀-🗿🚀-🛿☀-⛿✀-➿🤀-🧿😂🤣😊😍🥰😘😭😱😤😡🙄😅🤔🤗👍👎👌✌️🎉🔥💯❤️💕]'
-        
-        msg_lower = message.lower()
-        
         # 统计正式词汇出现次数
-        formal_count = sum(1 for word in formal_words if word in message)
-        informal_count = sum(1 for word in informal_words if word in msg_lower)
-        emoji_count = len(re.findall(emoji_pattern, message))
+        formal_count = hits["formal"]
+        informal_count = hits["informal"]
+        emoji_count = len(_EMOJI_RE.findall(message))  # 表情符号（降低正式度）
         
         # 分析句式
-        has_complete_punctuation = message.rstrip().endswith(('。', '！', '？', '.', '!', '?'))
-        sentence_count = len(re.findall(r'[。！？.!?]', message)) + 1
+        stripped = message.rstrip()
+        has_complete_punctuation = bool(stripped) and stripped[-1] in _PUNCT_END_CHARS
+        sentence_count = len(_SENT_END_RE.findall(message)) + 1
         avg_sentence_len = len(message) / max(sentence_count, 1)
         
         # 计算得分调整
@@ -2120,7 +2749,8 @@ class MainWindow(QMainWindow):
         
         return max(0.0, min(1.0, score))
 
-    def _analyze_warmth(self, message: str) -> float:
+    @staticmethod
+    def _analyze_warmth(message: str, hits: Dict[str, int]) -> float:
         """
         分析消息的情感温度。
         
@@ -2129,27 +2759,12 @@ class MainWindow(QMainWindow):
         """
         score = 0.5
         
-        # 温暖/关心类词汇
-        warm_words = [
-            "关心", "在乎", "想念", "挂念", "担心", "心疼", "辛苦了", "加油",
-            "棒", "厉害", "开心", "高兴", "喜欢", "爱", "亲", "宝", "甜",
-            "照顾好", "注意身体", "早点休息", "别太累", "有空", "一起",
-            "想你", "念你", "好久不见", "期待", "祝", "希望你", "保重",
-            "抱抱", "摸摸头", "乖", "宝贝", "亲爱的", "❤️", "💕", "🥰", "😘"
-        ]
-        
-        # 冷淡/公事类词汇
-        cold_words = [
-            "通知", "告知", "须", "必须", "应当", "不得", "禁止", "按照",
-            "根据", "依据", "规定", "要求", "标准", "流程", "提交", "汇报"
-        ]
-        
-        warm_count = sum(1 for word in warm_words if word in message)
-        cold_count = sum(1 for word in cold_words if word in message)
+        warm_count = hits["warm"]
+        cold_count = hits["cold"]
         
         # 感叹号和问候语增加温度
         exclamation_count = message.count('！') + message.count('!')
-        has_greeting = any(g in message for g in ["早", "晚安", "你好", "嗨", "hi", "hello"])
+        has_greeting = _GREETING_RE.search(message) is not None
         
         score += warm_count * 0.1
         score -= cold_count * 0.08
@@ -2159,7 +2774,8 @@ class MainWindow(QMainWindow):
         
         return max(0.0, min(1.0, score))
 
-    def _analyze_directness(self, message: str) -> float:
+    @staticmethod
+    def _analyze_directness(message: str, hits: Dict[str, int]) -> float:
         """
         分析消息的直接程度。
         
@@ -2168,25 +2784,11 @@ class MainWindow(QMainWindow):
         """
         score = 0.5
         
-        # 直接表达词汇
-        direct_words = [
-            "我觉得", "我认为", "我想", "我要", "必须", "一定", "肯定",
-            "就是", "明确", "直接", "简单说", "总之", "反正", "不行", "可以"
-        ]
-        
-        # 委婉/铺垫词汇
-        indirect_words = [
-            "可能", "也许", "或许", "大概", "似乎", "好像", "应该", "觉得",
-            "不知道", "不太确定", "如果可以的话", "方便的话", "有空的话",
-            "能不能", "可不可以", "是否", "是不是", "会不会", "要不要",
-            "其实", "说实话", "坦白说", "怎么说呢"
-        ]
-        
-        direct_count = sum(1 for word in direct_words if word in message)
-        indirect_count = sum(1 for word in indirect_words if word in message)
+        direct_count = hits["direct"]
+        indirect_count = hits["indirect"]
         
         # 句子长度分析（短句通常更直接）
-        sentences = re.split(r'[。！？.!?，,、；;]', message)
+        sentences = _SENT_SPLIT_RE.split(message)
         valid_sentences = [s for s in sentences if len(s.strip()) > 0]
         if valid_sentences:
             avg_len = sum(len(s) for s in valid_sentences) / len(valid_sentences)
@@ -2200,7 +2802,8 @@ class MainWindow(QMainWindow):
         
         return max(0.0, min(1.0, score))
 
-    def _analyze_humor(self, message: str) -> float:
+    @staticmethod
+    def _analyze_humor(message: str, hits: Dict[str, int]) -> float:
         """
         分析消息的幽默/轻松程度。
         
@@ -2209,21 +2812,8 @@ class MainWindow(QMainWindow):
         """
         score = 0.5
         
-        # 幽默/轻松词汇
-        humor_words = [
-            "哈哈", "嘿嘿", "呵呵", "hiahia", "233", "笑死", "绝了", "太好笑",
-            "搞笑", "有趣", "玩笑", "调侃", "皮", "逗", "段子", "梗",
-            "hhh", "xswl", "hhhh", "🤣", "😂", "😆", "🙃", "😏", "😜", "🤪"
-        ]
-        
-        # 严肃话题词汇
-        serious_words = [
-            "严肃", "认真", "重要", "紧急", "问题", "麻烦", "困难", "危机",
-            "严重", "担忧", "焦虑", "压力", "生病", "去世", "抱歉", "道歉"
-        ]
-        
-        humor_count = sum(1 for word in humor_words if word in message.lower())
-        serious_count = sum(1 for word in serious_words if word in message)
+        humor_count = hits["humor"]
+        serious_count = hits["serious"]
         
         # 波浪号和省略号增加轻松感
         wave_count = message.count('~') + message.count('～')
@@ -2236,16 +2826,13 @@ class MainWindow(QMainWindow):
 
     @staticmethod
     def _estimate_conversation_depth(message: str) -> float:
-        deep_keywords = ["压力", "焦虑", "难受", "求助", "秘密", "感受", "情绪", "家人", "关系", "问题", "计划"]
-        if any(keyword in message for keyword in deep_keywords):
+        if _DEEP_RE.search(message) is not None:
             return 1.0
         if len(message) >= 30:
             return 0.6
         return 0.2
 
     def _append_recommendations(self, rec: dict, target_person_id: str = None) -> None:
-        from uuid import uuid4
-        
         replies = []
         primary = rec.get("suggested_reply")
         if primary:
@@ -2253,16 +2840,43 @@ class MainWindow(QMainWindow):
         replies.extend(rec.get("alternative_replies", []) or [])
         
         # 为这批回复生成一个共同的对话轮次ID
-        round_id = str(uuid4())
+        round_id = uuid4().hex
 
-        for reply in replies:
-            self._append_chat_message("assistant", reply, target_person_id=target_person_id, round_id=round_id)
+        self._append_chat_messages_batch(
+            [("assistant", reply, None, round_id) for reply in replies],
+            target_person_id=target_person_id,
+        )
+
+    def _append_chat_messages_batch(
+        self,
+        messages: List[Tuple[str, str, Optional[str], Optional[str]]],
+        target_person_id: str = None,
+    ) -> None:
+        """批量添加 (role, text, message_id, round_id) 消息，最后统一排版新消息并滚动一次。"""
+        if not messages:
+            return
+        start_row = self.conversation_list.count()
+        self.conversation_list.setUpdatesEnabled(False)
+        try:
+            for role, text, message_id, round_id in messages:
+                self._append_chat_message(
+                    role,
+                    text,
+                    target_person_id=target_person_id,
+                    message_id=message_id,
+                    round_id=round_id,
+                    defer_layout=True,
+                )
+            self._update_conversation_item_widths(start_row)
+        finally:
+            self.conversation_list.setUpdatesEnabled(True)
+        self.conversation_list.scrollToBottom()
 
     def _copy_text(self, text: str) -> None:
-        QApplication.clipboard().setText(text)
+        _get_clipboard().setText(text)
         QMessageBox.information(self, "已复制", "回复已复制到剪贴板。")
 
-    def _append_chat_message(self, role: str, text: str, record: bool = True, target_person_id: str = None, feedback: str = None, message_id: str = None, round_id: str = None) -> None:
+    def _append_chat_message(self, role: str, text: str, record: bool = True, target_person_id: str = None, feedback: str = None, message_id: str = None, round_id: str = None, defer_layout: bool = False, insert_row: Optional[int] = None) -> None:
         """
         添加聊天消息到对话列表。
         
@@ -2274,6 +2888,8 @@ class MainWindow(QMainWindow):
             feedback: 反馈状态 ("like" | "dislike" | None)
             message_id: 消息ID，若不传则自动生成
             round_id: 对话轮次ID，用于跟踪同一批回复的反馈状态
+            defer_layout: 批量添加时跳过宽度计算和滚动，由调用方在最后统一处理
+            insert_row: 插入到指定行，默认追加到末尾
         """
         if role == "assistant":
             text = text.lstrip("\n")
@@ -2282,12 +2898,11 @@ class MainWindow(QMainWindow):
         record_person_id = target_person_id or self._current_person_id
         
         # 使用传入的消息ID或生成新的
-        from uuid import uuid4
         if message_id is None:
-            message_id = str(uuid4())
+            message_id = uuid4().hex
         
         if record and record_person_id:
-            self._conversation_cache.setdefault(record_person_id, []).append({
+            self._cache_message(record_person_id, {
                 "role": role,
                 "text": text,
                 "message_id": message_id,
@@ -2312,9 +2927,16 @@ class MainWindow(QMainWindow):
         if role == "assistant":
             widget.feedback_changed.connect(self._on_message_feedback_changed)
         
-        self.conversation_list.addItem(item)
+        if insert_row is None:
+            self.conversation_list.addItem(item)
+        else:
+            self.conversation_list.insertItem(insert_row, item)
         self.conversation_list.setItemWidget(item, widget)
-        self._update_conversation_item_widths()
+        if defer_layout:
+            return
+        # 新消息只需按缓存的宽度排版自身
+        widget.set_max_width(self._conversation_item_max_width())
+        item.setSizeHint(widget.sizeHint())
         self.conversation_list.scrollToBottom()
     
     def _on_message_feedback_changed(self, message_id: str, feedback: str) -> None:
@@ -2331,13 +2953,11 @@ class MainWindow(QMainWindow):
         # 获取之前的反馈状态和 round_id
         old_feedback = None
         round_id = None
-        cache = self._conversation_cache.get(person_id, [])
-        for msg in cache:
-            if msg.get("message_id") == message_id:
-                old_feedback = msg.get("feedback")
-                round_id = msg.get("round_id")
-                msg["feedback"] = feedback if feedback else None
-                break
+        msg = self._message_by_id.get(message_id)
+        if msg is not None:
+            old_feedback = msg.get("feedback")
+            round_id = msg.get("round_id")
+            msg["feedback"] = feedback if feedback else None
         
         # 如果反馈状态没有变化，不处理
         if old_feedback == feedback:
@@ -2348,32 +2968,25 @@ class MainWindow(QMainWindow):
         if not person:
             return
         
-        # 初始化该轮次的反馈状态跟踪
-        if person_id not in self._feedback_round_state:
-            self._feedback_round_state[person_id] = {}
-        if round_id and round_id not in self._feedback_round_state[person_id]:
-            self._feedback_round_state[person_id][round_id] = {
-                "like_applied": False,
-                "dislike_applied": False,
-                "base_intimacy": person.intimacy,  # 记录轮次开始时的亲密度基准
-            }
-        
-        round_state = self._feedback_round_state.get(person_id, {}).get(round_id, {}) if round_id else {}
+        # 初始化该轮次的反馈状态跟踪，记录轮次开始时的亲密度基准
+        round_state = (
+            self._feedback_round_state.setdefault((person_id, round_id), RoundState(base_intimacy=person.intimacy))
+            if round_id else None
+        )
         
         # 统计该轮次内当前所有消息的反馈状态
         has_like = False
         has_dislike = False
         if round_id:
-            for msg in cache:
-                if msg.get("round_id") == round_id:
-                    fb = msg.get("feedback")
-                    if fb == "like":
-                        has_like = True
-                    elif fb == "dislike":
-                        has_dislike = True
+            for round_msg in self._round_index.get(round_id, ()):
+                fb = round_msg.get("feedback")
+                if fb == "like":
+                    has_like = True
+                elif fb == "dislike":
+                    has_dislike = True
         
         # 计算亲密度最终值（相对于轮次开始时的基准）
-        base_intimacy = round_state.get("base_intimacy", person.intimacy)
+        base_intimacy = round_state.base_intimacy if round_state is not None else person.intimacy
         intimacy_delta = 0
         reason_parts = []
         
@@ -2419,7 +3032,7 @@ class MainWindow(QMainWindow):
         person.rejection_count = max(0, person.rejection_count + rejection_delta)
         
         # 保存数据（不刷新联系人列表，避免重建对话列表导致其他消息无法操作）
-        self._store.sync_to_data_dir(self._system.settings.data_dir)
+        self._schedule_save()
         
         # 更新左侧联系人列表中的亲密度显示
         self._update_contact_item_intimacy(person_id, person.intimacy)
@@ -2431,9 +3044,30 @@ class MainWindow(QMainWindow):
         self.conversation_list.clear()
 
     def _render_conversation(self, person_id: str) -> None:
+        # 先清零，避免清空列表时滚动条回到顶部触发旧对象的补齐
+        self._rendered_from = 0
         self._clear_conversation()
         history = self._conversation_cache.get(person_id, [])
-        for item in history:
+        if not history:
+            return
+        # 只渲染最近一页；批量添加时暂停重绘和信号，最后统一计算一次宽度并滚动到底部
+        start = max(0, len(history) - _CHAT_RENDER_PAGE)
+        self.conversation_list.setUpdatesEnabled(False)
+        self.conversation_list.blockSignals(True)
+        try:
+            self._add_history_messages(history[start:])
+            self._update_conversation_item_widths()
+        finally:
+            self.conversation_list.blockSignals(False)
+            self.conversation_list.setUpdatesEnabled(True)
+        self._rendered_from = start
+        self.conversation_list.scrollToBottom()
+        # 一页消息撑不满视口时没有滚动条，直接补齐更早的记录
+        if start > 0 and self.conversation_list.verticalScrollBar().maximum() == 0:
+            self._render_earlier_messages()
+
+    def _add_history_messages(self, messages: List[dict], insert_row: Optional[int] = None) -> None:
+        for offset, item in enumerate(messages):
             self._append_chat_message(
                 item["role"],
                 item["text"],
@@ -2441,8 +3075,42 @@ class MainWindow(QMainWindow):
                 feedback=item.get("feedback"),
                 message_id=item.get("message_id"),
                 round_id=item.get("round_id"),
+                defer_layout=True,
+                insert_row=None if insert_row is None else insert_row + offset,
             )
 
+    def _on_conversation_scrolled(self, value: int) -> None:
+        if self._rendered_from > 0 and value == self.conversation_list.verticalScrollBar().minimum():
+            # 推迟到当前滚动事件结束后再插入，避免在滚动条回调中修改列表
+            QTimer.singleShot(0, self._render_earlier_messages)
+
+    def _render_earlier_messages(self) -> None:
+        """在列表顶部补上一页更早的历史消息，并保持当前可见内容不跳动。"""
+        history = self._conversation_cache.get(self._current_person_id, [])
+        end = min(self._rendered_from, len(history))
+        if end <= 0:
+            self._rendered_from = 0
+            return
+        start = max(0, end - _CHAT_RENDER_PAGE)
+        anchor = self.conversation_list.item(0)
+        max_width = self._conversation_item_max_width()
+        self.conversation_list.setUpdatesEnabled(False)
+        self.conversation_list.blockSignals(True)
+        try:
+            self._add_history_messages(history[start:end], insert_row=0)
+            for row in range(end - start):
+                item = self.conversation_list.item(row)
+                widget = self.conversation_list.itemWidget(item)
+                if isinstance(widget, ChatMessageWidget):
+                    widget.set_max_width(max_width)
+                    item.setSizeHint(widget.sizeHint())
+        finally:
+            self.conversation_list.blockSignals(False)
+            self.conversation_list.setUpdatesEnabled(True)
+        self._rendered_from = start
+        if anchor is not None:
+            self.conversation_list.scrollToItem(anchor, QListWidget.PositionAtTop)
+
     def _show_typing_indicator(self, target_person_id: str) -> Optional[QListWidgetItem]:
         """显示等待输入指示器。
         
@@ -2476,18 +3144,50 @@ class MainWindow(QMainWindow):
         if row >= 0:
             self.conversation_list.takeItem(row)
 
-    def _update_conversation_item_widths(self) -> None:
-        max_width = int(self.conversation_list.viewport().width() * 0.6)
-        for idx in range(self.conversation_list.count()):
+    def _conversation_item_max_width(self) -> int:
+        if self._cached_item_max_width is None:
+            self._cached_item_max_width = int(self.conversation_list.viewport().width() * 0.6)
+        return self._cached_item_max_width
+
+    def _update_conversation_item_widths(self, start_row: int = 0) -> None:
+        """按当前宽度排版 start_row 及之后的消息；从头排版时重新读取视口宽度。"""
+        if start_row == 0:
+            self._cached_item_max_width = None
+        max_width = self._conversation_item_max_width()
+        for idx in range(start_row, self.conversation_list.count()):
             item = self.conversation_list.item(idx)
             widget = self.conversation_list.itemWidget(item)
             if isinstance(widget, ChatMessageWidget):
                 widget.set_max_width(max_width)
                 item.setSizeHint(widget.sizeHint())
 
-    def resizeEvent(self, event) -> None:
-        super().resizeEvent(event)
-        self._update_conversation_item_widths()
+    def eventFilter(self, obj, event) -> bool:
+        if event.type() == QEvent.Resize and obj is self._conversation_viewport:
+            self._update_conversation_item_widths()
+        return super().eventFilter(obj, event)
+
+    def _schedule_save(self) -> None:
+        """标记数据需要保存，500ms 内的多次调用只写盘一次。"""
+        self._save_timer.start()
+
+    def _flush_store(self) -> None:
+        """在 UI 线程拍下仓库快照，交给保存线程写盘（保存线程是 data 目录的唯一写入者）。"""
+        self._save_timer.stop()
+        snapshot = self._store.snapshot_for_sync(self._system.settings.data_dir)
+        saver = SaverWorker.instance()
+        if saver is not None:
+            saver.request_store_sync(snapshot)
+        else:
+            # 保存线程已结束，不存在并发写入，直接写盘
+            AppStore.write_sync_snapshot(snapshot)
+
+    def closeEvent(self, event) -> None:
+        # 等待线程池中的生成/比对任务结束，它们可能还会提交系统写盘请求
+        QThreadPool.globalInstance().waitForDone()
+        # 仓库快照排在最后，保存线程按顺序写完系统数据与界面字段后退出
+        self._flush_store()
+        SaverWorker.shutdown()
+        super().closeEvent(event)
 
     # ---------------- 模块三：长期记忆 ----------------
 
@@ -2503,18 +3203,24 @@ class MainWindow(QMainWindow):
         self.memory_tabs.addTab("沟通策略")
         self.memory_tabs.currentChanged.connect(self._refresh_memory_lists)
 
-        # 使用滚动区域包裹记忆列表
-        scroll_area = QScrollArea()
-        scroll_area.setWidgetResizable(True)
-        scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-        
-        self.memory_list_container = QWidget()
-        self.memory_list_layout = QVBoxLayout(self.memory_list_container)
-        self.memory_list_layout.setSpacing(8)
-        self.memory_list_layout.setContentsMargins(4, 4, 4, 4)
-        self.memory_list_layout.addStretch()
-        
-        scroll_area.setWidget(self.memory_list_container)
+        # 记忆列表：模型 + 绘制代理，只绘制可见的卡片
+        self.memory_list_view = QListView()
+        self.memory_model = MemoryListModel(self.memory_list_view)
+        self.memory_list_view.setModel(self.memory_model)
+        self.memory_list_view.setSpacing(2)
+        self.memory_list_view.setFocusPolicy(Qt.NoFocus)
+        self.memory_list_view.setUniformItemSizes(True)
+        self.memory_list_view.setSelectionMode(QListView.NoSelection)
+        self.memory_list_view.setEditTriggers(QListView.NoEditTriggers)
+        self.memory_list_view.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.memory_list_view.setVerticalScrollMode(QListView.ScrollPerPixel)
+        self.memory_list_view.setMouseTracking(True)
+        self.memory_list_view.viewport().setAttribute(Qt.WA_Hover, True)
+        self.memory_list_view.viewport().setCursor(Qt.PointingHandCursor)
+        memory_delegate = MemoryCardDelegate(self.memory_list_view)
+        memory_delegate.action_triggered.connect(self._on_memory_action)
+        self.memory_list_view.setItemDelegate(memory_delegate)
+        self.memory_list_view.doubleClicked.connect(self._on_memory_double_clicked)
 
         btn_row = QHBoxLayout()
         self.btn_add_memory = QPushButton("新增")
@@ -2534,119 +3240,69 @@ class MainWindow(QMainWindow):
         btn_row.addWidget(self.btn_summarize)
 
         layout.addWidget(self.memory_tabs)
-        layout.addWidget(scroll_area)
+        layout.addWidget(self.memory_list_view)
         layout.addLayout(btn_row)
         return page
 
+    def _ensure_memory_page(self) -> None:
+        """首次进入长期记忆模块时构建页面，替换掉占位页。"""
+        if self.memory_page is not None:
+            return
+        self.memory_page = self._build_memory_page()
+        index = self.stack.indexOf(self._memory_placeholder)
+        self.stack.insertWidget(index, self.memory_page)
+        self.stack.removeWidget(self._memory_placeholder)
+        self._memory_placeholder.deleteLater()
+        self._memory_placeholder = None
+        self._refresh_memory_lists()
+
     def _update_memory_panel(self, person: Person) -> None:
+        # 页面尚未构建时无需刷新，构建时会加载当前对象的记忆
+        if self.memory_page is None:
+            return
         self._refresh_memory_lists()
 
     def _clear_memory_list(self) -> None:
-        """清空记忆列表中的所有卡片。"""
-        while self.memory_list_layout.count() > 1:  # 保留最后的 stretch
-            item = self.memory_list_layout.takeAt(0)
-            widget = item.widget()
-            if widget:
-                widget.deleteLater()
+        """清空记忆列表。"""
+        self.memory_model.set_rows([])
 
     def _refresh_memory_lists(self) -> None:
-        """刷新当前Tab对应类型的记忆列表（使用卡片组件）。"""
-        self._clear_memory_list()
-        
+        """刷新当前Tab对应类型的记忆列表（整表替换模型数据，视图只绘制可见行）。"""
         person = self._get_current_person()
         if not person:
+            self._clear_memory_list()
             return
         
-        tab_index = self.memory_tabs.currentIndex()
-        
-        if tab_index == 0:
-            # 对象特征 (ProfileMemory)
-            items = self._store.memory_service.query_profile_memories(person.person_id)
-            for memory in items:
-                source_text = "手动录入" if memory.source == "manual" else "模型提取"
-                confidence_pct = int(memory.confidence * 100)
-                # 根据置信度选择颜色
-                if confidence_pct >= 70:
-                    badge_color = "#4caf50"  # 绿色
-                elif confidence_pct >= 40:
-                    badge_color = "#ff9800"  # 橙色
-                else:
-                    badge_color = "#9e9e9e"  # 灰色
-                
-                card = MemoryCardWidget(
-                    memory_id=memory.memory_id,
-                    memory_type="profile",
-                    title=memory.content,
-                    subtitle=f"来源: {source_text} · 创建于: {memory.created_at[:10] if memory.created_at else '未知'}",
-                    badge_text=f"{confidence_pct}%",
-                    badge_color=badge_color,
-                    parent=self.memory_list_container,
-                )
-                card.edit_clicked.connect(self._on_edit_memory_card)
-                card.delete_clicked.connect(self._on_delete_memory_card)
-                self.memory_list_layout.insertWidget(self.memory_list_layout.count() - 1, card)
-        
-        elif tab_index == 1:
-            # 关系事件 (ExperienceMemory)
-            items = self._store.memory_service.query_experience_memories(person.person_id)
-            for memory in items:
-                source_text = "手动录入" if memory.source == "manual" else "模型提取"
-                impact_val = int(memory.impact * 100)
-                impact_text = f"+{impact_val}%" if impact_val >= 0 else f"{impact_val}%"
-                time_text = memory.event_time or "未知时间"
-                note_text = f" · {memory.note}" if memory.note else ""
-                # 根据影响选择颜色
-                if impact_val >= 30:
-                    badge_color = "#4caf50"  # 正面 - 绿色
-                elif impact_val <= -30:
-                    badge_color = "#f44336"  # 负面 - 红色
-                else:
-                    badge_color = "#2196f3"  # 中性 - 蓝色
-                
-                card = MemoryCardWidget(
-                    memory_id=memory.memory_id,
-                    memory_type="experience",
-                    title=memory.event,
-                    subtitle=f"时间: {time_text} · 来源: {source_text}{note_text}",
-                    badge_text=impact_text,
-                    badge_color=badge_color,
-                    parent=self.memory_list_container,
-                )
-                card.edit_clicked.connect(self._on_edit_memory_card)
-                card.delete_clicked.connect(self._on_delete_memory_card)
-                self.memory_list_layout.insertWidget(self.memory_list_layout.count() - 1, card)
-        
-        elif tab_index == 2:
-            # 沟通策略 (StrategyMemory)
-            items = self._store.memory_service.query_strategy_memories(person.person_id)
-            for memory in items:
-                eff_pct = int(memory.effectiveness * 100)
-                evidence_text = f"验证 {memory.evidence_count} 次"
-                # 根据有效性选择颜色
-                if eff_pct >= 60:
-                    badge_color = "#4caf50"  # 有效 - 绿色
-                elif eff_pct <= 30:
-                    badge_color = "#f44336"  # 无效 - 红色
-                else:
-                    badge_color = "#ff9800"  # 一般 - 橙色
-                
-                card = MemoryCardWidget(
-                    memory_id=memory.memory_id,
-                    memory_type="strategy",
-                    title=memory.pattern,
-                    subtitle=f"有效性: {eff_pct}% · {evidence_text}",
-                    badge_text=f"{eff_pct}%",
-                    badge_color=badge_color,
-                    parent=self.memory_list_container,
-                )
-                card.edit_clicked.connect(self._on_edit_memory_card)
-                card.delete_clicked.connect(self._on_delete_memory_card)
-                self.memory_list_layout.insertWidget(self.memory_list_layout.count() - 1, card)
+        memory_type = self._current_memory_type()
+        service = self._store.memory_service
+        if memory_type == "profile":
+            items = service.query_profile_memories(person.person_id)
+        elif memory_type == "experience":
+            items = service.query_experience_memories(person.person_id)
+        else:
+            items = service.query_strategy_memories(person.person_id)
+        rows = [_memory_row(memory_type, memory) for memory in items]
+        # 整表替换时暂停视图重绘，重置后只布局和绘制一次
+        self.memory_list_view.setUpdatesEnabled(False)
+        try:
+            self.memory_model.set_rows(rows)
+        finally:
+            self.memory_list_view.setUpdatesEnabled(True)
+
+    def _on_memory_action(self, memory_id: str, memory_type: str, action: str) -> None:
+        if action == "edit":
+            self._on_edit_memory_card(memory_id, memory_type)
+        elif action == "delete":
+            self._on_delete_memory_card(memory_id, memory_type)
+
+    def _on_memory_double_clicked(self, index: QModelIndex) -> None:
+        row = index.data(MEMORY_ROLE)
+        if row is not None:
+            self._on_edit_memory_card(row[0], row[1])
 
     def _current_memory_type(self) -> str:
         """返回当前Tab对应的记忆类型标识。"""
-        index = self.memory_tabs.currentIndex()
-        return ["profile", "experience", "strategy"][index]
+        return _MEMORY_TYPES[self.memory_tabs.currentIndex()]
 
     def _on_add_memory(self) -> None:
         """新增记忆 - 根据当前Tab类型打开对应对话框。"""
@@ -2667,15 +3323,10 @@ class MainWindow(QMainWindow):
                 return
             
             # 检查是否存在相同特征内容（精确匹配）
-            new_content = data["content"].strip()
             existing_profiles = self._store.memory_service.query_profile_memories(person.person_id)
-            matched_profile = None
-            
-            for profile in existing_profiles:
-                # 精确匹配特征内容（忽略大小写和首尾空格）
-                if profile.content.strip().lower() == new_content.lower():
-                    matched_profile = profile
-                    break
+            # 精确匹配特征内容（忽略大小写和首尾空格）；倒序构建使重复键保留最早的一条
+            existing_by_key = {_norm(p.content): p for p in reversed(existing_profiles)}
+            matched_profile = existing_by_key.get(_norm(data["content"]))
             
             if matched_profile:
                 # 找到相同特征，询问是否替换
@@ -2697,23 +3348,26 @@ class MainWindow(QMainWindow):
                         matched_profile.memory_id,
                         "profile"
                     )
-                    self._store.memory_service.create_profile_memory(
+                    self.memory_model.remove_row_by_id(matched_profile.memory_id)
+                    memory = self._store.memory_service.create_profile_memory(
                         person_id=person.person_id,
                         content=data["content"],
                         confidence=data["confidence"],
                         source=data["source"],
                     )
+                    self.memory_model.add_row(_memory_row("profile", memory))
                 # 用户选择不替换，直接返回不做任何操作
                 else:
                     return
             else:
                 # 没有相同特征，直接创建
-                self._store.memory_service.create_profile_memory(
+                memory = self._store.memory_service.create_profile_memory(
                     person_id=person.person_id,
                     content=data["content"],
                     confidence=data["confidence"],
                     source=data["source"],
                 )
+                self.memory_model.add_row(_memory_row("profile", memory))
         
         elif tab_index == 1:
             # 新增关系事件
@@ -2723,7 +3377,7 @@ class MainWindow(QMainWindow):
             data = dialog.get_data()
             if not data:
                 return
-            self._store.memory_service.create_experience_memory(
+            memory = self._store.memory_service.create_experience_memory(
                 person_id=person.person_id,
                 event=data["event"],
                 impact=data["impact"],
@@ -2731,6 +3385,7 @@ class MainWindow(QMainWindow):
                 note=data.get("note"),
                 source=data["source"],
             )
+            self.memory_model.add_row(_memory_row("experience", memory))
         
         elif tab_index == 2:
             # 新增沟通策略
@@ -2742,15 +3397,10 @@ class MainWindow(QMainWindow):
                 return
             
             # 检查是否存在相同策略模式（精确匹配）
-            new_pattern = data["pattern"].strip()
             existing_strategies = self._store.memory_service.query_strategy_memories(person.person_id)
-            matched_strategy = None
-            
-            for strategy in existing_strategies:
-                # 精确匹配策略模式（忽略大小写和首尾空格）
-                if strategy.pattern.strip().lower() == new_pattern.lower():
-                    matched_strategy = strategy
-                    break
+            # 精确匹配策略模式（忽略大小写和首尾空格）；倒序构建使重复键保留最早的一条
+            existing_by_key = {_norm(s.pattern): s for s in reversed(existing_strategies)}
+            matched_strategy = existing_by_key.get(_norm(data["pattern"]))
             
             if matched_strategy:
                 # 找到相同策略，融合有效性
@@ -2778,26 +3428,30 @@ class MainWindow(QMainWindow):
                     matched_strategy.effectiveness = merged_eff
                     matched_strategy.evidence_count = old_count + 1
                     self._store.memory_service.update_strategy_memory(matched_strategy)
+                    self.memory_model.update_row_by_id(
+                        matched_strategy.memory_id, _memory_row("strategy", matched_strategy)
+                    )
                 else:
                     # 用户选择不融合，创建新的
-                    self._store.memory_service.create_strategy_memory(
+                    memory = self._store.memory_service.create_strategy_memory(
                         person_id=person.person_id,
                         pattern=data["pattern"],
                         effectiveness=data["effectiveness"],
                         source=data["source"],
                     )
+                    self.memory_model.add_row(_memory_row("strategy", memory))
             else:
                 # 没有相同策略，直接创建
-                self._store.memory_service.create_strategy_memory(
+                memory = self._store.memory_service.create_strategy_memory(
                     person_id=person.person_id,
                     pattern=data["pattern"],
                     effectiveness=data["effectiveness"],
                     source=data["source"],
                 )
+                self.memory_model.add_row(_memory_row("strategy", memory))
         
-        # 保存到文件
-        self._store.sync_to_data_dir(self._system.settings.data_dir)
-        self._refresh_memory_lists()
+        # 保存到文件；列表只增删改受影响的行
+        self._schedule_save()
 
     def _on_edit_memory_card(self, memory_id: str, memory_type: str) -> None:
         """编辑记忆卡片 - 根据记忆类型打开对应对话框。"""
@@ -2848,9 +3502,9 @@ class MainWindow(QMainWindow):
             memory.effectiveness = data["effectiveness"]
             self._store.memory_service.update_strategy_memory(memory)
         
-        # 保存到文件
-        self._store.sync_to_data_dir(self._system.settings.data_dir)
-        self._refresh_memory_lists()
+        # 保存到文件，只重绘被编辑的一行
+        self._schedule_save()
+        self.memory_model.update_row_by_id(memory_id, _memory_row(memory_type, memory))
 
     def _on_delete_memory_card(self, memory_id: str, memory_type: str) -> None:
         """删除记忆卡片 - 弹出确认对话框。"""
@@ -2873,9 +3527,9 @@ class MainWindow(QMainWindow):
             person = self._get_current_person()
             if person:
                 self._store.memory_service.delete_memory(person.person_id, memory_id, memory_type)
-                # 保存到文件
-                self._store.sync_to_data_dir(self._system.settings.data_dir)
-                self._refresh_memory_lists()
+                # 保存到文件，只移除被删除的一行
+                self._schedule_save()
+                self.memory_model.remove_row_by_id(memory_id)
 
     def _on_summarize_memory(self) -> None:
         """记忆摘要 - 展示当前关系对象的记忆统计和摘要。"""
@@ -2884,16 +3538,27 @@ class MainWindow(QMainWindow):
             QMessageBox.information(self, "提示", "请先选择一个关系对象。")
             return
         
+        QMessageBox.information(
+            self, f"「{person.display_name}」记忆摘要", self._memory_summary_text(person.person_id)
+        )
+
+    def _memory_summary_text(self, person_id: str) -> str:
+        """生成记忆摘要文本；记忆版本号未变化时返回缓存结果。"""
+        service = self._store.memory_service
+        cached = self._summary_cache.get(person_id)
+        if cached is not None and cached[0] == service.revision:
+            return cached[1]
+        
         # 获取完整摘要
-        profile_summary = self._store.memory_service.summarize_for_profile(person.person_id)
-        reply_summary = self._store.memory_service.summarize_for_reply(person.person_id)
+        profile_summary = service.summarize_for_profile(person_id)
+        reply_summary = service.summarize_for_reply(person_id)
         
         msg_parts = []
         
         # 统计信息
         profile_count = len(profile_summary.get("profile_traits", []))
         experience_count = len(profile_summary.get("key_experiences", []))
-        strategy_count = len(self._store.memory_service.query_strategy_memories(person.person_id))
+        strategy_count = len(service.query_strategy_memories(person_id))
         msg_parts.append(f"📊 记忆统计\n对象特征: {profile_count} 条\n关系事件: {experience_count} 条\n沟通策略: {strategy_count} 条")
         
         # 高置信度特征
@@ -2914,7 +3579,9 @@ class MainWindow(QMainWindow):
         if len(msg_parts) == 1:
             msg_parts.append("\n暂无足够数据生成建议，请添加更多记忆条目。")
         
-        QMessageBox.information(self, f"「{person.display_name}」记忆摘要", "\n\n".join(msg_parts))
+        text = "\n\n".join(msg_parts)
+        self._summary_cache[person_id] = (service.revision, text)
+        return text
 
     def _on_ai_extract_memory(self) -> None:
         """AI 自动提取记忆 - 从对话中分析并提取记忆。
@@ -2978,11 +3645,40 @@ class MainWindow(QMainWindow):
             return
         
         selected = dialog.get_selected_memories()
+        service = self._store.memory_service
+        # 语义比对需要多次请求 LLM，放到线程池中执行，完成后再逐项确认并保存
+        worker = ComparisonWorker(
+            extractor,
+            person.person_id,
+            selected,
+            service.query_profile_memories(person.person_id),
+            service.query_experience_memories(person.person_id),
+            service.query_strategy_memories(person.person_id),
+        )
+        worker.signals.finished.connect(self._on_memory_comparison_finished)
+        worker.signals.error.connect(self._on_memory_comparison_error)
+        self.btn_ai_extract.setEnabled(False)
+        self.btn_ai_extract.setText("比对中...")
+        QThreadPool.globalInstance().start(worker)
+
+    def _on_memory_comparison_error(self, error_msg: str) -> None:
+        self.btn_ai_extract.setEnabled(True)
+        self.btn_ai_extract.setText("AI 提取")
+        QMessageBox.critical(self, "错误", f"记忆比对失败：{error_msg}")
+
+    def _on_memory_comparison_finished(self, payload: dict) -> None:
+        """语义比对完成后，按比对结果询问用户并保存提取的记忆。"""
+        self.btn_ai_extract.setEnabled(True)
+        self.btn_ai_extract.setText("AI 提取")
+        person = self._store.people.get(payload["person_id"])
+        if not person:
+            return
+        
+        selected = payload["selected"]
         saved_count = 0
         replaced_count = 0
         merged_count = 0
         
-        import logging
         logger = logging.getLogger(__name__)
         logger.info("=== AI 提取开始保存 ===")
         logger.info("选中的对象特征: %d 条", len(selected.get("profiles", [])))
@@ -2991,19 +3687,10 @@ class MainWindow(QMainWindow):
         
         # ========== 处理对象特征 ==========
         profiles_to_save = selected.get("profiles", [])
-        existing_profiles = self._store.memory_service.query_profile_memories(person.person_id)
+        existing_profiles = payload["existing_profiles"]
         
         if profiles_to_save and existing_profiles:
-            # 构建比对数据
-            items_to_compare = []
-            for new_item in profiles_to_save:
-                items_to_compare.append({
-                    "new_text": new_item.content,
-                    "existing_texts": [p.content for p in existing_profiles],
-                })
-            
-            # 调用语义比对
-            comparisons = extractor.compare_semantic_similarity(items_to_compare, "profile")
+            comparisons = payload["profile_comparisons"]
             
             # 找出有重复的项
             duplicates = []
@@ -3024,23 +3711,17 @@ class MainWindow(QMainWindow):
                 dup_dialog = DuplicateMemoryDialog(self, duplicates, "profile")
                 if dup_dialog.exec() == QDialog.Accepted:
                     decisions = dup_dialog.get_decisions()
-                    # 处理决定
+                    # 处理决定：替换项收集起来一次性批量替换
+                    replace_ops = []
                     for idx, decision in decisions.items():
                         dup = duplicates[idx]
                         if decision == "replace":
                             # 删除旧的，保存新的
-                            self._store.memory_service.delete_memory(
-                                person.person_id, 
-                                dup["existing_item"].memory_id, 
-                                "profile"
-                            )
-                            self._store.memory_service.create_profile_memory(
-                                person_id=person.person_id,
-                                content=dup["new_item"].content,
-                                confidence=dup["new_item"].confidence,
-                                source="model",
-                            )
-                            replaced_count += 1
+                            replace_ops.append((
+                                dup["existing_item"].memory_id,
+                                dup["new_item"].content,
+                                dup["new_item"].confidence,
+                            ))
                         elif decision == "keep_both":
                             # 保留两者
                             self._store.memory_service.create_profile_memory(
@@ -3051,6 +3732,8 @@ class MainWindow(QMainWindow):
                             )
                             saved_count += 1
                         # skip: 不做任何操作
+                    self._store.memory_service.bulk_replace_profile_memories(person.person_id, replace_ops)
+                    replaced_count += len(replace_ops)
             
             # 保存没有重复的项
             for idx, item in enumerate(profiles_to_save):
@@ -3075,20 +3758,11 @@ class MainWindow(QMainWindow):
         
         # ========== 处理关系事件 ==========
         experiences_to_save = selected.get("experiences", [])
-        existing_experiences = self._store.memory_service.query_experience_memories(person.person_id)
+        existing_experiences = payload["existing_experiences"]
         
         if experiences_to_save and existing_experiences:
-            # 构建比对数据
-            items_to_compare = []
-            for new_item in experiences_to_save:
-                items_to_compare.append({
-                    "new_text": new_item.event,
-                    "existing_texts": [e.event for e in existing_experiences],
-                })
-            
-            # 调用语义比对
-            logger.info("关系事件: 调用语义比对, 新项=%d, 现有=%d", len(experiences_to_save), len(existing_experiences))
-            comparisons = extractor.compare_semantic_similarity(items_to_compare, "experience")
+            logger.info("关系事件: 语义比对, 新项=%d, 现有=%d", len(experiences_to_save), len(existing_experiences))
+            comparisons = payload["experience_comparisons"]
             logger.info("关系事件: 语义比对返回 %d 个结果", len(comparisons))
             
             # 找出有重复的项
@@ -3112,22 +3786,16 @@ class MainWindow(QMainWindow):
                 dup_dialog = DuplicateMemoryDialog(self, duplicates, "experience")
                 if dup_dialog.exec() == QDialog.Accepted:
                     decisions = dup_dialog.get_decisions()
+                    replace_ops = []
                     for idx, decision in decisions.items():
                         dup = duplicates[idx]
                         if decision == "replace":
-                            self._store.memory_service.delete_memory(
-                                person.person_id, 
-                                dup["existing_item"].memory_id, 
-                                "experience"
-                            )
-                            self._store.memory_service.create_experience_memory(
-                                person_id=person.person_id,
-                                event=dup["new_item"].event,
-                                impact=dup["new_item"].impact,
-                                event_time=dup["new_item"].event_time,
-                                source="model",
-                            )
-                            replaced_count += 1
+                            replace_ops.append((
+                                dup["existing_item"].memory_id,
+                                dup["new_item"].event,
+                                dup["new_item"].impact,
+                                dup["new_item"].event_time,
+                            ))
                         elif decision == "keep_both":
                             self._store.memory_service.create_experience_memory(
                                 person_id=person.person_id,
@@ -3137,6 +3805,8 @@ class MainWindow(QMainWindow):
                                 source="model",
                             )
                             saved_count += 1
+                    self._store.memory_service.bulk_replace_experience_memories(person.person_id, replace_ops)
+                    replaced_count += len(replace_ops)
                 else:
                     logger.info("关系事件: 用户取消了重复确认对话框")
             
@@ -3170,17 +3840,11 @@ class MainWindow(QMainWindow):
         
         # ========== 处理沟通策略 ==========
         strategies_to_save = selected.get("strategies", [])
-        existing_strategies = self._store.memory_service.query_strategy_memories(person.person_id)
+        existing_strategies = payload["existing_strategies"]
         
-        for new_strategy in strategies_to_save:
+        for new_strategy, match_result in zip(strategies_to_save, payload["strategy_matches"]):
             if existing_strategies:
-                # 使用LLM判断策略模式是否一致
-                existing_patterns = [s.pattern for s in existing_strategies]
-                match_result = extractor.compare_strategy_patterns(
-                    new_strategy.pattern, 
-                    existing_patterns
-                )
-                
+                # LLM 对策略模式是否一致的判断结果
                 if match_result:
                     # 找到相似的策略，询问用户是否融合
                     matched_strategy = existing_strategies[match_result["index"]]
@@ -3231,7 +3895,8 @@ class MainWindow(QMainWindow):
         # 保存到文件并刷新UI
         total_changes = saved_count + replaced_count + merged_count
         if total_changes > 0:
-            self._store.sync_to_data_dir(self._system.settings.data_dir)
+            self._schedule_save()
+            # 批量保存后只整表重置一次模型
             self._refresh_memory_lists()
             
             # 构建结果消息
@@ -3270,36 +3935,59 @@ class MainWindow(QMainWindow):
         file_path, _ = QFileDialog.getOpenFileName(self, "导入关系数据", "", "JSON 文件 (*.json)")
         if not file_path:
             return
-        try:
-            data = json.loads(open(file_path, "r", encoding="utf-8").read())
-        except Exception as err:
-            QMessageBox.critical(self, "导入失败", f"无法读取文件：{err}")
-            return
+        worker = ImportDataWorker(file_path)
+        worker.signals.finished.connect(self._on_import_finished)
+        worker.signals.error.connect(self._on_import_error)
+        self._set_data_file_busy("正在导入关系数据...")
+        QThreadPool.globalInstance().start(worker)
+
+    def _on_import_finished(self, records: tuple) -> None:
+        self._set_data_file_busy(None)
+        people, memories = records
         self._store.people.clear()
         self._store.memories.clear()
-        for item in data.get("people", []):
-            person = Person(**item)
+        for person in people:
             self._store.add_person(person)
-        for pid, memories in data.get("memories", {}).items():
-            self._store.memories[pid] = [MemoryItem(**m) for m in memories]
+        self._store.memories.update(memories)
         self._refresh_contact_list()
         QMessageBox.information(self, "导入完成", "关系数据已导入。")
 
+    def _on_import_error(self, error: str) -> None:
+        self._set_data_file_busy(None)
+        QMessageBox.critical(self, "导入失败", f"无法读取文件：{error}")
+
     def _export_data(self) -> None:
         file_path, _ = QFileDialog.getSaveFileName(self, "导出关系数据", "relationship_data.json", "JSON 文件 (*.json)")
         if not file_path:
             return
+        # 在 UI 线程用 asdict 深拷贝出快照（含历史、目标等列表），后台序列化期间界面继续修改也不会互相干扰
         data = {
-            "people": [person.__dict__ for person in self._store.list_people()],
+            "people": [asdict(person) for person in self._store.list_people()],
             "memories": {
-                pid: [m.__dict__ for m in items]
+                pid: [asdict(m) for m in items]
                 for pid, items in self._store.memories.items()
             },
         }
-        try:
-            with open(file_path, "w", encoding="utf-8") as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
-        except Exception as err:
-            QMessageBox.critical(self, "导出失败", f"无法写入文件：{err}")
-            return
+        worker = ExportDataWorker(file_path, data)
+        worker.signals.finished.connect(self._on_export_finished)
+        worker.signals.error.connect(self._on_export_error)
+        self._set_data_file_busy("正在导出关系数据...")
+        QThreadPool.globalInstance().start(worker)
+
+    def _on_export_finished(self, _result) -> None:
+        self._set_data_file_busy(None)
         QMessageBox.information(self, "导出完成", "关系数据已导出。")
+
+    def _on_export_error(self, error: str) -> None:
+        self._set_data_file_busy(None)
+        QMessageBox.critical(self, "导出失败", f"无法写入文件：{error}")
+
+    def _set_data_file_busy(self, message: Optional[str]) -> None:
+        """导入/导出进行中时禁用对应菜单项并在状态栏提示，结束后恢复。"""
+        busy = message is not None
+        self._import_action.setEnabled(not busy)
+        self._export_action.setEnabled(not busy)
+        if busy:
+            self.statusBar().showMessage(message)
+        else:
+            self.statusBar().clearMessage()
@@ -1,5 +1,7 @@
 """设置和帮助对话框。"""
 
+import time
+
 from PySide6.QtWidgets import (
     QDialog,
     QVBoxLayout,
@@ -51,6 +53,10 @@ def _apply_info_style(btn: QPushButton) -> None:
 class APISettingsDialog(QDialog):
     """模型 API 配置对话框。"""
     
+    # 连接测试结果缓存：(api_key, base_url) -> (测试时间, 可用模型数)，短时间内重复测试直接复用
+    _TEST_CACHE_TTL = 30.0
+    _test_cache: dict[tuple[str, str], tuple[float, int]] = {}
+    
     def __init__(self, parent=None, settings: Settings = None):
         super().__init__(parent)
         self.settings = settings or Settings()
@@ -137,16 +143,19 @@ class APISettingsDialog(QDialog):
     
     def _test_connection(self) -> None:
         """测试 API 连接。"""
+        key = (self.api_key_input.text(), self.base_url_input.text())
         try:
-            from openai import OpenAI
-            
-            client = OpenAI(
-                api_key=self.api_key_input.text(),
-                base_url=self.base_url_input.text()
-            )
-            
-            response = client.models.list()
-            QMessageBox.information(self, "连接成功", f"✅ 成功连接到 API！\n\n可用模型数：{len(list(response))}")
+            cached = self._test_cache.get(key)
+            if cached and time.monotonic() - cached[0] < self._TEST_CACHE_TTL:
+                model_count = cached[1]
+            else:
+                from openai import OpenAI
+                
+                client = OpenAI(api_key=key[0], base_url=key[1])
+                response = client.models.list()
+                model_count = sum(1 for _ in response)
+                self._test_cache[key] = (time.monotonic(), model_count)
+            QMessageBox.information(self, "连接成功", f"✅ 成功连接到 API！\n\n可用模型数：{model_count}")
         except Exception as e:
             QMessageBox.warning(self, "连接失败", f"❌ 连接失败：\n{str(e)}")
     
@@ -164,6 +173,21 @@ class APISettingsDialog(QDialog):
         }
 
 
+# 亲密度权重表单样式：在对话框上统一设置一次，初始亲密度页的输入框更窄
+_INTIMACY_FORM_STYLE = """
+    QSpinBox, QDoubleSpinBox {
+        min-width: 100px;
+        padding: 6px 8px;
+    }
+    QWidget#baseIntimacyForm QSpinBox {
+        min-width: 80px;
+    }
+    QLabel[role="form"] {
+        font-size: 13px;
+    }
+"""
+
+
 class IntimacyWeightSettingsDialog(QDialog):
     """亲密度计算权重设置对话框。"""
     
@@ -172,6 +196,7 @@ class IntimacyWeightSettingsDialog(QDialog):
         self.setWindowTitle("亲密度计算权重设置")
         self.setMinimumWidth(600)
         self.setMinimumHeight(500)
+        self.setStyleSheet(_INTIMACY_FORM_STYLE)
         
         layout = QVBoxLayout(self)
         
@@ -234,64 +259,51 @@ class IntimacyWeightSettingsDialog(QDialog):
         form_layout.setHorizontalSpacing(16)
         form_layout.setVerticalSpacing(12)
         
-        # 设置统一的输入框样式
-        spinbox_style = """
-            QDoubleSpinBox {
-                min-width: 100px;
-                padding: 6px 8px;
-            }
-        """
-        label_style = "font-size: 13px;"
-        
         # 7-14天衰减率
         lbl_7_14 = QLabel("7-14天的每日衰减率：")
-        lbl_7_14.setStyleSheet(label_style)
+        lbl_7_14.setProperty("role", "form")
         self.decay_7_14 = QDoubleSpinBox()
         self.decay_7_14.setRange(0.0, 1.0)
         self.decay_7_14.setSingleStep(0.01)
         self.decay_7_14.setDecimals(2)
         self.decay_7_14.setSuffix(" %")
         self.decay_7_14.setValue(IntimacyManager.DECAY_RATE_7_14)
-        self.decay_7_14.setStyleSheet(spinbox_style)
         form_layout.addWidget(lbl_7_14, 0, 0)
         form_layout.addWidget(self.decay_7_14, 0, 1)
         
         # 14-30天衰减率
         lbl_14_30 = QLabel("14-30天的每日衰减率：")
-        lbl_14_30.setStyleSheet(label_style)
+        lbl_14_30.setProperty("role", "form")
         self.decay_14_30 = QDoubleSpinBox()
         self.decay_14_30.setRange(0.0, 1.0)
         self.decay_14_30.setSingleStep(0.01)
         self.decay_14_30.setDecimals(2)
         self.decay_14_30.setSuffix(" %")
         self.decay_14_30.setValue(IntimacyManager.DECAY_RATE_14_30)
-        self.decay_14_30.setStyleSheet(spinbox_style)
         form_layout.addWidget(lbl_14_30, 1, 0)
         form_layout.addWidget(self.decay_14_30, 1, 1)
         
         # 30-90天衰减率
         lbl_30_90 = QLabel("30-90天的每日衰减率：")
-        lbl_30_90.setStyleSheet(label_style)
+        lbl_30_90.setProperty("role", "form")
         self.decay_30_90 = QDoubleSpinBox()
         self.decay_30_90.setRange(0.0, 1.0)
         self.decay_30_90.setSingleStep(0.01)
         self.decay_30_90.setDecimals(2)
         self.decay_30_90.setSuffix(" %")
         self.decay_30_90.setValue(IntimacyManager.DECAY_RATE_30_90)
-        self.decay_30_90.setStyleSheet(spinbox_style)
         form_layout.addWidget(lbl_30_90, 2, 0)
         form_layout.addWidget(self.decay_30_90, 2, 1)
         
         # 90天以上衰减率
         lbl_90_plus = QLabel("90天以上的每日衰减率：")
-        lbl_90_plus.setStyleSheet(label_style)
+        lbl_90_plus.setProperty("role", "form")
         self.decay_90_plus = QDoubleSpinBox()
         self.decay_90_plus.setRange(0.0, 1.0)
         self.decay_90_plus.setSingleStep(0.01)
         self.decay_90_plus.setDecimals(2)
         self.decay_90_plus.setSuffix(" %")
         self.decay_90_plus.setValue(IntimacyManager.DECAY_RATE_90_PLUS)
-        self.decay_90_plus.setStyleSheet(spinbox_style)
         form_layout.addWidget(lbl_90_plus, 3, 0)
         form_layout.addWidget(self.decay_90_plus, 3, 1)
         
@@ -315,56 +327,43 @@ class IntimacyWeightSettingsDialog(QDialog):
         form_layout.setHorizontalSpacing(16)
         form_layout.setVerticalSpacing(12)
         
-        # 设置统一的输入框样式
-        spinbox_style = """
-            QSpinBox, QDoubleSpinBox {
-                min-width: 100px;
-                padding: 6px 8px;
-            }
-        """
-        label_style = "font-size: 13px;"
-        
         # 喜欢消息增加值
         lbl_like = QLabel("喜欢消息的亲密度增加值：")
-        lbl_like.setStyleSheet(label_style)
+        lbl_like.setProperty("role", "form")
         self.like_weight = QSpinBox()
         self.like_weight.setRange(0, 10)
         self.like_weight.setValue(IntimacyManager.LIKE_WEIGHT)
-        self.like_weight.setStyleSheet(spinbox_style)
         form_layout.addWidget(lbl_like, 0, 0)
         form_layout.addWidget(self.like_weight, 0, 1)
         
         # 不喜欢消息减少值
         lbl_dislike = QLabel("不喜欢消息的亲密度减少值：")
-        lbl_dislike.setStyleSheet(label_style)
+        lbl_dislike.setProperty("role", "form")
         self.dislike_weight = QSpinBox()
         self.dislike_weight.setRange(0, 10)
         self.dislike_weight.setValue(IntimacyManager.DISLIKE_WEIGHT)
-        self.dislike_weight.setStyleSheet(spinbox_style)
         form_layout.addWidget(lbl_dislike, 1, 0)
         form_layout.addWidget(self.dislike_weight, 1, 1)
         
         # 接受率增加值
         lbl_accept = QLabel("喜欢消息的接受率增加：")
-        lbl_accept.setStyleSheet(label_style)
+        lbl_accept.setProperty("role", "form")
         self.acceptance_delta = QDoubleSpinBox()
         self.acceptance_delta.setRange(0.0, 1.0)
         self.acceptance_delta.setSingleStep(0.01)
         self.acceptance_delta.setDecimals(2)
         self.acceptance_delta.setValue(IntimacyManager.ACCEPTANCE_DELTA)
-        self.acceptance_delta.setStyleSheet(spinbox_style)
         form_layout.addWidget(lbl_accept, 2, 0)
         form_layout.addWidget(self.acceptance_delta, 2, 1)
         
         # 接受率减少值
         lbl_reject = QLabel("不喜欢消息的接受率减少：")
-        lbl_reject.setStyleSheet(label_style)
+        lbl_reject.setProperty("role", "form")
         self.rejection_delta = QDoubleSpinBox()
         self.rejection_delta.setRange(0.0, 1.0)
         self.rejection_delta.setSingleStep(0.01)
         self.rejection_delta.setDecimals(2)
         self.rejection_delta.setValue(IntimacyManager.REJECTION_DELTA)
-        self.rejection_delta.setStyleSheet(spinbox_style)
         form_layout.addWidget(lbl_reject, 3, 0)
         form_layout.addWidget(self.rejection_delta, 3, 1)
         
@@ -384,37 +383,28 @@ class IntimacyWeightSettingsDialog(QDialog):
         
         # 使用 Grid 布局实现两列显示
         form_widget = QWidget()
+        form_widget.setObjectName("baseIntimacyForm")
         form_layout = QGridLayout(form_widget)
         form_layout.setHorizontalSpacing(24)
         form_layout.setVerticalSpacing(12)
         
-        # 设置统一的输入框样式
-        spinbox_style = """
-            QSpinBox {
-                min-width: 80px;
-                padding: 6px 8px;
-            }
-        """
-        label_style = "font-size: 13px;"
-        
         self.base_intimacy = {}
         # 从 IntimacyManager 获取统一的关系类型和当前值
-        rel_types = list(IntimacyManager.RELATIONSHIP_TYPES)
+        base_by_type = IntimacyManager.BASE_INTIMACY_BY_TYPE
         
-        for idx, rel_type in enumerate(rel_types):
-            current_value = IntimacyManager.BASE_INTIMACY_BY_TYPE.get(rel_type, 25)
+        for idx, rel_type in enumerate(IntimacyManager.RELATIONSHIP_TYPES):
+            current_value = base_by_type.get(rel_type, 25)
             
             # 计算行列位置（两列布局）
             row = idx // 2
             col = (idx % 2) * 2  # 0 或 2
             
             lbl = QLabel(f"{rel_type}：")
-            lbl.setStyleSheet(label_style)
+            lbl.setProperty("role", "form")
             
             spin = QSpinBox()
             spin.setRange(0, 100)
             spin.setValue(current_value)
-            spin.setStyleSheet(spinbox_style)
             self.base_intimacy[rel_type] = spin
             
             form_layout.addWidget(lbl, row, col)
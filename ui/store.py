@@ -3,10 +3,12 @@
 from __future__ import annotations
 
 import json
+from collections import OrderedDict
+from copy import deepcopy
 from pathlib import Path
 from dataclasses import dataclass, field, asdict
-from datetime import datetime
-from typing import List, Dict, Optional, Union
+from datetime import date, datetime
+from typing import List, Dict, Optional, Tuple, Union
 from uuid import uuid4
 
 
@@ -123,6 +125,14 @@ class MemoryService:
         self.profile_memories: Dict[str, List[ProfileMemory]] = {}
         self.experience_memories: Dict[str, List[ExperienceMemory]] = {}
         self.strategy_memories: Dict[str, List[StrategyMemory]] = {}
+        # 查询缓存：(记忆类型, person_id) -> 有效记忆列表，对应记忆增删改时失效
+        self._active_cache: Dict[Tuple[str, str], list] = {}
+        # 修改版本号：任何记忆变化都会递增，用于判断是否需要重新写盘
+        self.revision = 0
+    
+    def _invalidate(self, memory_type: str, person_id: str) -> None:
+        self._active_cache.pop((memory_type, person_id), None)
+        self.revision += 1
     
     # ==================== CRUD 操作 ====================
     
@@ -137,6 +147,7 @@ class MemoryService:
             source=source,
         )
         self.profile_memories.setdefault(person_id, []).append(memory)
+        self._invalidate("profile", person_id)
         return memory
     
     def create_experience_memory(self, person_id: str, event: str,
@@ -153,6 +164,7 @@ class MemoryService:
             source=source,
         )
         self.experience_memories.setdefault(person_id, []).append(memory)
+        self._invalidate("experience", person_id)
         return memory
     
     def create_strategy_memory(self, person_id: str, pattern: str,
@@ -166,14 +178,59 @@ class MemoryService:
             source=source,
         )
         self.strategy_memories.setdefault(person_id, []).append(memory)
+        self._invalidate("strategy", person_id)
         return memory
     
+    def bulk_replace_profile_memories(self, person_id: str,
+                                      replacements: List[Tuple[str, str, float]],
+                                      source: str = "model") -> None:
+        """批量替换对象特征：replacements 为 (旧记忆ID, 新内容, 新置信度)，一次过滤后统一追加。"""
+        if not replacements:
+            return
+        old_ids = {old_id for old_id, _, _ in replacements}
+        memories = [m for m in self.profile_memories.get(person_id, []) if m.memory_id not in old_ids]
+        memories.extend(
+            ProfileMemory(
+                memory_id=str(uuid4()),
+                person_id=person_id,
+                content=content,
+                confidence=confidence,
+                source=source,
+            )
+            for _, content, confidence in replacements
+        )
+        self.profile_memories[person_id] = memories
+        self._invalidate("profile", person_id)
+    
+    def bulk_replace_experience_memories(self, person_id: str,
+                                         replacements: List[Tuple[str, str, float, str]],
+                                         source: str = "model") -> None:
+        """批量替换关系事件：replacements 为 (旧记忆ID, 新事件, 新影响, 事件时间)，一次过滤后统一追加。"""
+        if not replacements:
+            return
+        old_ids = {old_id for old_id, _, _, _ in replacements}
+        memories = [m for m in self.experience_memories.get(person_id, []) if m.memory_id not in old_ids]
+        memories.extend(
+            ExperienceMemory(
+                memory_id=str(uuid4()),
+                person_id=person_id,
+                event=event,
+                impact=impact,
+                event_time=event_time or "",
+                source=source,
+            )
+            for _, event, impact, event_time in replacements
+        )
+        self.experience_memories[person_id] = memories
+        self._invalidate("experience", person_id)
+    
     def update_profile_memory(self, memory: ProfileMemory) -> None:
         """更新对象特征记忆。"""
         memories = self.profile_memories.get(memory.person_id, [])
         for idx, m in enumerate(memories):
             if m.memory_id == memory.memory_id:
                 memories[idx] = memory
+                self._invalidate("profile", memory.person_id)
                 return
     
     def update_experience_memory(self, memory: ExperienceMemory) -> None:
@@ -182,6 +239,7 @@ class MemoryService:
         for idx, m in enumerate(memories):
             if m.memory_id == memory.memory_id:
                 memories[idx] = memory
+                self._invalidate("experience", memory.person_id)
                 return
     
     def update_strategy_memory(self, memory: StrategyMemory) -> None:
@@ -190,6 +248,7 @@ class MemoryService:
         for idx, m in enumerate(memories):
             if m.memory_id == memory.memory_id:
                 memories[idx] = memory
+                self._invalidate("strategy", memory.person_id)
                 return
     
     def deactivate_memory(self, person_id: str, memory_id: str, memory_type: str) -> bool:
@@ -199,18 +258,21 @@ class MemoryService:
             for m in memories:
                 if m.memory_id == memory_id:
                     m.is_active = False
+                    self._invalidate("profile", person_id)
                     return True
         elif memory_type == "experience":
             memories = self.experience_memories.get(person_id, [])
             for m in memories:
                 if m.memory_id == memory_id:
                     m.is_active = False
+                    self._invalidate("experience", person_id)
                     return True
         elif memory_type == "strategy":
             memories = self.strategy_memories.get(person_id, [])
             for m in memories:
                 if m.memory_id == memory_id:
                     m.is_active = False
+                    self._invalidate("strategy", person_id)
                     return True
         return False
     
@@ -219,39 +281,43 @@ class MemoryService:
         if memory_type == "profile":
             memories = self.profile_memories.get(person_id, [])
             self.profile_memories[person_id] = [m for m in memories if m.memory_id != memory_id]
+            self._invalidate("profile", person_id)
             return True
         elif memory_type == "experience":
             memories = self.experience_memories.get(person_id, [])
             self.experience_memories[person_id] = [m for m in memories if m.memory_id != memory_id]
+            self._invalidate("experience", person_id)
             return True
         elif memory_type == "strategy":
             memories = self.strategy_memories.get(person_id, [])
             self.strategy_memories[person_id] = [m for m in memories if m.memory_id != memory_id]
+            self._invalidate("strategy", person_id)
             return True
         return False
     
     # ==================== 查询接口 ====================
     
     def query_profile_memories(self, person_id: str, active_only: bool = True) -> List[ProfileMemory]:
-        """查询对象特征记忆。"""
-        memories = self.profile_memories.get(person_id, [])
-        if active_only:
-            return [m for m in memories if m.is_active]
-        return memories
+        """查询对象特征记忆。返回的列表可能是缓存，调用方不要修改。"""
+        return self._query("profile", self.profile_memories, person_id, active_only)
     
     def query_experience_memories(self, person_id: str, active_only: bool = True) -> List[ExperienceMemory]:
-        """查询关系事件记忆。"""
-        memories = self.experience_memories.get(person_id, [])
-        if active_only:
-            return [m for m in memories if m.is_active]
-        return memories
+        """查询关系事件记忆。返回的列表可能是缓存，调用方不要修改。"""
+        return self._query("experience", self.experience_memories, person_id, active_only)
     
     def query_strategy_memories(self, person_id: str, active_only: bool = True) -> List[StrategyMemory]:
-        """查询沟通策略记忆。"""
-        memories = self.strategy_memories.get(person_id, [])
-        if active_only:
-            return [m for m in memories if m.is_active]
-        return memories
+        """查询沟通策略记忆。返回的列表可能是缓存，调用方不要修改。"""
+        return self._query("strategy", self.strategy_memories, person_id, active_only)
+    
+    def _query(self, memory_type: str, store: Dict[str, list], person_id: str, active_only: bool) -> list:
+        memories = store.get(person_id, [])
+        if not active_only:
+            return memories
+        key = (memory_type, person_id)
+        cached = self._active_cache.get(key)
+        if cached is None:
+            cached = self._active_cache[key] = [m for m in memories if m.is_active]
+        return cached
     
     def get_memory_by_id(self, person_id: str, memory_id: str, memory_type: str) -> Optional[LongTermMemory]:
         """根据ID获取记忆。"""
@@ -324,6 +390,7 @@ class MemoryService:
             if m.memory_id == memory_id:
                 m.confidence = min(1.0, m.confidence + 0.1)
                 m.last_confirmed = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                self.revision += 1
                 return
     
     def update_strategy_effectiveness(self, person_id: str, memory_id: str, 
@@ -336,6 +403,7 @@ class MemoryService:
                 delta = 0.1 if success else -0.1
                 m.effectiveness = max(0.0, min(1.0, m.effectiveness + delta))
                 m.last_updated = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                self.revision += 1
                 return
     
     # ==================== 持久化 ====================
@@ -362,6 +430,8 @@ class MemoryService:
         self.profile_memories.clear()
         self.experience_memories.clear()
         self.strategy_memories.clear()
+        self._active_cache.clear()
+        self.revision += 1
         
         for pid, memories in data.get("profile_memories", {}).items():
             self.profile_memories[pid] = [ProfileMemory(**m) for m in memories]
@@ -377,15 +447,22 @@ class MemoryService:
         self.profile_memories.pop(person_id, None)
         self.experience_memories.pop(person_id, None)
         self.strategy_memories.pop(person_id, None)
+        for memory_type in ("profile", "experience", "strategy"):
+            self._invalidate(memory_type, person_id)
 
 
 class AppStore:
     """简单的数据存储层，负责 UI 侧对象/记忆管理。"""
 
     def __init__(self) -> None:
-        self.people: Dict[str, Person] = {}
+        # 有序字典：置顶时可 O(1) 移动到最前
+        self.people: Dict[str, Person] = OrderedDict()
         self.memories: Dict[str, List[MemoryItem]] = {}  # 兼容旧版
         self.memory_service = MemoryService()  # 新版长期记忆服务
+        # 上次写盘的 (记忆文件路径, 记忆版本号)，未变化时跳过 long_term_memories.json 的重写
+        self._synced_memory_state: Optional[Tuple[Path, int]] = None
+        # 最近7天亲密度变化的缓存 {person_id: (计算日期, 变化总和)}，变化历史被修改时清除，不持久化
+        self.trend_7d_cache: Dict[str, Tuple[date, int]] = {}
 
     def load_from_data_dir(self, data_dir: str) -> None:
         """从 data 目录加载基础联系人数据（profiles.json + relationship_states.json）。"""
@@ -411,6 +488,7 @@ class AppStore:
 
         self.people.clear()
         self.memories.clear()
+        self.trend_7d_cache.clear()
 
         for contact_id, profile_data in profiles.items():
             contact_name = profile_data.get("contact_name") or profile_data.get("contact_id")
@@ -461,12 +539,57 @@ class AppStore:
             try:
                 memories_data = json.loads(memories_path.read_text(encoding="utf-8"))
                 self.memory_service.load_from_dict(memories_data)
+                self._synced_memory_state = (memories_path, self.memory_service.revision)
             except Exception:
                 pass
 
     def sync_to_data_dir(self, data_dir: str) -> None:
         """将当前对象列表同步写回 data 目录。"""
-        data_path = Path(data_dir)
+        self.write_sync_snapshot(self.snapshot_for_sync(data_dir))
+
+    def snapshot_for_sync(self, data_dir: str) -> dict:
+        """拍下写回 data 目录所需的数据快照。
+
+        须在 UI 线程调用；列表/字典字段均为深拷贝，快照之后可交给后台线程写盘。
+        长期记忆只有发生变化（或文件不存在）时才放入快照。
+        """
+        memories_path = Path(data_dir) / "long_term_memories.json"
+        memories = None
+        state = (memories_path, self.memory_service.revision)
+        if state != self._synced_memory_state or not memories_path.exists():
+            memories = self.memory_service.to_dict()
+            self._synced_memory_state = state
+
+        people = []
+        for person in self.people.values():
+            people.append(deepcopy({
+                "contact_id": person.person_id,
+                "contact_name": person.display_name,
+                "contact_type": self._contact_type_from_relationship(person.relationship_type),
+                "relationship_type": person.relationship_type,
+                "relative_role": person.relative_role,
+                "age_group": person.age_group,
+                "goals": person.goals,
+                "style_tags": person.style_tags,
+                "notes": person.notes,
+                "avatar_path": person.avatar_path,
+                "intimacy_history": person.intimacy_history,
+                "evolution_notes": person.evolution_notes,
+                "style_profile": person.style_profile,
+                "last_interaction_date": person.last_interaction_date,
+                "last_intimacy_change": person.last_intimacy_change,
+                "last_intimacy_change_date": person.last_intimacy_change_date,
+                "intimacy_change_history": person.intimacy_change_history,
+                "acceptance_rate": person.acceptance_rate,
+                "rejection_count": person.rejection_count,
+                "closeness": max(0.0, min(1.0, person.intimacy / 100.0)),
+            }))
+        return {"data_dir": data_dir, "people": people, "memories": memories}
+
+    @staticmethod
+    def write_sync_snapshot(snapshot: dict) -> None:
+        """把 snapshot_for_sync 的快照合并写入 data 目录（不访问仓库对象，可在任意线程执行）。"""
+        data_path = Path(snapshot["data_dir"])
         data_path.mkdir(parents=True, exist_ok=True)
         profiles_path = data_path / "profiles.json"
         states_path = data_path / "relationship_states.json"
@@ -485,7 +608,7 @@ class AppStore:
             except Exception:
                 states = {}
 
-        current_ids = set(self.people.keys())
+        current_ids = {p["contact_id"] for p in snapshot["people"]}
 
         for contact_id in list(profiles.keys()):
             if contact_id not in current_ids:
@@ -494,8 +617,8 @@ class AppStore:
             if contact_id not in current_ids:
                 states.pop(contact_id, None)
 
-        for person in self.people.values():
-            contact_id = person.person_id
+        for p in snapshot["people"]:
+            contact_id = p["contact_id"]
             existing_profile = profiles.get(contact_id, {})
             created_at = existing_profile.get("created_at") or datetime.now().isoformat()
             style_params = existing_profile.get("style_params") or {
@@ -510,35 +633,35 @@ class AppStore:
 
             profiles[contact_id] = {
                 "contact_id": contact_id,
-                "contact_name": person.display_name,
-                "contact_type": self._contact_type_from_relationship(person.relationship_type),
-                "relationship_type": person.relationship_type,
-                "relative_role": person.relative_role,
-                "age_group": person.age_group,
-                "goals": person.goals,
-                "style_tags": person.style_tags,
-                "notes": person.notes,
-                "avatar_path": person.avatar_path,
-                "intimacy_history": person.intimacy_history,
-                "evolution_notes": person.evolution_notes,
-                "style_profile": person.style_profile,
+                "contact_name": p["contact_name"],
+                "contact_type": p["contact_type"],
+                "relationship_type": p["relationship_type"],
+                "relative_role": p["relative_role"],
+                "age_group": p["age_group"],
+                "goals": p["goals"],
+                "style_tags": p["style_tags"],
+                "notes": p["notes"],
+                "avatar_path": p["avatar_path"],
+                "intimacy_history": p["intimacy_history"],
+                "evolution_notes": p["evolution_notes"],
+                "style_profile": p["style_profile"],
                 "style_params": style_params,
                 "total_messages": total_messages,
                 "last_interaction": last_interaction,
                 "created_at": created_at,
-                "description": person.notes,
+                "description": p["notes"],
                 # 新增：亲密度详细指标
-                "last_interaction_date": person.last_interaction_date,
-                "last_intimacy_change": person.last_intimacy_change,
-                "last_intimacy_change_date": person.last_intimacy_change_date,
-                "intimacy_change_history": person.intimacy_change_history,
-                "acceptance_rate": person.acceptance_rate,
-                "rejection_count": person.rejection_count,
+                "last_interaction_date": p["last_interaction_date"],
+                "last_intimacy_change": p["last_intimacy_change"],
+                "last_intimacy_change_date": p["last_intimacy_change_date"],
+                "intimacy_change_history": p["intimacy_change_history"],
+                "acceptance_rate": p["acceptance_rate"],
+                "rejection_count": p["rejection_count"],
             }
 
             existing_state = states.get(contact_id, {})
             updated_at = datetime.now().isoformat()
-            closeness = max(0.0, min(1.0, person.intimacy / 100.0))
+            closeness = p["closeness"]
             if not existing_state:
                 stage_history = {updated_at: "initial"}
                 current_stage = "initial"
@@ -575,12 +698,12 @@ class AppStore:
             encoding="utf-8",
         )
         
-        # 保存长期记忆
-        memories_path = data_path / "long_term_memories.json"
-        memories_path.write_text(
-            json.dumps(self.memory_service.to_dict(), ensure_ascii=False, indent=2),
-            encoding="utf-8",
-        )
+        # 保存长期记忆：快照中只有记忆发生变化时才带有数据
+        if snapshot["memories"] is not None:
+            (data_path / "long_term_memories.json").write_text(
+                json.dumps(snapshot["memories"], ensure_ascii=False, indent=2),
+                encoding="utf-8",
+            )
 
     @staticmethod
     def _relationship_from_contact_type(contact_type: str) -> str:
@@ -648,17 +771,27 @@ class AppStore:
     def add_person(self, person: Person) -> None:
         self.people[person.person_id] = person
         self.memories.setdefault(person.person_id, [])
+        self.trend_7d_cache.pop(person.person_id, None)
 
     def update_person(self, person: Person) -> None:
         self.people[person.person_id] = person
+        self.trend_7d_cache.pop(person.person_id, None)
 
     def delete_person(self, person_id: str) -> None:
         if person_id in self.people:
             del self.people[person_id]
         self.memories.pop(person_id, None)
+        self.trend_7d_cache.pop(person_id, None)
         # 删除长期记忆
         self.memory_service.delete_person_memories(person_id)
 
+    def pin_person(self, person_id: str) -> bool:
+        """将对象移动到列表最前，不影响其记忆数据。"""
+        if person_id not in self.people:
+            return False
+        self.people.move_to_end(person_id, last=False)
+        return True
+
     def list_people(self) -> List[Person]:
         return list(self.people.values())
 
@@ -701,6 +834,7 @@ class AppStore:
                 h for h in person.intimacy_change_history 
                 if h.get("round_id") != round_id
             ]
+            self.trend_7d_cache.pop(person.person_id, None)
         
         # 更新历史记录
         record = {
@@ -712,7 +846,7 @@ class AppStore:
         if round_id:
             record["round_id"] = round_id
         person.intimacy_history.append(record)
-        person.intimacy_history = person.intimacy_history[-365:]  # 保留365天（一年）
+        del person.intimacy_history[:-365]  # 保留365天（一年），原地裁剪不复制列表
         
         # 更新变化历史
         if change != 0:
@@ -725,7 +859,8 @@ class AppStore:
             if round_id:
                 change_record["round_id"] = round_id
             person.intimacy_change_history.append(change_record)
-            person.intimacy_change_history = person.intimacy_change_history[-365:]  # 保留365天（一年）
+            del person.intimacy_change_history[:-365]  # 保留365天（一年），原地裁剪不复制列表
+            self.trend_7d_cache.pop(person.person_id, None)
             person.last_intimacy_change = change
             person.last_intimacy_change_date = now.strftime("%Y-%m-%d %H:%M:%S")
         
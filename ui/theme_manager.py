@@ -15,6 +15,7 @@ from core.config import (
     THEME_DARK,
     THEME_SYSTEM,
 )
+from .button_styles import BUTTON_ROLE_STYLESHEET
 
 # 获取 assets 目录路径
 ASSETS_DIR = Path(__file__).parent.parent / "assets"
@@ -42,6 +43,7 @@ class ThemeManager(QObject):
         self._app = app or QApplication.instance()
         self._current_setting = THEME_SYSTEM  # 用户选择的设置
         self._current_theme = THEME_LIGHT  # 实际应用的主题
+        self.is_dark = False  # 每次应用主题时更新，供高频绘制路径直接读取
         self._initialized = True
     
     @classmethod
@@ -66,7 +68,7 @@ class ThemeManager(QObject):
     
     def is_dark_mode(self) -> bool:
         """当前是否为暗黑模式。"""
-        return self._current_theme == THEME_DARK
+        return self.is_dark
     
     def set_theme(self, theme: str) -> bool:
         """设置并应用主题。
@@ -93,6 +95,7 @@ class ThemeManager(QObject):
             actual_theme = theme
         
         self._current_theme = actual_theme
+        self.is_dark = actual_theme == THEME_DARK
         
         if actual_theme == THEME_DARK:
             self._apply_dark_theme()
@@ -155,7 +158,7 @@ class ThemeManager(QObject):
         palette.setColor(QPalette.Disabled, QPalette.ButtonText, QColor(150, 150, 150))
         
         self._app.setPalette(palette)
-        self._app.setStyleSheet(self._get_light_stylesheet())
+        self._app.setStyleSheet(self._get_light_stylesheet() + BUTTON_ROLE_STYLESHEET)
     
     def _apply_dark_theme(self) -> None:
         """应用暗黑主题。"""
@@ -185,7 +188,7 @@ class ThemeManager(QObject):
         palette.setColor(QPalette.Disabled, QPalette.ButtonText, QColor(100, 100, 100))
         
         self._app.setPalette(palette)
-        self._app.setStyleSheet(self._get_dark_stylesheet())
+        self._app.setStyleSheet(self._get_dark_stylesheet() + BUTTON_ROLE_STYLESHEET)
     
     def _get_light_stylesheet(self) -> str:
         """获取明亮主题的样式表。"""
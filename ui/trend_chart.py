@@ -0,0 +1,494 @@
+"""亲密度趋势折线图：matplotlib 画布与后台数据准备线程。
+
+matplotlib / numpy 导入开销较大，本模块由 main_window 中的 IntimacyTrendChart
+在首次显示时才导入。
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import re
+from datetime import datetime
+from typing import List, Optional
+
+from PySide6.QtCore import Qt, Signal, QThread
+from PySide6.QtWidgets import QWidget
+
+# matplotlib 嵌入 PySide6
+import matplotlib
+matplotlib.use("QtAgg")
+from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.collections import PolyCollection
+from matplotlib.figure import Figure
+from matplotlib.ticker import AutoLocator, ScalarFormatter
+import matplotlib.pyplot as plt
+import numpy as np
+
+from core.config import get_app_data_dir
+
+logger = logging.getLogger(__name__)
+
+# 上次选中的中文字体，避免每次启动都遍历系统字体列表
+FONT_CHOICE_FILE = get_app_data_dir() / "font_choice.json"
+
+# 支持的时间戳格式：YYYY-MM-DD，可带 " HH:MM[:SS]" 或 "THH:MM:SS"，其余格式一律视为无效
+_TS_RE = re.compile(
+    r'^(\d{4})-(\d{2})-(\d{2})(?:(?: |T(?=\d{2}:\d{2}:\d{2}$))(\d{2}):(\d{2})(?::(\d{2}))?)?$'
+)
+
+
+class IntimacyTrendCanvas(FigureCanvas):
+    """亲密度变化趋势折线图画布（使用相对时间）。
+    
+    主窗口只创建一个实例，切换联系人时通过 update_data 复用同一个 Figure
+    和其中的常驻图元，不要为每个联系人单独创建图表。
+    """
+    
+    # 中文字体配置
+    CHINESE_FONTS = [
+        'PingFang SC',           # macOS
+        'Heiti SC',              # macOS
+        'STHeiti',               # macOS
+        'Hiragino Sans GB',      # macOS
+        'Microsoft YaHei',       # Windows
+        'SimHei',                # Windows
+        'WenQuanYi Micro Hei',   # Linux
+        'Noto Sans CJK SC',      # Linux
+        'sans-serif'             # 后备
+    ]
+    
+    # 时间单位配置：(秒数阈值, 除数, 单位名称)
+    TIME_UNITS = [
+        (60, 1, '秒'),                    # < 1分钟
+        (3600, 60, '分钟'),               # < 1小时
+        (86400, 3600, '小时'),            # < 1天
+        (604800, 86400, '天'),            # < 1周
+        (2592000, 604800, '周'),          # < 30天
+        (31536000, 2592000, '月'),        # < 1年
+        (float('inf'), 31536000, '年'),   # >= 1年
+    ]
+    
+    # 中文字体是否已配置（rcParams 为进程级全局设置）
+    _font_ready = False
+
+    def __init__(self, parent: Optional[QWidget] = None):
+        # 创建 Figure 和 Axes
+        self.fig = Figure(figsize=(5, 2.2), dpi=100, facecolor='none')
+        self.ax = self.fig.add_subplot(111)
+        super().__init__(self.fig)
+        self.setParent(parent)
+        self.setMinimumHeight(160)
+        self.setMaximumHeight(200)
+        
+        # 设置透明背景
+        self.fig.patch.set_alpha(0)
+        self.ax.patch.set_alpha(0.05)
+        
+        # 配置中文字体
+        self._setup_chinese_font()
+        
+        # 禁用 FigureCanvas 的滚轮事件，让父容器处理滚动
+        self.setFocusPolicy(Qt.NoFocus)
+        
+        # 后台数据准备线程（复用同一个实例）
+        self._pending_history: Optional[List[dict]] = None
+        self._last_hash = hash(())  # 初始为空图表
+        self._prep_worker = ChartPrepWorker(self)
+        self._prep_worker.ready.connect(self._on_data_prepared)
+        self._prep_worker.finished.connect(self._on_prep_finished)
+        
+        # 初始化样式和常驻图元，后续更新只修改数据而不重建
+        self._setup_style()
+        self._x_unit: Optional[str] = None
+        self._create_artists()
+        self._draw_empty()
+
+    def wheelEvent(self, event):
+        """将滚轮事件传递给父容器，解决滚动失灵问题。"""
+        event.ignore()
+
+    @classmethod
+    def _setup_chinese_font(cls) -> None:
+        """配置中文字体支持（每个进程只执行一次）。"""
+        if cls._font_ready:
+            return
+        
+        selected_font = cls._load_cached_font()
+        if selected_font is None:
+            import matplotlib.font_manager as fm
+            
+            # 尝试找到可用的中文字体
+            available_fonts = set(f.name for f in fm.fontManager.ttflist)
+            for font_name in cls.CHINESE_FONTS:
+                if font_name in available_fonts:
+                    selected_font = font_name
+                    break
+            if selected_font:
+                cls._save_cached_font(selected_font)
+        
+        if selected_font:
+            plt.rcParams['font.family'] = selected_font
+            plt.rcParams['font.sans-serif'] = [selected_font] + cls.CHINESE_FONTS
+        else:
+            # 使用 sans-serif 并添加中文字体列表
+            plt.rcParams['font.sans-serif'] = cls.CHINESE_FONTS
+        
+        # 解决负号显示问题
+        plt.rcParams['axes.unicode_minus'] = False
+        cls._font_ready = True
+
+    @staticmethod
+    def _load_cached_font() -> Optional[str]:
+        """读取上次选中的中文字体，并确认该字体仍然可用。"""
+        try:
+            with open(FONT_CHOICE_FILE, "r", encoding="utf-8") as f:
+                font_name = json.load(f).get("font")
+            if not font_name:
+                return None
+            import matplotlib.font_manager as fm
+            fm.findfont(fm.FontProperties(family=font_name), fallback_to_default=False)
+            return font_name
+        except Exception:
+            return None
+
+    @staticmethod
+    def _save_cached_font(font_name: str) -> None:
+        try:
+            FONT_CHOICE_FILE.parent.mkdir(parents=True, exist_ok=True)
+            with open(FONT_CHOICE_FILE, "w", encoding="utf-8") as f:
+                json.dump({"font": font_name}, f, ensure_ascii=False)
+        except Exception as err:
+            logger.debug("Failed to cache chart font choice: %s", err)
+
+    def _setup_style(self) -> None:
+        """设置图表样式。"""
+        # 使用现代配色
+        self.ax.spines['top'].set_visible(False)
+        self.ax.spines['right'].set_visible(False)
+        self.ax.spines['left'].set_color('#cccccc')
+        self.ax.spines['bottom'].set_color('#cccccc')
+        self.ax.tick_params(colors='#666666', labelsize=8)
+        self.ax.set_ylabel('亲密度 (%)', fontsize=9, color='#666666')
+        self.ax.set_ylim(0, 105)
+        self.ax.grid(True, linestyle='--', alpha=0.3, color='#999999')
+
+    def _create_artists(self) -> None:
+        """创建常驻的折线、填充、标注和空状态文本。"""
+        line_color = '#4A90D9'
+        fill_color = '#4A90D9'
+        
+        # 填充区域
+        self._fill = PolyCollection([], facecolors=fill_color, edgecolors=fill_color, alpha=0.15)
+        self.ax.add_collection(self._fill, autolim=False)
+        
+        # 折线
+        self._line, = self.ax.plot([], [], color=line_color, linewidth=2,
+                                   marker='o', markersize=5, markerfacecolor='white',
+                                   markeredgecolor=line_color, markeredgewidth=2)
+        
+        # 关键点标注：起始/终止/最高/最低，最多 4 个
+        self._annotations = [
+            self.ax.annotate('', (0, 0), textcoords='offset points',
+                             xytext=(0, 10), ha='center', fontsize=8, color='#333333',
+                             fontweight='bold', visible=False)
+            for _ in range(4)
+        ]
+        
+        self._empty_text = self.ax.text(0.5, 0.5, '暂无趋势数据',
+                                        transform=self.ax.transAxes,
+                                        ha='center', va='center',
+                                        fontsize=11, color='#999999')
+
+    def _set_x_unit(self, x_unit: str) -> None:
+        """更新 X 轴单位标签；标签变化时才重新计算布局。"""
+        if x_unit == self._x_unit:
+            return
+        self._x_unit = x_unit
+        self.ax.set_xlabel(f'相对时间 ({x_unit})' if x_unit else '', fontsize=9, color='#666666')
+        self.fig.tight_layout(pad=1.5)
+
+    def _draw_empty(self) -> None:
+        """绘制空状态提示。"""
+        self._line.set_data([], [])
+        self._fill.set_verts([])
+        for annotation in self._annotations:
+            annotation.set_visible(False)
+        self._empty_text.set_visible(True)
+        
+        self.ax.set_xlim(0, 1)
+        self.ax.xaxis.set_major_locator(AutoLocator())
+        self.ax.xaxis.set_major_formatter(ScalarFormatter())
+        self.ax.set_ylim(0, 105)
+        self._set_x_unit('')
+        self.draw_idle()
+
+    @classmethod
+    def _select_time_unit(cls, max_seconds: float) -> tuple:
+        """
+        根据最大时间跨度选择合适的时间单位。
+        
+        返回：(除数, 单位名称)
+        """
+        for threshold, divisor, unit_name in cls.TIME_UNITS:
+            if max_seconds < threshold:
+                return divisor, unit_name
+        return cls.TIME_UNITS[-1][1], cls.TIME_UNITS[-1][2]
+
+    @staticmethod
+    def _calculate_nice_ticks(max_value: float, num_ticks: int = 5) -> List[float]:
+        """
+        计算规范化的刻度值（整数或简单小数）。
+        
+        策略：选择 1, 2, 5, 10, 20, 50... 等规整数值作为刻度间隔
+        """
+        if max_value <= 0:
+            return [0]
+        
+        # 计算合适的刻度间隔
+        raw_interval = max_value / num_ticks
+        
+        # 规范化间隔值
+        magnitude = 10 ** int(np.floor(np.log10(raw_interval))) if raw_interval > 0 else 1
+        normalized = raw_interval / magnitude
+        
+        # 选择规整的间隔
+        if normalized <= 1:
+            nice_interval = 1 * magnitude
+        elif normalized <= 2:
+            nice_interval = 2 * magnitude
+        elif normalized <= 5:
+            nice_interval = 5 * magnitude
+        else:
+            nice_interval = 10 * magnitude
+        
+        # 生成刻度值
+        ticks = []
+        current = 0
+        while current <= max_value * 1.1:  # 稍微超出一点
+            ticks.append(current)
+            current += nice_interval
+        
+        return ticks
+
+    @staticmethod
+    def _parse_timestamp(ts: str) -> Optional[datetime]:
+        """解析单个时间戳（日期，或日期 + 时:分[:秒]），失败返回 None。"""
+        match = _TS_RE.match(ts) if ts else None
+        if not match:
+            return None
+        year, month, day, hour, minute, second = match.groups()
+        try:
+            return datetime(
+                int(year), int(month), int(day),
+                int(hour or 0), int(minute or 0), int(second or 0),
+            )
+        except ValueError:
+            return None
+
+    @classmethod
+    def prepare_data(cls, history: List[dict]) -> Optional[dict]:
+        """
+        解析历史记录并计算绘图所需的全部数据（不涉及 matplotlib，可在后台线程执行）。
+        
+        横坐标使用相对时间：
+        - 第一个数据点位于 x=0
+        - 后续数据点显示相对于第一个数据点的时间差
+        - 时间单位根据数据跨度动态选择（分钟/小时/天/周/月/年）
+        
+        没有可用数据时返回 None。
+        """
+        if not history:
+            return None
+        
+        # 解析时间戳和亲密度值（最多显示最近15条记录）
+        items = history[-15:]
+        raw_stamps = [item.get('timestamp', '') or '' for item in items]
+        # numpy 会接受小数秒、单独年份、时区偏移等格式，因此只有全部符合支持的格式时才交给它批量解析
+        stamps = None
+        if all(_TS_RE.match(ts) for ts in raw_stamps):
+            try:
+                stamps = np.array(raw_stamps, dtype='datetime64[s]')
+            except ValueError:
+                stamps = None
+        if stamps is None:
+            # 存在空值或非标准格式时逐条解析，无法识别的记为 NaT
+            stamps = np.array(
+                [cls._parse_timestamp(ts) for ts in raw_stamps], dtype='datetime64[s]'
+            )
+        valid = ~np.isnat(stamps)
+        if not valid.any():
+            return None
+        stamps = stamps[valid]
+        values = [item.get('intimacy_score', 50) for item, ok in zip(items, valid) if ok]
+        
+        # 计算相对时间（以第一个时间点为基准，单位：秒）
+        relative_seconds = (stamps - stamps[0]).astype('int64')
+        
+        # 根据最大时间跨度选择合适的单位
+        max_seconds = float(relative_seconds.max()) if len(relative_seconds) > 1 else 0
+        divisor, unit_name = cls._select_time_unit(max_seconds)
+        
+        # 转换为选定单位
+        relative_times = relative_seconds / divisor
+        max_relative = float(relative_times.max())
+        
+        # 确定需要标注的关键点：起始值、终止值、最高值、最低值
+        # 使用字典记录要标注的点，避免重复（相同位置只标注一次）
+        scores = np.asarray(values)
+        max_idx = int(scores.argmax())
+        min_idx = int(scores.argmin())
+        max_val = values[max_idx]
+        min_val = values[min_idx]
+        
+        key_points = {}  # {index: [labels]}
+        for idx, label in ((0, "起始"), (len(values) - 1, "终止"), (max_idx, "最高"), (min_idx, "最低")):
+            key_points.setdefault(idx, []).append(label)
+        
+        # 标注内容，合并相同位置的标签（如起始点同时是最高点）
+        annotations = []  # [(text, x, y, y_offset)]
+        for idx, labels in key_points.items():
+            t = relative_times[idx]
+            v = values[idx]
+            label_text = "/".join(labels)
+            
+            # 调整标注位置，避免重叠
+            y_offset = 10
+            if v == max_val:
+                y_offset = 12  # 最高点往上
+            elif v == min_val:
+                y_offset = -15  # 最低点往下
+            
+            annotations.append((f'{label_text}: {v}%', t, v, y_offset))
+        
+        # X 轴范围和刻度
+        if max_relative > 0:
+            # 添加5%边距
+            margin = max(max_relative * 0.05, 0.1)
+            xlim = (-margin, max_relative + margin)
+            
+            # 计算规范化刻度
+            ticks = cls._calculate_nice_ticks(max_relative)
+            
+            # 格式化刻度标签（整数或一位小数）
+            tick_labels = []
+            for tick in ticks:
+                if tick == int(tick):
+                    tick_labels.append(str(int(tick)))
+                else:
+                    tick_labels.append(f'{tick:.1f}')
+        else:
+            # 单个数据点
+            xlim = (-0.5, 0.5)
+            ticks = [0]
+            tick_labels = ['0']
+        
+        # 动态调整 Y 轴范围
+        ylim = (max(0, min_val - 10), min(100, max_val + 10) + 5)
+        
+        return {
+            'relative_times': relative_times,
+            'values': values,
+            'unit_name': unit_name,
+            'annotations': annotations,
+            'xlim': xlim,
+            'ticks': ticks,
+            'tick_labels': tick_labels,
+            'ylim': ylim,
+        }
+
+    def update_data(self, history: List[dict]) -> None:
+        """
+        更新折线图数据。
+        
+        数据解析在 ChartPrepWorker 中完成，结果通过信号回到主线程后再绘制。
+        若后台线程仍在计算，仅记录最新的历史，待其完成后再处理。
+        """
+        recent = list(history[-15:]) if history else []
+        
+        # 数据未变化时（例如反复切换联系人）直接跳过
+        key = hash(tuple((it.get('timestamp', ''), it.get('intimacy_score', 50)) for it in recent))
+        if key == self._last_hash:
+            return
+        self._last_hash = key
+        
+        self._pending_history = recent
+        if not self._prep_worker.isRunning():
+            self._start_prep()
+
+    def _start_prep(self) -> None:
+        self._prep_worker.set_history(self._pending_history)
+        self._pending_history = None
+        self._prep_worker.start()
+
+    def _on_data_prepared(self, data: Optional[dict]) -> None:
+        if self._pending_history is not None:
+            # 计算期间又有新数据，丢弃过期结果，线程结束后再处理最新数据
+            return
+        self._apply_prepared(data)
+
+    def _on_prep_finished(self) -> None:
+        """线程结束后处理计算期间到达的最新数据（ready 发出后线程可能仍在运行）。"""
+        if self._pending_history is None:
+            return
+        self._prep_worker.wait()
+        self._start_prep()
+
+    def _apply_prepared(self, data: Optional[dict]) -> None:
+        """根据预先计算好的数据更新常驻图元（仅在主线程调用）。"""
+        if data is None:
+            self._draw_empty()
+            return
+        
+        relative_times = data['relative_times']
+        values = data['values']
+        self._empty_text.set_visible(False)
+        
+        # 填充区域：折线与 y=0 围成的多边形
+        verts = [(relative_times[0], 0)]
+        verts.extend(zip(relative_times, values))
+        verts.append((relative_times[-1], 0))
+        self._fill.set_verts([verts])
+        
+        # 折线
+        self._line.set_data(relative_times, values)
+        
+        # 关键点标注
+        annotations = data['annotations']
+        for i, artist in enumerate(self._annotations):
+            if i < len(annotations):
+                text, t, v, y_offset = annotations[i]
+                artist.set_text(text)
+                artist.xy = (t, v)
+                artist.xyann = (0, y_offset)
+                artist.set_visible(True)
+            else:
+                artist.set_visible(False)
+        
+        # 设置 X 轴范围和刻度
+        self.ax.set_xlim(*data['xlim'])
+        self.ax.set_xticks(data['ticks'])
+        self.ax.set_xticklabels(data['tick_labels'])
+        
+        # 动态调整 Y 轴范围
+        self.ax.set_ylim(*data['ylim'])
+        
+        # X轴单位标签
+        self._set_x_unit(data['unit_name'])
+        self.draw_idle()
+
+
+class ChartPrepWorker(QThread):
+    """后台线程：解析亲密度历史并计算折线图数据，不触碰任何 Qt/matplotlib 对象。"""
+    
+    ready = Signal(object)  # dict 或 None
+    
+    def __init__(self, parent: Optional[QWidget] = None):
+        super().__init__(parent)
+        self._history: List[dict] = []
+    
+    def set_history(self, history: List[dict]) -> None:
+        self._history = history
+    
+    def run(self):
+        self.ready.emit(IntimacyTrendCanvas.prepare_data(self._history))